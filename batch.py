@@ -0,0 +1,392 @@
+"""Analiză în lot, fără interfață: extragere, căutare de anunțuri similare și scor.
+
+    python batch.py urls.txt -o piata.jsonl [--workers N] [--rate R]
+    cat urls.txt | python batch.py - -o piata.parquet
+    python batch.py pagini_salvate.txt -o rezultate.jsonl --offline
+
+Fiecare linie din intrare e un link de anunț OLX sau calea unei pagini salvate (*.html);
+liniile goale și cele care încep cu # sunt ignorate. Pentru fiecare anunț se scrie un
+rând cu specificațiile lui și rezumatul pieței (câte anunțuri similare, fără republicări, prețul median,
+câte sunt în fiecare categorie a PriceAnalyzer) și poziția lui în segment (percentila
+prețului și prețul corect estimat, din MarketStats). Cu --nearest N, rezumatul se face
+față de cele mai apropiate N anunțuri (an, km, putere, motor) din același segment, dintre
+toate cele văzute (depozitul local și căutările), nu doar cele din toleranțe.
+
+Intrările se procesează în loturi de --plan-batch anunțuri: întâi se extrag anunțurile,
+apoi fiecare segment (aceeași marcă/model/motorizare) se caută o singură dată, în celule
+an × km de cel mult --max-pages pagini (SearchPlanner), iar fiecare anunț primește din
+celulele pe care le atinge căutarea lui anunțurile care trec filtrele lui. Numărul de
+cereri pe OLX crește cu paginile segmentelor de piață, nu cu numărul de anunțuri.
+
+Ieșirea e și punctul de reluare: la o nouă rulare cu același -o, intrările scrise deja
+cu status "ok" sunt sărite, iar cele eșuate se reîncearcă. JSONL se scrie rând cu rând; Parquet e un director cu fișiere part-*.parquet
+scrise la fiecare --flush-every rânduri (un fișier neterminat la o oprire bruscă nu e
+luat în considerare).
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from olx_analyzer import (
+    DEDUPLICATOR,
+    CarSpecs,
+    ComparablesIndex,
+    ListingStore,
+    MarketStats,
+    OLXExtractorFixed,
+    PriceAnalyzer,
+    ResponseCache,
+    SearchCrawler,
+    SearchPlanner,
+    SearchQuery,
+    URLBuilder,
+    cars_to_frame,
+    find_comparables,
+)
+
+# categoriile PriceAnalyzer, fiecare cu o coloană de numărare în ieșire
+CATEGORY_COLUMNS = [name for _, name in PriceAnalyzer.CATEGORIES] + ["SLAB"]
+
+# schema fixă a rândurilor Parquet, ca toate fișierele part-* să aibă aceleași tipuri
+_INT_COLUMNS = ["year", "km", "power", "engine_size", "comparables", "duplicates", "best_score", "segment_count", "description_hash"] + [f"count_{n}" for n in CATEGORY_COLUMNS]
+_FLOAT_COLUMNS = ["price", "median_price", "price_vs_median_pct", "market_percentile", "fair_price"]
+RECORD_DTYPES = {
+    **{name: "string" for name in ["input", "status", "error", "search_url", "best_link"] + list(CarSpecs.__dataclass_fields__)},
+    **{name: "Int64" for name in _INT_COLUMNS},
+    **{name: "float64" for name in _FLOAT_COLUMNS},
+}
+
+
+def read_inputs(source: str) -> Iterator[str]:
+    """Intrările (link sau cale .html), fără duplicate, din fișier sau stdin ("-")."""
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    seen: Set[str] = set()
+    try:
+        for line in stream:
+            item = line.strip()
+            if item and not item.startswith("#") and item not in seen:
+                seen.add(item)
+                yield item
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def market_summary(car: CarSpecs, comparables: List[CarSpecs]) -> Dict:
+    """Rezumatul pieței pentru `car`, din scorurile vectorizate ale anunțurilor similare."""
+    summary: Dict[str, object] = {f"count_{name}": 0 for name in CATEGORY_COLUMNS}
+    summary.update(comparables=0, median_price=None, price_vs_median_pct=None, best_score=None, best_link=None)
+    if not comparables:
+        return summary
+
+    results = PriceAnalyzer.classify_many(car, cars_to_frame(comparables))
+    results = results[results["category"] != "EXCLUS"]
+    summary["comparables"] = len(results)
+    if results.empty:
+        return summary
+    for name, count in results["category"].value_counts().items():
+        summary[f"count_{name}"] = int(count)
+    median = float(results["price"].median())
+    summary["median_price"] = median
+    if median > 0 and car.price > 0:
+        summary["price_vs_median_pct"] = round((car.price - median) / median * 100, 2)
+    best = results.loc[results["score"].idxmax()]
+    summary["best_score"] = int(best["score"])
+    summary["best_link"] = best["link"]
+    return summary
+
+
+def market_position(stats: MarketStats, car: CarSpecs, comparables: List[CarSpecs]) -> Dict:
+    """Percentila și prețul corect din statisticile pe segmente (actualizate cu anunțurile găsite)."""
+    stats.observe([car] + comparables)
+    position = stats.position(car)
+    if position is None:
+        return {"segment_count": None, "market_percentile": None, "fair_price": None}
+    return {
+        "segment_count": position.count,
+        "market_percentile": round(position.percentile, 1),
+        "fair_price": None if position.fair_price is None else round(position.fair_price),
+    }
+
+
+# -------- worker --------
+
+_worker: Dict[str, object] = {}
+
+
+def _init_worker(args) -> None:
+    """Fiecare proces are propriul extractor (sesiune HTTP) și propriile conexiuni SQLite."""
+    # limita de rată e globală: se împarte între procese
+    rate = args.rate / max(1, args.workers)
+    cache = ResponseCache(ResponseCache.default_path(), offline=args.offline)
+    extractor = OLXExtractorFixed(rate=rate, cache=cache, stream=args.stream)
+    store = ListingStore(ListingStore.default_path())
+    index = None
+    if args.nearest:
+        index = ComparablesIndex()
+        index.add(store.listings())
+    _worker.update(
+        args=args,
+        extractor=extractor,
+        crawler=SearchCrawler(extractor, max_pages=args.max_pages),
+        store=store,
+        stats=MarketStats(MarketStats.default_path()),
+        index=index,
+    )
+
+
+def _load_listing(item: str) -> Optional[CarSpecs]:
+    extractor: OLXExtractorFixed = _worker["extractor"]
+    if item.startswith(("http://", "https://")):
+        return extractor.extract_car_specs(item)
+    return extractor.parse_listing(Path(item).read_bytes(), item)
+
+
+def load_listing(item: str) -> Tuple[str, Optional[CarSpecs], Optional[str]]:
+    """(intrare, anunț, eroare): prima etapă a unui lot planificat."""
+    try:
+        return item, _load_listing(item), None
+    except Exception as e:
+        return item, None, f"{type(e).__name__}: {e}"
+
+
+def crawl_search(query: SearchQuery) -> Tuple[List[CarSpecs], bool]:
+    """SearchPlanner.crawl în worker; o eroare e tratată ca o căutare fără rezultate, neterminată."""
+    try:
+        return SearchPlanner.crawl(_worker["crawler"], _worker["store"], query)
+    except Exception as e:
+        logging.warning("Căutarea comasată a eșuat (%s): %s", URLBuilder.build_query_url(query), e)
+        return [], False
+
+
+def score_listing(item: str) -> Dict:
+    """Rândul de ieșire pentru o intrare; erorile sunt raportate în `status`, nu opresc lotul."""
+    return score_loaded(load_listing(item))
+
+
+def score_loaded(loaded: Tuple[str, Optional[CarSpecs], Optional[str]], found: Optional[List[CarSpecs]] = None) -> Dict:
+    """Rândul de ieșire pentru un anunț deja extras (vezi load_listing).
+
+    found: comparabilele din căutarea comasată; None = se caută acum (find_comparables).
+    """
+    args = _worker["args"]
+    item, car, error = loaded
+    record: Dict[str, object] = {"input": item}
+    if error is not None:
+        record["status"] = "error"
+        record["error"] = error
+        return record
+    if car is None:
+        record["status"] = "extract_failed"
+        return record
+    try:
+        query = SearchQuery.similar_to(car, args.years, args.km, args.power, args.engine)
+        if found is None:
+            found = list(find_comparables(_worker["crawler"], _worker["store"], query, exclude=[car.link]))
+        if args.nearest:
+            # cele mai apropiate N anunțuri văzute de worker (depozit și căutările lui), nu doar din toleranțe
+            _worker["index"].add([car] + found)
+            found = [c for c, _ in _worker["index"].nearest(car, args.nearest)]
+        # republicările (aceeași mașină sub alt ID) s-ar număra de mai multe ori în rezumat
+        comparables = DEDUPLICATOR.unique(found, reference=car)
+        record.update(asdict(car))
+        record["search_url"] = URLBuilder.build_query_url(query)
+        record["duplicates"] = len(found) - len(comparables)
+        record.update(market_summary(car, comparables))
+        record.update(market_position(_worker["stats"], car, comparables))
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+# -------- ieșire --------
+
+class JsonlSink:
+    """Un rând JSON per anunț, scris imediat; un rând incomplet de la final e tăiat la reluare."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = self._recover()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _recover(self) -> Set[str]:
+        done: Set[str] = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record["input"])
+        return done
+
+    def write(self, record: Dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink:
+    """Director cu fișiere part-NNNNN.parquet; fiecare fișier e scris complet înainte de a fi redenumit."""
+
+    def __init__(self, path: str, flush_every: int):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self._rows: List[Dict] = []
+        import pandas as pd
+
+        parts = sorted(self.path.glob("part-*.parquet"))
+        self._next = len(parts)
+        self.done: Set[str] = set()
+        for part in parts:
+            frame = pd.read_parquet(part, columns=["input", "status"])
+            self.done.update(frame.loc[frame["status"] == "ok", "input"])
+
+    def write(self, record: Dict) -> None:
+        self._rows.append(record)
+        if len(self._rows) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        import pandas as pd
+
+        final = self.path / f"part-{self._next:05d}.parquet"
+        tmp = final.with_suffix(".tmp")
+        frame = pd.DataFrame(self._rows, columns=list(RECORD_DTYPES)).astype(RECORD_DTYPES)
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, final)
+        self._next += 1
+        self._rows.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+
+def open_sink(args):
+    if args.output == "-":
+        return None
+    if args.output.endswith(".parquet"):
+        return ParquetSink(args.output, args.flush_every)
+    return JsonlSink(args.output)
+
+
+def _chunks(items: Iterator[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def planned_records(pool, items: Iterator[str], args) -> Iterator[Dict]:
+    """Rândurile de ieșire, lot cu lot: extragere, celulele de căutare ale segmentelor, apoi scorul.
+
+    Planificatorul e comun tuturor loturilor: învață din căutările lor densitatea segmentelor,
+    iar celulele căutate de un lot se răspund din depozit pentru următoarele.
+    """
+    planner = SearchPlanner(max_pages=args.max_pages)
+    store = ListingStore(ListingStore.default_path())
+
+    def crawl_many(cells: List[SearchQuery]) -> List[Tuple[List[CarSpecs], bool]]:
+        if args.progress:
+            print(f"  {len(cells)} căutări", file=sys.stderr)
+        return pool.map(crawl_search, cells, chunksize=1)
+
+    for chunk in _chunks(items, args.plan_batch):
+        loaded = pool.map(load_listing, chunk, chunksize=1)
+        cars = [(n, car) for n, (_, car, _) in enumerate(loaded) if car is not None]
+        queries = [SearchQuery.similar_to(car, args.years, args.km, args.power, args.engine) for _, car in cars]
+        if args.progress and queries:
+            print(f"  {len(queries)} anunțuri", file=sys.stderr)
+        results = planner.run(queries, crawl_many, store, exclude=[[car.link] for _, car in cars])
+        # anunțurile fără rezultate din plan (căutare neterminată, depozit) se caută separat în score_loaded
+        found = {cars[i][0]: comparables for i, comparables in results.items()}
+        yield from pool.starmap(score_loaded, [(entry, found.get(n)) for n, entry in enumerate(loaded)], chunksize=1)
+
+
+def run(args) -> int:
+    sink = open_sink(args)
+    done = sink.done if sink is not None else set()
+    items = (item for item in read_inputs(args.input) if item not in done)
+    if done:
+        print(f"Reluare: {len(done)} anunțuri deja procesate", file=sys.stderr)
+
+    write = sink.write if sink is not None else _write_stdout
+    counts: Dict[str, int] = {}
+    pool = multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(args,))
+    try:
+        if args.plan_batch > 1:
+            records = planned_records(pool, items, args)
+        else:
+            records = pool.imap_unordered(score_listing, items, chunksize=1)
+        for record in records:
+            write(record)
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+            if args.progress and sum(counts.values()) % args.progress == 0:
+                print(f"  {sum(counts.values())} anunțuri: {counts}", file=sys.stderr)
+        pool.close()
+    except KeyboardInterrupt:
+        pool.terminate()
+        print("Oprit; rulați din nou aceeași comandă pentru a relua.", file=sys.stderr)
+        return 130
+    finally:
+        pool.join()
+        if sink is not None:
+            sink.close()
+    print(f"Gata: {counts}", file=sys.stderr)
+    return 0
+
+
+def _write_stdout(record: Dict) -> None:
+    sys.stdout.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    sys.stdout.flush()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="fișier cu câte o intrare pe linie (link sau pagină .html); - pentru stdin")
+    parser.add_argument("-o", "--output", default="-", help="*.jsonl, *.parquet (director) sau - pentru stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--rate", type=float, default=0.6, help="cereri/secundă în total, pentru toate procesele")
+    parser.add_argument("--max-pages", type=int, default=5, help="pagini de rezultate per căutare")
+    parser.add_argument("--offline", action="store_true", help="doar pagini din cache, fără rețea")
+    parser.add_argument("--stream", action="store_true", help="citește anunțurile în flux, până la datele necesare")
+    parser.add_argument("--nearest", type=int, default=0, help="scor față de cele mai apropiate N anunțuri (0 = cele din toleranțe)")
+    parser.add_argument("--plan-batch", type=int, default=1000, help="anunțuri per lot cu căutări comasate (0 = o căutare per anunț)")
+    parser.add_argument("--flush-every", type=int, default=500, help="rânduri per fișier Parquet")
+    parser.add_argument("--progress", type=int, default=100, help="raport la fiecare N anunțuri (0 = fără)")
+    tol = parser.add_argument_group("toleranțe")
+    tol.add_argument("--years", type=int, default=2)
+    tol.add_argument("--km", type=int, default=30000)
+    tol.add_argument("--power", type=int, default=20)
+    tol.add_argument("--engine", type=int, default=300, help="cm³ (±) față de motorul anunțului")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
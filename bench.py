@@ -0,0 +1,1045 @@
+"""Benchmark offline pentru extractor, pe un director cu pagini OLX salvate.
+
+    python bench.py backends CORPUS_DIR [--repeat N]
+    python bench.py specs CORPUS_DIR [--repeat N]
+    python bench.py synth CORPUS_DIR [--listings N] [--search-pages N]
+    python bench.py record URLS_FILE CORPUS_DIR
+    python bench.py pipeline CORPUS_DIR [--repeat N] [--save F] [--baseline F]
+    python bench.py stream CORPUS_DIR [--repeat N]
+    python bench.py neighbors [--listings N] [--k K] [--queries N]
+    python bench.py plan [--cars N] [--market N] [--trims N] [--max-pages N] [--chunk N]
+    python bench.py table [--listings N] [--queries N]
+    python bench.py dedup [--cars N] [--relist-rate R]
+    python bench.py imports [--repeat N] [--max-ms MS]
+
+Corpusul: paginile de anunț (*.html) direct în director, paginile de rezultate în
+CORPUS_DIR/search/. `synth` generează un corpus sintetic (anunțuri doar cu text, cu
+JSON-LD și cu starea OLX), `record` salvează pagini reale dintr-o listă de link-uri.
+
+backends: verifică întâi că toate backend-urile HTML instalate produc aceleași
+CarSpecs pentru fiecare pagină, apoi raportează pagini/secundă pentru fiecare backend
+și câte pagini au fost extrase doar din datele structurate (calea rapidă). Paritatea
+pe corpusul din tests/fixtures o verifică pytest (tests/test_backends.py); aici se
+verifică pe corpusul dat (ex. pagini reale salvate cu `record`).
+specs: timpul per anunț al motorului de specificații (SPEC_ENGINE), comparat cu
+căutarea re.I câmp cu câmp pe textul original.
+pipeline: servește corpusul printr-un server HTTP local și măsoară fiecare etapă
+(descărcare, parsare, titlu/preț/specificații, construirea URL-ului, parsarea
+rezultatelor, scor), plus pagini/secundă și memoria maximă (tracemalloc). Cu
+--baseline, o etapă mai lentă decât pragul față de rularea salvată e o regresie
+(cod de ieșire 1).
+stream: descărcarea completă față de cea în flux (OLXExtractorFixed(stream=True)),
+prin serverul local: verifică aceleași CarSpecs, apoi raportează octeții primiți și
+economisiți per anunț, câte anunțuri s-au oprit devreme și timpul per anunț.
+neighbors: indexul de vecini (ComparablesIndex) pe anunțuri sintetice: inserări
+incrementale pe secundă și timpul unei cereri „cele mai apropiate K” (exactitatea
+față de căutarea exhaustivă e verificată în tests/test_neighbors.py).
+plan: căutările unor anunțuri de referință sintetice, câte una per anunț față de celulele
+segmentelor planificate de SearchPlanner (pe loturi de --chunk, ca batch.py): căutări,
+cereri HTTP (pagini de rezultate, pe o piață sintetică) și timpul planificării. Verifică,
+față de filtrarea separată pentru fiecare anunț, că fiecare primește din celule exact ce
+ar fi găsit singur (jumătate din anunțuri fără putere și motor, ca în cardurile de
+rezultate), și eșuează dacă cererile depășesc de PLAN_MAX_OVERHEAD ori paginile unei
+căutări per segment (sau ale căutărilor per anunț, dacă sunt mai puține).
+table: CarSpecsTable (coloane numpy) față de o listă de CarSpecs, pe anunțuri sintetice:
+octeți per anunț (tracemalloc), timpul filtrării după toleranțe și după marcă (cu
+sub-tabelul rezultat), cu verificarea acelorași anunțuri ca SearchQuery.matches, și
+aceleași rezultate din PriceAnalyzer.classify_many pe to_frame() ca pe cars_to_frame().
+dedup: ListingDeduplicator pe o piață sintetică cu multe mașini cu titlu generic
+(„Volkswagen Golf 2016”) și republicări ale unora dintre ele (alt ID, km și preț
+ușor schimbate, descriere ușor editată): precizia și recall-ul pe perechi față de
+clusterele reale și timpul, o dată cu jumătate din anunțuri cu descriere și o dată
+doar cu carduri (fără descriere).
+imports: timpul de import al fiecărui punct de intrare (pachetul, extractorul,
+batch.py, watch.py, interfața), fiecare într-un proces nou, și ce module grele
+(streamlit, pandas, numpy...) trage după el.
+"""
+import argparse
+import json
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, replace
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import urlsplit
+
+from olx_analyzer import (
+    BRAND_CATALOGUE,
+    SPEC_ENGINE,
+    CarSpecs,
+    CarSpecsTable,
+    ComparablesIndex,
+    ListingDeduplicator,
+    ListingStore,
+    Metrics,
+    OLXExtractorFixed,
+    PriceAnalyzer,
+    ResponseCache,
+    SearchCrawler,
+    SearchPlanner,
+    SearchQuery,
+    URLBuilder,
+    available_backends,
+    car_from_fields,
+    cars_to_frame,
+    find_comparables,
+    listing_id,
+)
+
+
+def load_corpus(corpus_dir: str) -> List[Tuple[str, bytes]]:
+    """Încarcă paginile salvate (*.html) ca (nume, conținut)."""
+    pages = [(p.name, p.read_bytes()) for p in sorted(Path(corpus_dir).glob("*.html"))]
+    if not pages:
+        raise SystemExit(f"Nu am găsit pagini .html în {corpus_dir}")
+    return pages
+
+
+def check_backend_parity(pages: List[Tuple[str, bytes]], backends: List[str]) -> List[str]:
+    """Întoarce diferențele de CarSpecs între backend-uri (listă goală = paritate)."""
+    problems = []
+    extractors = {b: OLXExtractorFixed(backend=b) for b in backends}
+    for name, content in pages:
+        results: Dict[str, dict] = {
+            b: asdict(e.parse_listing(content, name)) for b, e in extractors.items()
+        }
+        reference = results[backends[-1]]
+        for b, specs in results.items():
+            for key, value in specs.items():
+                if value != reference[key]:
+                    problems.append(f"{name}: {b}.{key}={value!r} vs {backends[-1]}.{key}={reference[key]!r}")
+    return problems
+
+
+def bench_backends(pages: List[Tuple[str, bytes]], backends: List[str], repeat: int) -> Dict[str, float]:
+    """Pagini/secundă pentru parse_listing, pe fiecare backend."""
+    rates = {}
+    for b in backends:
+        extractor = OLXExtractorFixed(backend=b)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for name, content in pages:
+                extractor.parse_listing(content, name)
+        elapsed = time.perf_counter() - start
+        rates[b] = repeat * len(pages) / elapsed
+    return rates
+
+
+def structured_coverage(pages: List[Tuple[str, bytes]]) -> Dict[str, int]:
+    """Câte pagini au mers pe calea rapidă (doar date structurate) și câte au cerut textul."""
+    metrics = Metrics()
+    extractor = OLXExtractorFixed(metrics=metrics)
+    for name, content in pages:
+        extractor.parse_listing(content, name)
+    return {path: int(metrics.counter("listings_total", path=path)) for path in ("fast", "text")}
+
+
+def cmd_backends(args) -> int:
+    pages = load_corpus(args.corpus)
+    backends = available_backends()
+    print(f"Pagini: {len(pages)} | backend-uri: {', '.join(backends)}")
+
+    problems = check_backend_parity(pages, backends)
+    for p in problems:
+        print(f"  DIFERENȚĂ {p}")
+    print("Paritate: OK" if not problems else f"Paritate: {len(problems)} diferențe")
+
+    for b, rate in bench_backends(pages, backends, args.repeat).items():
+        print(f"  {b:<12} {rate:10.1f} pagini/s")
+
+    stats = structured_coverage(pages)
+    print(f"Cale rapidă (date structurate): {stats['fast']}/{stats['fast'] + stats['text']} pagini")
+    return 1 if problems else 0
+
+
+def _specs_per_field_ignorecase(text: str) -> None:
+    # referința: fiecare câmp caută separat, case-insensitive, pe textul nemodificat
+    for f in SPEC_ENGINE.fields:
+        re.search(f.pattern.pattern, text, re.I)
+
+
+def bench_specs(pages: List[Tuple[str, bytes]], repeat: int) -> Dict[str, float]:
+    """Microsecunde per anunț pentru extragerea specificațiilor din textul vizibil."""
+    extractor = OLXExtractorFixed()
+    texts = [extractor.parse_page(content, name).text for name, content in pages]
+    timings = {}
+    for label, fn in (("SPEC_ENGINE", SPEC_ENGINE.extract), ("re.I per câmp", _specs_per_field_ignorecase)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                fn(text)
+        timings[label] = (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+    return timings
+
+
+def cmd_specs(args) -> int:
+    pages = load_corpus(args.corpus)
+    timings = bench_specs(pages, args.repeat)
+    for label, us in timings.items():
+        print(f"  {label:<14} {us:10.1f} µs/anunț")
+    print(f"  accelerare: {timings['re.I per câmp'] / timings['SPEC_ENGINE']:.2f}x")
+    return 0
+
+
+# -------- corpus sintetic / înregistrat --------
+
+SYNTH_MODELS = [
+    ("Dacia", "logan"), ("Dacia", "duster"), ("Ford", "focus"), ("Volkswagen", "golf"),
+    ("BMW", "seria-3"), ("Skoda", "octavia"), ("Renault", "clio"), ("Toyota", "corolla"),
+]
+# valoare normalizată -> cum apare în textul anunțului
+SYNTH_FUELS = {"diesel": "Motorina diesel", "petrol": "Benzina", "hybrid": "Hibrid"}
+SYNTH_GEARBOXES = {"manual": "Manuala", "automatic": "Automata"}
+SYNTH_BODIES = {"sedan": "Sedan", "hatchback": "Hatchback", "suv": "SUV"}
+SYNTH_COLORS = {"white": "Alb", "black": "Negru", "grey": "Gri", "blue": "Albastru"}
+SYNTH_STYLES = ("text", "json-ld", "state")
+
+
+def _synth_car(rng: random.Random) -> Dict:
+    brand, model = rng.choice(SYNTH_MODELS)
+    return {
+        "brand": brand, "model": model,
+        "year": rng.randint(2008, 2024), "km": rng.randint(5, 300) * 1000,
+        "price": rng.randint(30, 400) * 100,
+        "fuel": rng.choice(list(SYNTH_FUELS)), "gearbox": rng.choice(list(SYNTH_GEARBOXES)),
+        "body": rng.choice(list(SYNTH_BODIES)), "color": rng.choice(list(SYNTH_COLORS)),
+        "engine_size": rng.choice([999, 1461, 1598, 1968, 1995]), "power": rng.randint(7, 25) * 10,
+        "state": "used",
+    }
+
+
+def _synth_padding(rng: random.Random, kb: int) -> str:
+    # meniuri, linkuri și un script mare după datele anunțului, ca greutatea paginii să fie
+    # apropiată de una reală
+    nav = "".join(f'<li><a href="/categorie-{k}/">Categorie {k}</a></li>' for k in range(60))
+    blob = "var s={" + ",".join(f'"k{k}":"{rng.random():.12f}"' for k in range(max(0, kb) * 30)) + "};"
+    return f"<nav><ul>{nav}</ul></nav><script>{blob}</script>"
+
+
+def synth_listing(rng: random.Random, index: int, style: str, pad_kb: int) -> Tuple[str, str]:
+    """(nume fișier, HTML) pentru un anunț sintetic; style: text, json-ld sau state."""
+    car = _synth_car(rng)
+    slug = f"{BRAND_CATALOGUE.slug(car['brand'])}-{car['model']}-{car['year']}-ID{index:06d}"
+    title = f"{car['brand']} {car['model'].replace('-', ' ').title()} {car['year']}"
+    description = "Mașină întreținută, istoric complet de service."
+    structured = ""
+    if style == "json-ld":
+        ld = {
+            "@context": "https://schema.org", "@type": "Car", "name": title, "description": description,
+            "brand": {"@type": "Brand", "name": car["brand"]}, "model": car["model"],
+            "vehicleModelDate": str(car["year"]),
+            "mileageFromOdometer": {"@type": "QuantitativeValue", "value": car["km"], "unitCode": "KMT"},
+            "fuelType": car["fuel"], "vehicleTransmission": car["gearbox"], "bodyType": car["body"],
+            "color": car["color"], "itemCondition": "https://schema.org/UsedCondition",
+            "vehicleEngine": {"engineDisplacement": {"value": car["engine_size"], "unitCode": "CMQ"},
+                              "enginePower": {"value": car["power"], "unitCode": "BHP"}},
+            "offers": {"@type": "Offer", "price": car["price"], "priceCurrency": "EUR"},
+        }
+        structured = f'<script type="application/ld+json">{json.dumps(ld)}</script>'
+    elif style == "state":
+        params = [{"key": key, "normalizedValue": str(car[field])} for key, field in (
+            ("model", "model"), ("year", "year"), ("rulaj_pana", "km"), ("petrol", "fuel"),
+            ("gearbox", "gearbox"), ("car_body", "body"), ("state", "state"), ("color", "color"),
+            ("enginesize", "engine_size"), ("engine_power", "power"),
+        )]
+        ad = {"title": title, "description": description, "price": {"regularPrice": {"value": car["price"], "currencyCode": "EUR"}}, "params": params}
+        state = json.dumps(json.dumps({"ad": {"ad": ad}}))
+        structured = f"<script>window.__PRERENDERED_STATE__= {state};</script>"
+    details = (
+        f"Anul: {car['year']} · {car['km']:,} km · {car['engine_size']} cm³ · {car['power']} cp · "
+        f"Combustibil {SYNTH_FUELS[car['fuel']]} · Cutie {SYNTH_GEARBOXES[car['gearbox']]} · "
+        f"Caroserie {SYNTH_BODIES[car['body']]} · Culoare {SYNTH_COLORS[car['color']]} · Stare: folosit"
+    ).replace(",", ".")
+    price = f"{car['price']:,}".replace(",", ".")
+    html = (
+        f"<!DOCTYPE html><html><head><title>{title} - OLX.ro</title>"
+        f'<link rel="canonical" href="https://www.olx.ro/d/oferta/{slug}.html">{structured}</head><body>'
+        f'<ol><li><a href="/auto-masini-moto-ambarcatiuni/autoturisme/{BRAND_CATALOGUE.slug(car["brand"])}/">'
+        f"{car['brand']}</a></li></ol><h1>{title}</h1><h3>Preț: {price} EUR</h3>"
+        f'<div>{details}</div><div data-cy="ad_description">{description}</div>'
+        f"{_synth_padding(rng, pad_kb)}</body></html>"
+    )
+    return f"{slug}.html", html
+
+
+def synth_search_page(rng: random.Random, page: int, last: bool, cards: int) -> str:
+    """O pagină de rezultate cu carduri l-card, ca cele parsate de SearchCrawler."""
+    parts = []
+    for k in range(cards):
+        car = _synth_car(rng)
+        ident = page * 1000 + k
+        slug = f"{BRAND_CATALOGUE.slug(car['brand'])}-{car['model']}-{car['year']}-ID{ident:06d}s"
+        price = f"{car['price']:,}".replace(",", ".")
+        km = f"{car['km']:,}".replace(",", " ")
+        parts.append(
+            f'<div data-cy="l-card" id="{ident}"><a href="/d/oferta/{slug}.html">'
+            f"<h4>{car['brand']} {car['model']} {car['year']}</h4></a>"
+            f'<p data-testid="ad-price">{price} €</p><span>{car["year"]} - {km} km</span></div>'
+        )
+    forward = "" if last else f'<a data-testid="pagination-forward" href="?page={page + 1}">next</a>'
+    return f"<html><head><title>Rezultate - OLX.ro</title></head><body>{''.join(parts)}{forward}</body></html>"
+
+
+def cmd_synth(args) -> int:
+    rng = random.Random(args.seed)
+    out = Path(args.corpus)
+    (out / "search").mkdir(parents=True, exist_ok=True)
+    for i in range(args.listings):
+        name, html = synth_listing(rng, i, SYNTH_STYLES[i % len(SYNTH_STYLES)], args.page_kb)
+        (out / name).write_text(html, encoding="utf-8")
+    for page in range(1, args.search_pages + 1):
+        html = synth_search_page(rng, page, page == args.search_pages, args.cards)
+        (out / "search" / f"search-{page:04d}.html").write_text(html, encoding="utf-8")
+    print(f"Corpus: {args.listings} anunțuri, {args.search_pages} pagini de rezultate în {out}")
+    return 0
+
+
+def cmd_record(args) -> int:
+    """Salvează pagini reale: anunțurile (/d/oferta/) în corpus, restul în search/."""
+    out = Path(args.corpus)
+    (out / "search").mkdir(parents=True, exist_ok=True)
+    extractor = OLXExtractorFixed(cache=ResponseCache(ResponseCache.default_path()))
+    urls = [u.strip() for u in Path(args.urls).read_text(encoding="utf-8").splitlines() if u.strip()]
+    saved = 0
+    for i, url in enumerate(urls):
+        content = extractor.fetch_page(url)
+        if content is None:
+            print(f"  sărit: {url}")
+            continue
+        if "/d/oferta/" in url:
+            path = out / urlsplit(url).path.rsplit("/", 1)[-1]
+        else:
+            path = out / "search" / f"search-{i:04d}.html"
+        path.write_bytes(content)
+        saved += 1
+    print(f"Salvate: {saved}/{len(urls)} pagini în {out}")
+    return 0
+
+
+# -------- server local + pipeline --------
+
+class _CorpusHandler(SimpleHTTPRequestHandler):
+    """Servește corpusul; /d/oferta/NUME.html -> CORPUS/NUME.html, ca URL-urile să arate ca pe OLX."""
+
+    def translate_path(self, path: str) -> str:
+        if path.startswith("/d/oferta/"):
+            path = path[len("/d/oferta"):]
+        return super().translate_path(path)
+
+    def copyfile(self, source, outputfile) -> None:
+        try:
+            super().copyfile(source, outputfile)
+        except ConnectionError:
+            # citirea în flux închide conexiunea după ce are datele de care are nevoie
+            pass
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@contextmanager
+def stand_in_server(corpus_dir: str) -> Iterator[str]:
+    """Server HTTP local pentru corpus; produce URL-ul de bază."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_CorpusHandler, directory=corpus_dir))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# etapele măsurate; cele de anunț sunt în aceeași ordine ca în parse_listing
+LISTING_STAGES = ("fetch", "parse", "structured", "specs", "title", "price", "url")
+STAGES = LISTING_STAGES + ("search_fetch", "search_parse", "scoring")
+BENCH_TOLERANCES = {"years": 2, "km": 30000, "power": 20, "engine_min": 1000, "engine_max": 2500}
+
+
+def run_pipeline(base_url: str, listings: List[str], searches: List[str], extractor: OLXExtractorFixed) -> Dict[str, float]:
+    """O trecere completă; întoarce secundele petrecute în fiecare etapă."""
+    totals = dict.fromkeys(STAGES, 0.0)
+    clock = time.perf_counter
+
+    crawler = SearchCrawler(extractor)
+    comparables = []
+    for name in searches:
+        url = f"{base_url}/search/{name}"
+        t0 = clock()
+        content = extractor.fetch_page(url)
+        t1 = clock()
+        results, _ = crawler.parse_search_page(content, url)
+        comparables.extend(car_from_fields(fields, link) for link, fields in results)
+        t2 = clock()
+        totals["search_fetch"] += t1 - t0
+        totals["search_parse"] += t2 - t1
+
+    cars = []
+    for name in listings:
+        url = f"{base_url}/d/oferta/{name}"
+        t0 = clock()
+        content = extractor.fetch_page(url)
+        t1 = clock()
+        view = extractor.parse_page(content, url)
+        t2 = clock()
+        structured = extractor.structured_fields(view)
+        t3 = clock()
+        specs = extractor.extract_specs_from_structured_data(view, structured)
+        t4 = clock()
+        specs["title"] = extractor.extract_title(view)
+        t5 = clock()
+        if "price" not in specs:
+            specs["price"], specs["price_text"] = extractor.extract_price(view)
+        car = car_from_fields(specs, url)
+        t6 = clock()
+        URLBuilder.build_query_url(SearchQuery.from_car(car, BENCH_TOLERANCES))
+        t7 = clock()
+        for stage, dt in zip(LISTING_STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4, t6 - t5, t7 - t6)):
+            totals[stage] += dt
+        cars.append(car)
+
+    t0 = clock()
+    if comparables:
+        frame = cars_to_frame(comparables)
+        for car in cars:
+            PriceAnalyzer.classify_many(car, frame)
+    totals["scoring"] += clock() - t0
+    return totals
+
+
+def bench_pipeline(corpus_dir: str, repeat: int) -> Dict:
+    """Timpii per etapă (µs per anunț / pagină de rezultate), pagini/s și memoria maximă."""
+    corpus = Path(corpus_dir)
+    listings = [p.name for p in sorted(corpus.glob("*.html"))]
+    searches = [p.name for p in sorted((corpus / "search").glob("*.html"))]
+    if not listings:
+        raise SystemExit(f"Nu am găsit pagini .html în {corpus_dir}")
+    # fără limită de rată și fără cache: măsurăm lucrul, nu așteptarea
+    extractor = OLXExtractorFixed(rate=1e9, burst=1_000_000)
+
+    with stand_in_server(str(corpus)) as base_url:
+        run_pipeline(base_url, listings, searches, extractor)          # încălzire (conexiuni, importuri)
+        totals = dict.fromkeys(STAGES, 0.0)
+        for _ in range(repeat):
+            for stage, dt in run_pipeline(base_url, listings, searches, extractor).items():
+                totals[stage] += dt
+        # memoria se măsoară separat: tracemalloc încetinește execuția
+        tracemalloc.start()
+        run_pipeline(base_url, listings, searches, extractor)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    per_item = {stage: len(listings) for stage in STAGES}
+    per_item.update(search_fetch=max(1, len(searches)), search_parse=max(1, len(searches)))
+    listing_seconds = sum(totals[s] for s in LISTING_STAGES)
+    return {
+        "listings": len(listings),
+        "search_pages": len(searches),
+        "stages_us": {s: totals[s] / (repeat * per_item[s]) * 1e6 for s in STAGES},
+        "pages_per_s": repeat * len(listings) / listing_seconds if listing_seconds else 0.0,
+        "peak_kb": peak / 1024,
+    }
+
+
+def find_regressions(current: Dict, baseline: Dict, threshold: float, noise_us: float = 5.0) -> List[str]:
+    """Etapele mai lente decât baseline * (1 + threshold); diferențele sub `noise_us` sunt ignorate."""
+    problems = []
+    for stage, us in current["stages_us"].items():
+        base = baseline.get("stages_us", {}).get(stage)
+        if base is not None and us > base * (1 + threshold) and us - base > noise_us:
+            problems.append(f"{stage}: {us:.1f} µs vs {base:.1f} µs")
+    base_rate = baseline.get("pages_per_s")
+    if base_rate and current["pages_per_s"] < base_rate / (1 + threshold):
+        problems.append(f"pagini/s: {current['pages_per_s']:.1f} vs {base_rate:.1f}")
+    base_peak = baseline.get("peak_kb")
+    if base_peak and current["peak_kb"] > base_peak * (1 + threshold):
+        problems.append(f"memorie maximă: {current['peak_kb']:.0f} KB vs {base_peak:.0f} KB")
+    return problems
+
+
+def cmd_pipeline(args) -> int:
+    result = bench_pipeline(args.corpus, args.repeat)
+    print(f"Anunțuri: {result['listings']} | pagini de rezultate: {result['search_pages']}")
+    for stage, us in result["stages_us"].items():
+        print(f"  {stage:<14} {us:10.1f} µs")
+    print(f"  {'pagini/s':<14} {result['pages_per_s']:10.1f}")
+    print(f"  {'memorie max.':<14} {result['peak_kb']:10.0f} KB")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    problems = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        problems = find_regressions(result, baseline, args.threshold)
+    if args.min_rate and result["pages_per_s"] < args.min_rate:
+        problems.append(f"pagini/s sub minim: {result['pages_per_s']:.1f} < {args.min_rate}")
+    for p in problems:
+        print(f"  REGRESIE {p}")
+    return 1 if problems else 0
+
+
+def bench_stream(corpus_dir: str, repeat: int) -> Dict:
+    """Anunțurile corpusului, o dată descărcate complet și o dată în flux."""
+    corpus = Path(corpus_dir)
+    listings = [p.name for p in sorted(corpus.glob("*.html"))]
+    if not listings:
+        raise SystemExit(f"Nu am găsit pagini .html în {corpus_dir}")
+    modes = {
+        "complet": OLXExtractorFixed(rate=1e9, burst=1_000_000, metrics=Metrics()),
+        "flux": OLXExtractorFixed(rate=1e9, burst=1_000_000, metrics=Metrics(), stream=True),
+    }
+    if not modes["flux"].stream:
+        raise SystemExit("Citirea în flux necesită lxml")
+
+    result: Dict = {"listings": len(listings), "mismatches": []}
+    with stand_in_server(str(corpus)) as base_url:
+        urls = [f"{base_url}/d/oferta/{name}" for name in listings]
+        # trecerea de verificare încălzește și conexiunile
+        for url in urls:
+            if modes["complet"].extract_car_specs(url) != modes["flux"].extract_car_specs(url):
+                result["mismatches"].append(url)
+        for mode, extractor in modes.items():
+            extractor.metrics.reset()
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                for url in urls:
+                    extractor.extract_car_specs(url)
+            pages = repeat * len(urls)
+            metrics = extractor.metrics
+            result[mode] = {
+                "ms_per_page": (time.perf_counter() - t0) / pages * 1e3,
+                "kb_per_page": metrics.counter("http_bytes_total") / pages / 1024,
+                "saved_kb_per_page": metrics.counter("stream_bytes_saved_total") / pages / 1024,
+                "early": metrics.counter("stream_pages_total", result="early") / pages,
+            }
+    return result
+
+
+def cmd_stream(args) -> int:
+    result = bench_stream(args.corpus, args.repeat)
+    print(f"Anunțuri: {result['listings']}")
+    for mode in ("complet", "flux"):
+        r = result[mode]
+        print(
+            f"  {mode:<8} {r['ms_per_page']:8.2f} ms/anunț  {r['kb_per_page']:8.1f} KB primiți  "
+            f"{r['saved_kb_per_page']:8.1f} KB economisiți  oprite devreme: {r['early']:.0%}"
+        )
+    for url in result["mismatches"]:
+        print(f"  DIFERENȚĂ {url}")
+    return 1 if result["mismatches"] else 0
+
+
+def bench_neighbors(listings: int, k: int, queries: int, seed: int = 1) -> Dict:
+    rng = random.Random(seed)
+    cars = []
+    for i in range(listings):
+        fields = _synth_car(rng)
+        if rng.random() < 0.1:
+            fields["power"] = None
+        cars.append(car_from_fields(fields, f"https://www.olx.ro/d/oferta/synth-ID{i:07d}.html"))
+
+    index = ComparablesIndex()
+    t0 = time.perf_counter()
+    # în loturi, ca rezultatele care sosesc din căutări
+    for start in range(0, len(cars), 100):
+        index.add(cars[start:start + 100])
+    insert_s = time.perf_counter() - t0
+
+    sample = rng.sample(cars, min(queries, len(cars)))
+    times = []
+    for car in sample:
+        t0 = time.perf_counter()
+        index.nearest(car, k)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return {
+        "listings": listings,
+        "inserts_per_s": listings / insert_s,
+        "query_us": sum(times) / len(times) * 1e6,
+        "query_p99_us": times[int(0.99 * (len(times) - 1))] * 1e6,
+    }
+
+
+def cmd_neighbors(args) -> int:
+    result = bench_neighbors(args.listings, args.k, args.queries)
+    print(f"Anunțuri: {result['listings']} | K = {args.k}")
+    print(f"  {'inserări/s':<14} {result['inserts_per_s']:10.0f}")
+    print(f"  {'cerere':<14} {result['query_us']:10.1f} µs (p99 {result['query_p99_us']:.1f} µs)")
+    return 0
+
+
+def _fleet_car(rng: random.Random, index: int, trims: List[Dict]) -> CarSpecs:
+    """Un anunț cu una dintre motorizările `trims` (model, caroserie, combustibil, cutie, motor, putere)."""
+    fields = dict(_synth_car(rng), **rng.choice(trims))
+    return car_from_fields(fields, f"https://www.olx.ro/d/oferta/synth-ID{index:07d}.html")
+
+
+def olx_filter(query: SearchQuery, car: CarSpecs) -> bool:
+    """Filtrele căutării aplicate de OLX, pe valorile reale ale anunțului (referința pentru fan_out)."""
+    if car.brand != query.brand or (query.model and car.model.lower() != query.model.lower()):
+        return False
+    if query.body and car.body != query.body:
+        return False
+    ranges = {"year": query.year, "km": query.km, "power": query.power, "engine_size": query.engine_size}
+    for name, bounds in ranges.items():
+        if bounds is not None and not bounds[0] <= getattr(car, name) <= bounds[1]:
+            return False
+    enums = {"fuel": query.fuels, "gearbox": query.gearboxes, "state": query.states}
+    return all(not values or getattr(car, name) in values for name, values in enums.items())
+
+
+# `bench plan` eșuează dacă planul cere mai mult de atâtea ori paginile necesare: o căutare
+# paginată per segment sau, dacă e mai puțin, câte o căutare per anunț
+PLAN_MAX_OVERHEAD = 1.5
+
+
+class MarketCrawler:
+    """Crawler peste o piață sintetică, în locul lui SearchCrawler: găsește anunțurile care trec
+    filtrele lui `query` (setată înainte de fiecare căutare) și numără paginile de rezultate cerute."""
+
+    def __init__(self, by_model: Dict[Tuple[str, str, str], List[Tuple[CarSpecs, CarSpecs]]], max_pages: int, per_page: int = 40):
+        self.by_model = by_model
+        self.max_pages = max_pages
+        self.per_page = per_page
+        self.query = None
+        self.requests = 0
+        self.last_crawl_complete = False
+
+    def crawl(self, search_url: str, defaults=None, exclude=()) -> Iterator[CarSpecs]:
+        query = self.query
+        candidates = self.by_model.get((query.brand, query.model.lower(), query.body), [])
+        found = [shown for car, shown in candidates if olx_filter(query, car)]
+        pages = max(1, -(-len(found) // self.per_page))
+        self.requests += min(pages, self.max_pages)
+        self.last_crawl_complete = pages <= self.max_pages
+        excluded = {listing_id(u) for u in exclude}
+        return iter([car for car in found[:self.max_pages * self.per_page] if listing_id(car.link) not in excluded])
+
+
+def bench_plan(cars: int, market: int, trims: int, max_pages: int = 5, chunk: int = 1000, per_page: int = 40, seed: int = 1) -> Dict:
+    rng = random.Random(seed)
+    catalogue = []
+    for _ in range(trims):
+        fields = _synth_car(rng)
+        catalogue.append({k: fields[k] for k in ("brand", "model", "body", "fuel", "gearbox", "engine_size", "power")})
+    fleet = [_fleet_car(rng, i, catalogue) for i in range(cars)]
+    # căutările din batch.py, cu toleranțele implicite
+    queries = [SearchQuery.similar_to(car) for car in fleet]
+
+    # piața sintetică, cu aceleași motorizări; cardurile de rezultate nu au puterea și motorul
+    by_model: Dict[Tuple[str, str, str], List[Tuple[CarSpecs, CarSpecs]]] = {}
+    for i in range(market):
+        car = _fleet_car(rng, cars + i, catalogue)
+        shown = replace(car, power=None, engine_size=None) if rng.random() < 0.5 else car
+        by_model.setdefault((car.brand, car.model.lower(), car.body), []).append((car, shown))
+
+    # o singură căutare paginată per segment, pe cutia an × km care cuprinde toate căutările lui
+    segments: Dict[SearchQuery, List[SearchQuery]] = {}
+    for query in queries:
+        segments.setdefault(replace(query, year=None, km=None), []).append(query)
+    needed = 0
+    for segment, members in segments.items():
+        hull = replace(
+            segment,
+            year=(min(q.year[0] for q in members), max(q.year[1] for q in members)),
+            km=(min(q.km[0] for q in members), max(q.km[1] for q in members)),
+        )
+        candidates = by_model.get((hull.brand, hull.model.lower(), hull.body), [])
+        needed += max(1, -(-sum(1 for car, _ in candidates if olx_filter(hull, car)) // per_page))
+
+    # fără planificare: o căutare per anunț, răspunsă local dacă o căutare anterioară o acoperă
+    crawler = MarketCrawler(by_model, max_pages, per_page)
+    store = ListingStore(":memory:")
+    for query in queries:
+        crawler.query = query
+        list(find_comparables(crawler, store, query))
+    naive = crawler.requests
+
+    # ca în batch.py: SearchPlanner.run pe loturi, cu un depozit comun
+    crawler = MarketCrawler(by_model, max_pages, per_page)
+    store = ListingStore(":memory:")
+    planner = SearchPlanner(max_pages=max_pages)
+    searches = 0
+
+    def crawl_many(cells: List[SearchQuery]) -> List[Tuple[List[CarSpecs], bool]]:
+        nonlocal searches
+        searches += len(cells)
+        results = []
+        for cell in cells:
+            crawler.query = cell
+            results.append(SearchPlanner.crawl(crawler, store, cell))
+        return results
+
+    mismatches = fallback = 0
+    t0 = time.perf_counter()
+    for start in range(0, cars, chunk):
+        batch, refs = queries[start:start + chunk], fleet[start:start + chunk]
+        results = planner.run(batch, crawl_many, store, exclude=[[car.link] for car in refs])
+        for i, (query, car) in enumerate(zip(batch, refs)):
+            candidates = by_model.get((query.brand, query.model.lower(), query.body), [])
+            expected = {shown.link for real, shown in candidates if olx_filter(query, real)}
+            if i not in results:
+                # ca score_loaded: căutarea separată
+                fallback += 1
+                crawler.query = query
+                list(find_comparables(crawler, store, query, exclude=[car.link]))
+            elif {c.link for c in results[i]} != expected:
+                mismatches += 1
+    run_s = time.perf_counter() - t0
+    return {
+        "cars": cars,
+        "segments": len(segments),
+        "searches": searches,
+        "naive_requests": naive,
+        "planned_requests": crawler.requests,
+        "needed_pages": needed,
+        "fallback": fallback,
+        "run_ms": run_s * 1e3,
+        "mismatches": mismatches,
+    }
+
+
+def cmd_plan(args) -> int:
+    result = bench_plan(args.cars, args.market, args.trims, args.max_pages, args.chunk)
+    print(f"Anunțuri de referință: {result['cars']} ({args.trims} motorizări) | segmente distincte: {result['segments']}")
+    print(f"  {'căutări':<14} {result['cars']:6d} -> {result['searches']:6d}")
+    print(
+        f"  {'cereri HTTP':<14} {result['naive_requests']:6d} -> {result['planned_requests']:6d} "
+        f"({result['planned_requests'] / result['naive_requests']:.0%}); "
+        f"pagini necesare: {result['needed_pages']} ({result['planned_requests'] / result['needed_pages']:.2f}×)"
+    )
+    print(f"  {'căutate separat':<14} {result['fallback']:6d} anunțuri")
+    print(f"  {'rulare':<14} {result['run_ms']:8.1f} ms (planificare, depozit, fan-out)")
+    problems = []
+    if result["mismatches"]:
+        problems.append(f"DIFERENȚE față de căutările separate: {result['mismatches']} anunțuri")
+    if result["planned_requests"] > PLAN_MAX_OVERHEAD * min(result["needed_pages"], result["naive_requests"]):
+        problems.append(f"cereri peste {PLAN_MAX_OVERHEAD}× paginile necesare")
+    for p in problems:
+        print(f"  {p}")
+    return 1 if problems else 0
+
+
+def _measure_alloc(build):
+    """(rezultatul lui build(), octeții alocați de el și rămași alocați)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def _best_ms(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+
+def bench_table(listings: int, queries: int, seed: int = 1) -> Dict:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(listings):
+        fields = _synth_car(rng)
+        if rng.random() < 0.3:
+            fields["power"] = None
+        rows.append((i, fields))
+
+    def build_list() -> List[CarSpecs]:
+        # titlul, prețul afișat și link-ul se creează aici, ca să intre în memoria listei
+        return [
+            car_from_fields(
+                dict(fields, title=f"{fields['brand']} {fields['model']} {fields['year']} #{i}", price_text=f"{fields['price']} €"),
+                f"https://www.olx.ro/d/oferta/synth-ID{i:07d}.html",
+            )
+            for i, fields in rows
+        ]
+
+    cars, list_bytes = _measure_alloc(build_list)
+    table, table_alloc = _measure_alloc(lambda: CarSpecsTable.from_cars(cars))
+
+    mismatches = 0
+    tolerance_ms = []
+    list_ms = []
+    for car in rng.sample(cars, queries):
+        query = SearchQuery.from_car(car, {
+            "years": 2, "km": 30000, "power": 20, "engine_min": car.engine_size - 300,
+            "engine_max": car.engine_size + 300, "fuel_types": [car.fuel], "gearbox_types": [car.gearbox],
+        })
+        lenient = ("power",)
+        tolerance_ms.append(_best_ms(lambda: table.filter(query, lenient)))
+        list_ms.append(_best_ms(lambda: [c for c in cars if query.matches(c, lenient)]))
+        expected = [c.link for c in cars if query.matches(c, lenient)]
+        if [c.link for c in table.filter(query, lenient)] != expected:
+            mismatches += 1
+
+    brand = SearchQuery(brand=cars[0].brand)
+    brand_ms = _best_ms(lambda: table.filter(brand))
+    subset = table.filter(brand)
+    if [c.link for c in subset] != [c.link for c in cars if brand.matches(c)]:
+        mismatches += 1
+
+    reference = cars[0]
+    from_table = PriceAnalyzer.classify_many(reference, subset.to_frame())
+    from_list = PriceAnalyzer.classify_many(reference, cars_to_frame(c for c in cars if brand.matches(c)))
+    columns = ["link", "price_diff", "year_diff", "km_diff", "fuel_diff", "score", "category"]
+    classify_equal = from_table[columns].reset_index(drop=True).equals(from_list[columns].reset_index(drop=True))
+
+    return {
+        "listings": listings,
+        "list_bytes_per_row": list_bytes / listings,
+        "table_bytes_per_row": table.nbytes / listings,
+        "table_alloc_per_row": table_alloc / listings,
+        "tolerance_ms": sorted(tolerance_ms)[len(tolerance_ms) // 2],
+        "list_ms": sorted(list_ms)[len(list_ms) // 2],
+        "brand_ms": brand_ms,
+        "brand_rows": len(subset),
+        "mismatches": mismatches,
+        "classify_equal": classify_equal,
+    }
+
+
+def cmd_table(args) -> int:
+    result = bench_table(args.listings, args.queries)
+    print(f"Anunțuri: {result['listings']}")
+    print(
+        f"  {'memorie':<18} {result['list_bytes_per_row']:8.0f} B/anunț (listă CarSpecs) -> "
+        f"{result['table_bytes_per_row']:.0f} B/anunț (tabel; {result['table_alloc_per_row']:.0f} alocați)"
+    )
+    print(f"  {'toleranțe':<18} {result['list_ms']:8.1f} ms (listă) -> {result['tolerance_ms']:.1f} ms (tabel), mediana")
+    print(f"  {'doar marca':<18} {result['brand_ms']:8.1f} ms ({result['brand_rows']} anunțuri)")
+    if result["mismatches"]:
+        print(f"  DIFERENȚE față de SearchQuery.matches: {result['mismatches']} filtre")
+    if not result["classify_equal"]:
+        print("  DIFERENȚE în classify_many între to_frame() și cars_to_frame()")
+    return 1 if result["mismatches"] or not result["classify_equal"] else 0
+
+
+DESCRIPTION_WORDS = (
+    "masina", "intretinuta", "service", "istoric", "complet", "proprietar", "unic", "inmatriculata",
+    "revizie", "facuta", "anvelope", "noi", "vara", "iarna", "carte", "impecabila", "fara", "accidente",
+    "garaj", "pret", "negociabil", "schimb", "test", "drive", "pachet", "navigatie", "senzori", "parcare",
+)
+
+
+def _synth_description(rng: random.Random) -> str:
+    return " ".join(rng.choice(DESCRIPTION_WORDS) for _ in range(rng.randint(25, 50)))
+
+
+def _edit_description(rng: random.Random, text: str) -> str:
+    """Descrierea unei republicări: câteva cuvinte schimbate sau adăugate."""
+    words = text.split()
+    for _ in range(rng.randint(0, 2)):
+        words[rng.randrange(len(words))] = rng.choice(DESCRIPTION_WORDS)
+    if rng.random() < 0.3:
+        words.append("urgent")
+    return " ".join(words)
+
+
+def synth_relists(cars: int, relist_rate: float, seed: int = 1) -> Tuple[List[Dict], List[int]]:
+    """(câmpurile anunțurilor, pentru fiecare indexul mașinii reale).
+
+    Puține modele și ani, ca mașini diferite cu același titlu generic și km/preț apropiate
+    să fie frecvente; o republicare păstrează mașina, iar km și prețul se schimbă puțin
+    (de obicei prețul scade).
+    """
+    rng = random.Random(seed)
+    trims = []
+    for _ in range(20):
+        fields = _synth_car(rng)
+        trims.append({k: fields[k] for k in ("brand", "model", "body", "fuel", "gearbox", "engine_size", "power")})
+    listings: List[Dict] = []
+    truth: List[int] = []
+    for car in range(cars):
+        fields = dict(_synth_car(rng), **rng.choice(trims))
+        fields["year"] = rng.randint(2014, 2018)
+        fields["km"] = rng.randint(60000, 250000)
+        if rng.random() < 0.2:
+            fields["km"] = round(fields["km"], -4)        # rulaj rotunjit de vânzător
+        fields["title"] = f"{fields['brand']} {fields['model']} {fields['year']}"
+        if rng.random() < 0.3:
+            fields["title"] += " " + rng.choice(["full", "euro 6", "impecabil", "proprietar"])
+        fields["description"] = _synth_description(rng)
+        versions = [fields]
+        while rng.random() < relist_rate and len(versions) < 4:
+            relist = dict(versions[-1])
+            relist["km"] += 0 if rng.random() < 0.7 else rng.randint(1, 500)
+            cut = rng.uniform(0, 0.05) if rng.random() < 0.8 else rng.uniform(0.05, 0.15)
+            relist["price"] = round(relist["price"] * (1 - cut), -1)
+            relist["description"] = _edit_description(rng, relist["description"])
+            versions.append(relist)
+        listings.extend(versions)
+        truth.extend([car] * len(versions))
+    return listings, truth
+
+
+def pair_scores(predicted: List[int], truth: List[int]) -> Tuple[float, float]:
+    """(precizia, recall-ul) pe perechile de anunțuri puse în același cluster."""
+    def pairs(counts: Dict) -> int:
+        return sum(n * (n - 1) // 2 for n in counts.values())
+
+    both: Dict[Tuple[int, int], int] = {}
+    pred: Dict[int, int] = {}
+    real: Dict[int, int] = {}
+    for p, t in zip(predicted, truth):
+        both[p, t] = both.get((p, t), 0) + 1
+        pred[p] = pred.get(p, 0) + 1
+        real[t] = real.get(t, 0) + 1
+    correct, found, expected = pairs(both), pairs(pred), pairs(real)
+    return correct / found if found else 1.0, correct / expected if expected else 1.0
+
+
+def bench_dedup(cars: int, relist_rate: float, seed: int = 1) -> Dict:
+    listings, truth = synth_relists(cars, relist_rate, seed)
+    rng = random.Random(seed)
+    # anunțurile citite din pagina completă au descriere, cele din cardurile de rezultate nu
+    with_pages = [f if rng.random() < 0.5 else dict(f, description="") for f in listings]
+    # cardurile nu au nici puterea și motorul
+    cards_only = [dict(f, description="", power=None, engine_size=None) for f in listings]
+    result = {"listings": len(listings), "cars": cars}
+    for name, variant in (("mixed", with_pages), ("cards", cards_only)):
+        specs = [car_from_fields(f, f"https://www.olx.ro/d/oferta/synth-ID{i:07d}.html") for i, f in enumerate(variant)]
+        t0 = time.perf_counter()
+        clusters = ListingDeduplicator().cluster(specs)
+        result[name] = (*pair_scores(clusters, truth), time.perf_counter() - t0)
+    return result
+
+
+def cmd_dedup(args) -> int:
+    result = bench_dedup(args.cars, args.relist_rate)
+    print(f"Anunțuri: {result['listings']} ({result['cars']} mașini)")
+    for name, label in (("mixed", "jumătate cu descriere"), ("cards", "doar carduri")):
+        precision, recall, seconds = result[name]
+        print(f"  {label:<22} precizie {precision:.3f} | recall {recall:.3f} | {seconds:.2f} s")
+    return 0
+
+
+# punct de intrare -> instrucțiunea de import măsurată
+IMPORT_TARGETS = {
+    "olx_analyzer": "import olx_analyzer",
+    "extractor": "from olx_analyzer import OLXExtractorFixed",
+    "batch.py": "import batch",
+    "watch.py": "import watch",
+    "app.py": "import app",
+}
+HEAVY_MODULES = ("streamlit", "pandas", "numpy", "pyarrow", "bs4", "lxml", "selectolax")
+
+
+def time_import(statement: str, repeat: int) -> Tuple[float, List[str]]:
+    """Cel mai bun timp (ms) al instrucțiunii într-un proces nou și modulele grele încărcate de ea."""
+    probe = (
+        f"import sys, time; t = time.perf_counter(); {statement}; ms = (time.perf_counter() - t) * 1000; "
+        f"print(ms); print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    best, heavy = float("inf"), []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", probe], cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.splitlines()
+        best = min(best, float(out[0]))
+        heavy = out[1].split() if len(out) > 1 else []
+    return best, heavy
+
+
+def cmd_imports(args) -> int:
+    problems = []
+    for name, statement in IMPORT_TARGETS.items():
+        ms, heavy = time_import(statement, args.repeat)
+        print(f"  {name:<14} {ms:8.1f} ms  {', '.join(heavy) or '-'}")
+        if name == "extractor" and args.max_ms and ms > args.max_ms:
+            problems.append(f"importul extractorului: {ms:.1f} ms > {args.max_ms} ms")
+    for p in problems:
+        print(f"  REGRESIE {p}")
+    return 1 if problems else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("backends", help="paritate și viteză pentru backend-urile HTML")
+    p.add_argument("corpus", help="director cu pagini de anunț salvate (*.html)")
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=cmd_backends)
+
+    p = sub.add_parser("specs", help="timpul de extragere a specificațiilor per anunț")
+    p.add_argument("corpus", help="director cu pagini de anunț salvate (*.html)")
+    p.add_argument("--repeat", type=int, default=200)
+    p.set_defaults(func=cmd_specs)
+
+    p = sub.add_parser("synth", help="generează un corpus sintetic de anunțuri și pagini de rezultate")
+    p.add_argument("corpus", help="directorul în care se scrie corpusul")
+    p.add_argument("--listings", type=int, default=300)
+    p.add_argument("--search-pages", type=int, default=10)
+    p.add_argument("--cards", type=int, default=40, help="anunțuri per pagină de rezultate")
+    p.add_argument("--page-kb", type=int, default=40, help="umplutură per pagină de anunț (aprox. KB)")
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=cmd_synth)
+
+    p = sub.add_parser("record", help="salvează pagini reale (anunțuri și rezultate) într-un corpus")
+    p.add_argument("urls", help="fișier cu câte un link pe linie")
+    p.add_argument("corpus", help="directorul în care se scrie corpusul")
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser("pipeline", help="timpi per etapă printr-un server HTTP local, cu praguri de regresie")
+    p.add_argument("corpus", help="director cu anunțuri (*.html) și rezultate (search/*.html)")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--save", help="scrie rezultatele (JSON), pentru a fi folosite ca --baseline")
+    p.add_argument("--baseline", help="rezultatele unei rulări anterioare (JSON)")
+    p.add_argument("--threshold", type=float, default=0.25, help="încetinirea tolerată față de baseline (0.25 = 25%%)")
+    p.add_argument("--min-rate", type=float, default=0.0, help="pagini/s minime acceptate")
+    p.set_defaults(func=cmd_pipeline)
+
+    p = sub.add_parser("stream", help="descărcarea completă vs în flux: octeți economisiți și paritate")
+    p.add_argument("corpus", help="director cu pagini de anunț salvate (*.html)")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=cmd_stream)
+
+    p = sub.add_parser("neighbors", help="indexul de vecini: inserări, timpul unei cereri")
+    p.add_argument("--listings", type=int, default=50000)
+    p.add_argument("--k", type=int, default=50)
+    p.add_argument("--queries", type=int, default=1000)
+    p.set_defaults(func=cmd_neighbors)
+
+    p = sub.add_parser("plan", help="căutările comasate ale unui lot: câte rămân și paritatea rezultatelor")
+    p.add_argument("--cars", type=int, default=1000)
+    p.add_argument("--market", type=int, default=30000, help="anunțuri pe piața sintetică")
+    p.add_argument("--trims", type=int, default=50, help="motorizări distincte (model, caroserie, combustibil, cutie, motor, putere)")
+    p.add_argument("--max-pages", type=int, default=5, help="pagini de rezultate per căutare")
+    p.add_argument("--chunk", type=int, default=1000, help="anunțuri per lot planificat (ca --plan-batch din batch.py)")
+    p.set_defaults(func=cmd_plan)
+
+    p = sub.add_parser("table", help="CarSpecsTable vs listă de CarSpecs: memorie, timpul filtrării, paritate")
+    p.add_argument("--listings", type=int, default=200000)
+    p.add_argument("--queries", type=int, default=20)
+    p.set_defaults(func=cmd_table)
+
+    p = sub.add_parser("dedup", help="anunțuri republicate: precizie și recall pe perechi, timpul clusterizării")
+    p.add_argument("--cars", type=int, default=8000)
+    p.add_argument("--relist-rate", type=float, default=0.15)
+    p.set_defaults(func=cmd_dedup)
+
+    p = sub.add_parser("imports", help="timpul de import al pachetului, al scripturilor și al interfeței")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--max-ms", type=float, default=0.0, help="timpul maxim acceptat pentru importul extractorului")
+    p.set_defaults(func=cmd_imports)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Analizorul de prețuri OLX, fără interfață: extragere, căutare, scor și statistici de piață.
+
+Numele publice se importă la prima folosire (PEP 562), deci `from olx_analyzer import
+OLXExtractorFixed` încarcă doar extractorul și dependențele lui, nu pandas, numpy sau
+Streamlit. `python -m olx_analyzer.extractor` rulează testul rapid al extractorului.
+"""
+import importlib
+
+# nume public -> submodulul care îl definește
+_EXPORTS = {
+    "CarSpecs": "models",
+    "car_from_fields": "models",
+    "cars_to_frame": "models",
+    "description_simhash": "models",
+    "listing_id": "models",
+    "CarSpecsTable": "table",
+    "HTML_BACKENDS": "page",
+    "PageView": "page",
+    "available_backends": "page",
+    "default_backend": "page",
+    "SPEC_ENGINE": "specs",
+    "SpecEngine": "specs",
+    "SpecField": "specs",
+    "BRAND_CATALOGUE": "brands",
+    "BrandCatalogue": "brands",
+    "CachedResponse": "net",
+    "CircuitBreaker": "net",
+    "ResponseCache": "net",
+    "RetryPolicy": "net",
+    "TokenBucket": "net",
+    "cache_path": "net",
+    "normalize_url": "net",
+    "Metrics": "metrics",
+    "OLXExtractorFixed": "extractor",
+    "SearchQuery": "query",
+    "URLBuilder": "query",
+    "SearchCrawler": "search",
+    "ListingStore": "store",
+    "find_comparables": "store",
+    "SearchPlanner": "planner",
+    "MarketWatch": "monitor",
+    "WatchEvent": "monitor",
+    "PriceAnalyzer": "analysis",
+    "DEDUPLICATOR": "dedup",
+    "ListingDeduplicator": "dedup",
+    "ComparablesIndex": "neighbors",
+    "MarketPosition": "stats",
+    "MarketStats": "stats",
+    "QuantileSketch": "stats",
+    "SegmentStats": "stats",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
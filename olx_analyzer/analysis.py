@@ -0,0 +1,157 @@
+"""PriceAnalyzer: scorul și categoria unui anunț față de referință."""
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from .models import CarSpecs
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .neighbors import ComparablesIndex
+
+class PriceAnalyzer:
+    """Analizează și clasifică anunțurile"""
+
+    # praguri de scor -> categorie, în ordine descrescătoare
+    CATEGORIES = ((90, "EXCELENT"), (70, "BUN"), (50, "ACCEPTABIL"))
+    
+    @classmethod
+    def classify_car(cls, reference_car: CarSpecs, comparison_car: CarSpecs) -> Tuple[str, int, str]:
+        """Clasifică un anunț față de referință"""
+        score = 100
+        
+        # Verifică criteriile obligatorii (Nivel 1)
+        if comparison_car.brand != reference_car.brand or comparison_car.model != reference_car.model:
+            return "EXCLUS", 0, "Marcă sau model diferit"
+        
+        # Analizează prețul
+        price_diff = comparison_car.price - reference_car.price
+        price_diff_percent = (price_diff / reference_car.price) * 100 if reference_car.price > 0 else 0
+        
+        if price_diff < 0:
+            score += min(20, abs(price_diff_percent))
+        else:
+            score -= min(30, price_diff_percent)
+        
+        # Analizează anii
+        year_diff = comparison_car.year - reference_car.year
+        if year_diff > 0:
+            score += year_diff * 5
+        elif year_diff < 0:
+            score -= abs(year_diff) * 5
+        
+        # Analizează kilometrii
+        km_diff = comparison_car.km - reference_car.km
+        if km_diff < 0:
+            score += min(15, abs(km_diff) / 10000)
+        elif km_diff > 0:
+            score -= min(20, km_diff / 10000)
+        
+        # Analizează combustibilul
+        if comparison_car.fuel != reference_car.fuel:
+            score -= 15
+        
+        # Clasificare finală
+        category = "SLAB"
+        for threshold, name in cls.CATEGORIES:
+            if score >= threshold:
+                category = name
+                break
+        
+        explanation = cls.explain(price_diff, year_diff, km_diff, comparison_car.fuel, reference_car.fuel)
+        
+        return category, int(score), explanation
+
+    @staticmethod
+    def explain(price_diff: float, year_diff: int, km_diff: int, fuel: str, reference_fuel: str) -> str:
+        """Textul explicativ pentru diferențele față de referință"""
+        explanation_parts = []
+        if price_diff < 0:
+            explanation_parts.append(f"Mai ieftin cu {abs(price_diff):.0f} EUR")
+        else:
+            explanation_parts.append(f"Mai scump cu {price_diff:.0f} EUR")
+        if year_diff > 0:
+            explanation_parts.append(f"Mai nou cu {year_diff} an(i)")
+        elif year_diff < 0:
+            explanation_parts.append(f"Mai vechi cu {abs(year_diff)} an(i)")
+        if km_diff < 0:
+            explanation_parts.append(f"Mai puțini km cu {abs(km_diff):,}")
+        elif km_diff > 0:
+            explanation_parts.append(f"Mai mulți km cu {km_diff:,}")
+        if fuel != reference_fuel:
+            explanation_parts.append(f"Combustibil diferit: {fuel} vs {reference_fuel}")
+        return " • ".join(explanation_parts) if explanation_parts else "Specificații similare"
+
+    @classmethod
+    def classify_many(cls, reference_car: CarSpecs, comparables: "pd.DataFrame") -> "pd.DataFrame":
+        """Clasificare vectorizată a unui tabel de anunțuri (coloane ca în CarSpecs).
+
+        Rezultatele sunt identice cu classify_car pe fiecare rând. Adaugă coloanele
+        price_diff, year_diff, km_diff, fuel_diff, score și category; explicațiile
+        se construiesc separat, doar pentru rândurile afișate (vezi explain_many).
+        """
+        price = comparables["price"].to_numpy(dtype=np.float64)
+        year = comparables["year"].to_numpy(dtype=np.int64)
+        km = comparables["km"].to_numpy(dtype=np.int64)
+
+        price_diff = price - reference_car.price
+        if reference_car.price > 0:
+            price_diff_percent = (price_diff / reference_car.price) * 100
+        else:
+            price_diff_percent = np.zeros_like(price_diff)
+        year_diff = year - reference_car.year
+        km_diff = km - reference_car.km
+        fuel_diff = (comparables["fuel"] != reference_car.fuel).to_numpy()
+
+        # aceeași ordine a operațiilor ca în classify_car, ca scorurile să fie identice
+        score = np.full(len(comparables), 100.0)
+        score += np.where(price_diff < 0, np.minimum(20, np.abs(price_diff_percent)), -np.minimum(30, price_diff_percent))
+        score += year_diff * 5
+        score += np.where(km_diff < 0, np.minimum(15, np.abs(km_diff) / 10000), 0.0)
+        score -= np.where(km_diff > 0, np.minimum(20, km_diff / 10000), 0.0)
+        score -= np.where(fuel_diff, 15, 0)
+
+        category = np.full(len(comparables), "SLAB", dtype=object)
+        for threshold, name in reversed(cls.CATEGORIES):
+            category[score >= threshold] = name
+
+        excluded = ((comparables["brand"] != reference_car.brand) | (comparables["model"] != reference_car.model)).to_numpy()
+        category[excluded] = "EXCLUS"
+        int_score = np.trunc(score).astype(np.int64)
+        int_score[excluded] = 0
+
+        return comparables.assign(
+            price_diff=price_diff,
+            year_diff=year_diff,
+            km_diff=km_diff,
+            fuel_diff=fuel_diff,
+            score=int_score,
+            category=category,
+        )
+
+    @classmethod
+    def explain_many(cls, reference_car: CarSpecs, results: "pd.DataFrame") -> "pd.Series":
+        """Explicațiile pentru rândurile (deja clasificate cu classify_many) care se afișează"""
+        import pandas as pd
+
+        explanations = [
+            "Marcă sau model diferit" if category == "EXCLUS"
+            else cls.explain(float(price_diff), int(year_diff), int(km_diff), fuel, reference_car.fuel)
+            for category, price_diff, year_diff, km_diff, fuel in zip(
+                results["category"], results["price_diff"], results["year_diff"], results["km_diff"], results["fuel"]
+            )
+        ]
+        return pd.Series(explanations, index=results.index, dtype=object)
+
+    @classmethod
+    def classify_stream(cls, reference_car: CarSpecs, comparables: Iterable[CarSpecs]) -> Iterator[Tuple[CarSpecs, str, int, str]]:
+        """Clasifică anunțurile pe măsură ce sosesc (ex. direct din SearchCrawler.crawl)"""
+        for car in comparables:
+            category, score, explanation = cls.classify_car(reference_car, car)
+            yield car, category, score, explanation
+
+    @classmethod
+    def classify_nearest(cls, reference_car: CarSpecs, index: "ComparablesIndex", k: int = 50) -> List[Tuple[CarSpecs, str, int, str]]:
+        """Clasifică cele mai apropiate k anunțuri din index (an/km/putere/motor), de la cel mai apropiat"""
+        return list(cls.classify_stream(reference_car, (car for car, _ in index.nearest(reference_car, k))))
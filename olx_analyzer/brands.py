@@ -0,0 +1,135 @@
+"""Catalogul de mărci și modele (trie pe cuvinte) și slug-urile OLX."""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_YEAR_TOKEN_RE = re.compile(r"^\d{4}$")
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+class BrandCatalogue:
+    """Catalogul canonic de mărci și modele, compilat în trie-uri pe tokenuri.
+
+    Potrivirea parcurge tokenurile textului o singură dată și, la fiecare poziție,
+    coboară în trie doar cât permit tokenurile, deci costul nu crește cu mărimea
+    catalogului. Modelele se afișează ca slug-ul OLX cu majuscule ("range-rover" ->
+    "RANGE ROVER"), aceeași formă pe care URLBuilder o transformă înapoi în slug.
+    """
+
+    def __init__(self):
+        self.slugs: Dict[str, str] = {}                 # marcă -> slug OLX
+        self._by_alias: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._brand_trie: Dict = {}
+        self._model_tries: Dict[str, Dict] = {}
+
+    @staticmethod
+    def _insert(trie: Dict, tokens: List[str], payload) -> None:
+        node = trie
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        node[None] = payload
+
+    @staticmethod
+    def _longest(trie: Dict, tokens: List[str], pos: int):
+        """(payload, poziția de după potrivire) pentru cea mai lungă potrivire de la `pos`."""
+        node, best, i = trie, None, pos
+        while i < len(tokens):
+            node = node.get(tokens[i])
+            if node is None:
+                break
+            i += 1
+            if None in node:
+                best = (node[None], i)
+        return best
+
+    def add_brand(self, name: str, slug: str, aliases: Iterable[str] = (), models: Iterable[str] = ()) -> None:
+        self.slugs[name] = slug
+        self._model_tries.setdefault(name, {})
+        for alias in (name, slug, *aliases):
+            self._add_alias(alias, name, None)
+        for model in models:
+            self.add_model(name, model)
+
+    def add_model(self, brand: str, slug: str, aliases: Iterable[str] = (), brand_alias: bool = False) -> None:
+        """Adaugă un model; brand_alias=True îl face recunoscut și fără marcă (ex. "range rover")."""
+        for alias in (slug, *aliases):
+            self._insert(self._model_tries[brand], _tokens(alias), slug)
+            if brand_alias:
+                self._add_alias(alias, brand, slug)
+
+    def _add_alias(self, alias: str, brand: str, model: Optional[str]) -> None:
+        toks = _tokens(alias)
+        self._by_alias[" ".join(toks)] = (brand, model)
+        self._insert(self._brand_trie, toks, (brand, model))
+
+    @staticmethod
+    def model_name(slug: str) -> str:
+        return slug.replace("-", " ").upper()
+
+    def slug(self, brand: str) -> str:
+        """Slug-ul OLX al mărcii (acceptă orice alias)."""
+        found = self._by_alias.get(" ".join(_tokens(brand)))
+        if found:
+            return self.slugs[found[0]]
+        return "-".join(_tokens(brand))
+
+    def brand_for_text(self, text: str) -> Optional[str]:
+        """Marca, dacă textul e exact numele/aliasul ei (ex. un element din breadcrumb)."""
+        found = self._by_alias.get(" ".join(_tokens(text)))
+        return found[0] if found else None
+
+    def find(self, text: str, guess_model: bool = False) -> Tuple[Optional[str], Optional[str]]:
+        """Prima marcă din text și modelul care o urmează.
+
+        guess_model=True: dacă modelul nu e în catalog, primul token de după marcă
+        (dacă nu e un an) e luat drept model.
+        """
+        toks = _tokens(text)
+        for i in range(len(toks)):
+            hit = self._longest(self._brand_trie, toks, i)
+            if hit is None:
+                continue
+            (brand, implied), end = hit
+            # un alias-model ("range rover") poate fi începutul unui model mai lung ("range rover sport")
+            model_hit = self._longest(self._model_tries[brand], toks, i if implied else end)
+            if model_hit is not None:
+                return brand, self.model_name(model_hit[0])
+            if implied:
+                return brand, self.model_name(implied)
+            if guess_model and end < len(toks) and not _YEAR_TOKEN_RE.match(toks[end]):
+                return brand, toks[end].upper()
+            return brand, None
+        return None, None
+
+BRAND_CATALOGUE = BrandCatalogue()
+for _name, _slug, _aliases, _models in (
+    ("Audi", "audi", (), "a1 a3 a4 a4-allroad a5 a6 a6-allroad a7 a8 e-tron q2 q3 q4 q5 q7 q8 r8 rs3 rs4 rs5 rs6 s3 s4 s5 s6 tt"),
+    ("BMW", "bmw", (), "seria-1 seria-2 seria-3 seria-4 seria-5 seria-6 seria-7 seria-8 x1 x2 x3 x4 x5 x6 x7 z4 i3 i4 ix m2 m3 m4 m5"),
+    ("Mercedes", "mercedes-benz", ("mercedes benz",), "cla cls gla glb glc gle gls glk ml gl slk sl sprinter vito citan amg-gt"),
+    ("Volkswagen", "volkswagen", ("vw",), "golf passat polo tiguan touareg touran t-roc t-cross arteon jetta sharan up caddy transporter amarok id3 id4 scirocco"),
+    ("Skoda", "skoda", (), "octavia superb fabia kodiaq karoq kamiq scala rapid yeti roomster enyaq"),
+    ("Ford", "ford", (), "ranger focus fiesta mondeo kuga puma ecosport edge explorer mustang galaxy s-max c-max b-max transit tourneo"),
+    ("Volvo", "volvo", (), "xc40 xc60 xc70 xc90 s40 s60 s80 s90 v40 v50 v60 v70 v90"),
+    ("Toyota", "toyota", (), "corolla auris yaris rav4 c-hr camry avensis land-cruiser hilux prius aygo supra"),
+    ("Honda", "honda", (), "civic accord cr-v hr-v jazz"),
+    ("Nissan", "nissan", (), "qashqai x-trail juke micra navara leaf note pathfinder patrol"),
+    ("Renault", "renault", (), "clio megane captur kadjar koleos scenic laguna talisman twingo zoe arkana kangoo trafic master"),
+    ("Peugeot", "peugeot", (), "208 308 508 2008 3008 5008 207 307 407 partner expert"),
+    ("Opel", "opel", (), "astra corsa insignia mokka zafira meriva vectra grandland crossland antara vivaro"),
+    ("Dacia", "dacia", (), "logan sandero duster spring jogger lodgy dokker solenza"),
+    ("Hyundai", "hyundai", (), "i10 i20 i30 i40 tucson santa-fe kona ioniq ix35 elantra"),
+    ("Kia", "kia", (), "ceed sportage sorento rio picanto niro stonic xceed stinger ev6"),
+    ("Mazda", "mazda", (), "2 3 5 6 cx-3 cx-30 cx-5 cx-60 mx-5"),
+    ("Citroen", "citroen", (), "c1 c3 c4 c5 c3-aircross c5-aircross berlingo ds3 ds4 ds5 jumpy"),
+    ("Subaru", "subaru", (), "forester outback impreza xv legacy"),
+    ("Mitsubishi", "mitsubishi", (), "outlander asx pajero l200 lancer eclipse-cross space-star"),
+    ("Suzuki", "suzuki", (), "vitara grand-vitara swift sx4 s-cross ignis jimny"),
+    ("Lexus", "lexus", (), "is es gs ls nx rx ux"),
+    ("Infiniti", "infiniti", (), "q30 q50 q70 qx30 qx50 qx70"),
+    ("Porsche", "porsche", (), "911 cayenne macan panamera taycan boxster cayman"),
+    ("Jaguar", "jaguar", (), "xe xf xj f-pace e-pace i-pace f-type"),
+    ("Land Rover", "land-rover", (), "defender discovery discovery-sport freelander range-rover-evoque range-rover-velar range-rover-sport"),
+):
+    BRAND_CATALOGUE.add_brand(_name, _slug, _aliases, _models.split())
+BRAND_CATALOGUE.add_model("Land Rover", "range-rover", brand_alias=True)
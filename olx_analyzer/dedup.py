@@ -0,0 +1,157 @@
+"""Anunțuri republicate: clustere de duplicate găsite cu LSH (MinHash, SimHash)."""
+import zlib
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .models import CarSpecs, _text_tokens
+
+# permutările MinHash: (a * x + b) mod p, cu x < 2**32 și a, b < 2**31, deci fără depășire în uint64
+_MINHASH_PRIME = np.uint64((1 << 61) - 1)
+
+class ListingDeduplicator:
+    """Găsește anunțurile republicate (aceeași mașină sub alt ID) fără comparații O(n²).
+
+    Candidații vin din trei feluri de găleți (LSH): benzi MinHash peste cuvintele
+    titlului și specificațiile principale, benzi din SimHash-ul descrierii și km-ii
+    exacți, fiecare în cadrul aceluiași (marcă, model, an). Doar perechile din aceeași găleată se
+    verifică: aceeași mașină (marcă/model/an/combustibil/cutie/putere/motor), km și
+    preț apropiate, plus titlu similar, descriere aproape identică sau km identici.
+    Fără descrieri de comparat (cardurile de rezultate nu au descriere) titlul nu deosebește
+    două mașini cu titlu generic („Volkswagen Golf 7 2016”), deci km și prețul trebuie să
+    fie aproape identice (card_km_tolerance, card_price_tolerance).
+    Perechile confirmate se unesc în clustere (union-find).
+    """
+
+    # găleți mai mari (titluri generice identice) se compară doar între vecini după km
+    MAX_BUCKET = 50
+    BUCKET_WINDOW = 10
+
+    def __init__(
+        self,
+        num_perm: int = 32,
+        bands: int = 8,
+        km_tolerance: int = 5000,
+        price_tolerance: float = 0.2,
+        min_title_similarity: float = 0.5,
+        max_hamming: int = 7,
+        card_km_tolerance: int = 500,
+        card_price_tolerance: float = 0.05,
+        seed: int = 1,
+    ):
+        assert num_perm % bands == 0
+        self.bands = bands
+        self.km_tolerance = km_tolerance
+        self.price_tolerance = price_tolerance
+        self.min_title_similarity = min_title_similarity
+        self.card_km_tolerance = card_km_tolerance
+        self.card_price_tolerance = card_price_tolerance
+        # hash-urile la distanța <= max_hamming au sigur o bandă identică din cele max_hamming + 1
+        self.max_hamming = max_hamming
+        self._band_bits = 64 // (max_hamming + 1)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)
+
+    def signature(self, car: CarSpecs, title: FrozenSet[str]) -> np.ndarray:
+        """Semnătura MinHash a cuvintelor titlului și a specificațiilor principale."""
+        tokens = set(title)
+        tokens.update((f"#y{car.year}", f"#km{car.km // 1000}", f"#p{car.power}", f"#e{car.engine_size}"))
+        x = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint64, count=len(tokens))
+        return ((np.outer(x, self._a) + self._b) % _MINHASH_PRIME).min(axis=0)
+
+    def _buckets(self, cars: List[CarSpecs], titles: List[FrozenSet[str]]) -> Iterator[List[int]]:
+        buckets: Dict[Tuple, List[int]] = {}
+        for i, car in enumerate(cars):
+            # same_car cere aceeași marcă/model/an, deci gălețile se separă după ele fără pierderi
+            segment = (car.brand, car.model.lower(), car.year)
+            for band, values in enumerate(self.signature(car, titles[i]).reshape(self.bands, -1)):
+                buckets.setdefault(("m", segment, band, values.tobytes()), []).append(i)
+            if car.description_hash:
+                bits, mask = self._band_bits, (1 << self._band_bits) - 1
+                for band in range(self.max_hamming + 1):
+                    key = ("d", segment, band, car.description_hash >> (bits * band) & mask)
+                    buckets.setdefault(key, []).append(i)
+            if car.km:
+                buckets.setdefault(("s", segment, car.km), []).append(i)
+        return (members for members in buckets.values() if len(members) > 1)
+
+    def candidate_pairs(self, cars: List[CarSpecs], titles: List[FrozenSet[str]]) -> Set[Tuple[int, int]]:
+        pairs: Set[Tuple[int, int]] = set()
+        for members in self._buckets(cars, titles):
+            if len(members) <= self.MAX_BUCKET:
+                pairs.update((a, b) for n, a in enumerate(members) for b in members[n + 1:])
+                continue
+            members = sorted(members, key=lambda i: cars[i].km)
+            for n, a in enumerate(members):
+                pairs.update((min(a, b), max(a, b)) for b in members[n + 1:n + 1 + self.BUCKET_WINDOW])
+        return pairs
+
+    def same_car(self, a: CarSpecs, b: CarSpecs, title_a: FrozenSet[str], title_b: FrozenSet[str]) -> bool:
+        if a.brand != b.brand or a.model.lower() != b.model.lower() or a.year != b.year:
+            return False
+        for name in ("fuel", "gearbox", "power", "engine_size"):
+            va, vb = getattr(a, name), getattr(b, name)
+            if va not in (None, 0, "Unknown") and vb not in (None, 0, "Unknown") and va != vb:
+                return False
+        if abs(a.km - b.km) > self.km_tolerance:
+            return False
+        if a.price > 0 and b.price > 0 and abs(a.price - b.price) > self.price_tolerance * max(a.price, b.price):
+            return False
+        if a.description_hash and b.description_hash:
+            distance = bin((a.description_hash ^ b.description_hash) & 0xFFFFFFFFFFFFFFFF).count("1")
+            if distance <= self.max_hamming:
+                return True
+            # descrieri clar diferite: de regulă vânzători diferiți, oricât de asemănător ar fi titlul
+            if distance > 2 * self.max_hamming:
+                return False
+        elif abs(a.km - b.km) > self.card_km_tolerance or (
+            a.price > 0 and b.price > 0 and abs(a.price - b.price) > self.card_price_tolerance * max(a.price, b.price)
+        ):
+            # fără descrieri de comparat, titlul generic nu deosebește două mașini: km și prețul trebuie să fie aproape identice
+            return False
+        union = title_a | title_b
+        if union and len(title_a & title_b) / len(union) >= self.min_title_similarity:
+            return True
+        return a.km == b.km and a.km > 0
+
+    @staticmethod
+    def _canonical_key(car: CarSpecs) -> Tuple:
+        # anunțul cel mai complet; la egalitate cel mai ieftin (de obicei prețul curent al republicării)
+        known = sum(1 for v in (car.power, car.engine_size, car.description_hash) if v) + sum(
+            1 for v in (car.fuel, car.gearbox, car.body, car.state, car.color) if v != "Unknown"
+        )
+        return -known, car.price if car.price > 0 else float("inf"), car.link
+
+    def cluster(self, cars: Iterable[CarSpecs]) -> List[int]:
+        """Pentru fiecare anunț, indexul anunțului canonic al clusterului lui (el însuși dacă e unic)."""
+        cars = list(cars)
+        titles = [frozenset(_text_tokens(c.title)) for c in cars]
+        parent = list(range(len(cars)))
+
+        def root(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for a, b in self.candidate_pairs(cars, titles):
+            ra, rb = root(a), root(b)
+            if ra != rb and self.same_car(cars[a], cars[b], titles[a], titles[b]):
+                parent[rb] = ra
+
+        canonical: Dict[int, int] = {}
+        for i in range(len(cars)):
+            r = root(i)
+            if r not in canonical or self._canonical_key(cars[i]) < self._canonical_key(cars[canonical[r]]):
+                canonical[r] = i
+        return [canonical[root(i)] for i in range(len(cars))]
+
+    def unique(self, cars: Iterable[CarSpecs], reference: Optional[CarSpecs] = None) -> List[CarSpecs]:
+        """Doar anunțurile canonice, în ordinea inițială; cu `reference`, fără republicările acestuia."""
+        items = ([reference] if reference is not None else []) + list(cars)
+        clusters = self.cluster(items)
+        start, skip = (1, clusters[0]) if reference is not None else (0, -1)
+        return [items[i] for i in range(start, len(items)) if clusters[i] == i != skip]
+
+DEDUPLICATOR = ListingDeduplicator()
@@ -0,0 +1,595 @@
+"""OLXExtractorFixed: descarcă și extrage anunțurile OLX."""
+import importlib.util
+import json
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .brands import BRAND_CATALOGUE
+from .metrics import Metrics, logger
+from .models import CarSpecs, car_from_fields
+from .net import CircuitBreaker, ResponseCache, RetryPolicy, TokenBucket
+from .page import (
+    HTML_BACKENDS,
+    IncrementalPageParser,
+    PageView,
+    _decode_html,
+    _PageViewBuilder,
+    default_backend,
+)
+from .specs import _PRICE_RE, SPEC_ENGINE, _extract_number, _normalize_numeric_text
+from .structured import (
+    _JSON_LD_TYPES,
+    _decode_prerendered_state,
+    _fields_from_json_ld,
+    _fields_from_olx_ad,
+    _json_ld_items,
+)
+
+if TYPE_CHECKING:
+    import requests
+
+# Headers pentru requests
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+class OLXExtractorFixed:
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        rate: float = 0.6,
+        burst: int = 1,
+        max_per_host: int = 4,
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[Metrics] = None,
+        timeout: Tuple[float, float] = (5.0, 15.0),
+        retry: Optional[RetryPolicy] = None,
+        stream: bool = False,
+    ):
+        """
+        rate/burst: limita globală de cereri (cereri/secundă, rafală maximă); scade
+            automat la 429/5xx și revine treptat.
+        max_per_host: câte cereri simultane sunt permise către același host.
+        cache: cache persistent de răspunsuri (opțional).
+        metrics: metrici per etapă (implicit dezactivate).
+        timeout: (conectare, citire) în secunde.
+        retry: politica de reîncercare (implicit RetryPolicy()).
+        stream: extract_car_specs citește anunțurile în flux și închide conexiunea când
+            datele sunt complete (vezi stream_listing; necesită lxml).
+        """
+        # requests (~0,1 s la import) se încarcă abia când e nevoie de o sesiune HTTP
+        import requests
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.backend = backend or default_backend()
+        if self.backend not in HTML_BACKENDS:
+            raise ValueError(f"Backend HTML necunoscut: {self.backend}")
+        self.rate_limiter = TokenBucket(rate, burst)
+        self.cache = cache
+        self.spec_engine = SPEC_ENGINE
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.stream = stream and importlib.util.find_spec("lxml") is not None
+        if stream and not self.stream:
+            logger.warning("Citirea în flux necesită lxml; anunțurile se descarcă întregi")
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._host_lock = threading.Lock()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, max_per_host))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    # -------- utils --------
+
+    def normalize_numeric_text(self, text: str) -> str:
+        """Normalizează textul numeric (spații NBSP/înguste -> space)."""
+        return _normalize_numeric_text(text)
+
+    def extract_number_from_text(self, text: str) -> Optional[int]:
+        """Extrage un int din text (elim. puncte/virgule/spații)."""
+        return _extract_number(text)
+
+    # -------- parse --------
+
+    def walk_html(self, content, builder) -> None:
+        """Parcurge pagina cu backend-ul configurat, trimițând evenimentele către `builder`."""
+        HTML_BACKENDS[self.backend][1](_decode_html(content), builder)
+
+    def parse_page(self, content, url: str = "") -> PageView:
+        """Parsează pagina cu backend-ul configurat și întoarce vederea ei."""
+        builder = _PageViewBuilder(url)
+        self.walk_html(content, builder)
+        view = builder.finish()
+        view.text = self.normalize_numeric_text(view.text)
+        return view
+
+    # -------- title --------
+
+    @staticmethod
+    def _head_title(view: PageView) -> Optional[Tuple[str, str]]:
+        """(sursă, titlu) din og:title sau <title>, dacă unul dintre ele e utilizabil."""
+        # 1) og:title
+        content = view.meta.get("og:title")
+        if content:
+            content = content.strip()
+            if not re.search(r"anun[tț]uri gratuite|olx\.ro", content, re.I):
+                return "og_title", content
+
+        # 2) <title>
+        if view.title:
+            title_text = view.title
+            # curăță sufixele gen " | OLX.ro", " - OLX.ro" sau " • OLX.ro"
+            title_text = re.sub(r"\s*[|\-•]\s*OLX\.ro.*$", "", title_text, flags=re.I)
+            if not re.search(r"anun[tț]uri gratuite|olx\.ro", title_text, re.I) and len(title_text) > 10:
+                return "title", title_text
+        return None
+
+    def extract_title(self, view: PageView) -> str:
+        head = self._head_title(view)
+        if head is not None and head[0] == "og_title":
+            self.metrics.fallback("title", head[0])
+            return head[1]
+
+        # titlul anunțului din pagină ([data-cy="ad_title"]); <title> are și orașul în el
+        if view.ad_title:
+            self.metrics.fallback("title", "ad_title")
+            return view.ad_title
+        if head is not None:
+            self.metrics.fallback("title", head[0])
+            return head[1]
+
+        # 3) primul H1 rezonabil
+        for t in view.h1:
+            if t and len(t) > 10 and not re.search(r"anun[tț]uri|olx", t, re.I):
+                self.metrics.fallback("title", "h1")
+                return t
+
+        # 4) JSON-LD name/headline
+        for raw in view.json_ld:
+            try:
+                data = json.loads(raw or "{}")
+                if isinstance(data, dict):
+                    cand = data.get("name") or data.get("headline")
+                    if cand and len(cand) > 10 and not re.search(r"olx|anun[tț]uri", cand, re.I):
+                        self.metrics.fallback("title", "json_ld")
+                        return cand.strip()
+            except Exception:
+                pass
+
+        # 5) fallback din canonical
+        href = view.canonical or view.url
+        m = re.search(r"/d/oferta/([^/]+)", href)
+        if m:
+            url_part = m.group(1)
+            url_part = re.sub(r"-ID.*$", "", url_part)
+            self.metrics.fallback("title", "canonical")
+            return url_part.replace("-", " ").title()
+
+        self.metrics.fallback("title", "none")
+        return "Titlu necunoscut"
+
+    # -------- price --------
+
+    def extract_price(self, view: PageView) -> Tuple[float, str]:
+        """Extrage prețul (meta → caseta de preț → text vizibil)."""
+        # 1) meta
+        amount = view.meta.get("product:price:amount")
+        if amount:
+            try:
+                val = float(amount)
+                cur = (view.meta.get("product:price:currency") or "EUR").upper()
+                self.metrics.fallback("price", "meta")
+                return val, f"{int(val):,} {cur}".replace(",", " ")
+            except Exception:
+                pass
+
+        # 2) caseta de preț, apoi tot textul vizibil (fără script/style); în textul unit,
+        #    un număr dinaintea prețului (ex. anul din titlu) s-ar lipi de el
+        for source, text in (("price_box", self.normalize_numeric_text(view.price)), ("text", view.text)):
+            for m in _PRICE_RE.finditer(text):
+                price_str = self.normalize_numeric_text(m.group(1))
+                currency = m.group(2).lower()
+                num = self.extract_number_from_text(price_str)
+                if num and num > 100:  # filtru anti-zgomot
+                    cur = "EUR" if currency in ("€", "eur", "euro") else "LEI"
+                    self.metrics.fallback("price", source)
+                    return float(num), f"{num:,} {cur}".replace(",", " ")
+        self.metrics.fallback("price", "none")
+        return 0.0, "0 EUR"
+
+    # -------- brand/model fallbacks --------
+
+    def extract_brand_from_breadcrumb(self, view: PageView) -> Optional[str]:
+        # caută text în <a>/<span>/<li>
+        for t in view.breadcrumbs:
+            brand = BRAND_CATALOGUE.brand_for_text(t)
+            if brand:
+                return brand
+        # caută în href
+        for h in view.hrefs:
+            brand, _ = BRAND_CATALOGUE.find(h)
+            if brand:
+                return brand
+        return None
+
+    def extract_brand_and_model_from_url(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        if not url:
+            return None, None
+        m = re.search(r"/d/oferta/([^/]+)", url)
+        if not m:
+            return None, None
+        # primul token după marcă care NU e an (4 cifre) e luat drept model, dacă nu e în catalog
+        return BRAND_CATALOGUE.find(re.sub(r"-ID[0-9A-Za-z]+\.html$", "", m.group(1)), guess_model=True)
+
+    # -------- specs --------
+
+    def _structured(self, view: PageView) -> Tuple[Dict, int]:
+        """Câmpurile structurate și câte dintre ele (primele) vin din starea OLX."""
+        fields: Dict[str, object] = {}
+        state = _decode_prerendered_state(view.state_script)
+        ad = ((state or {}).get("ad") or {}).get("ad")
+        if isinstance(ad, dict):
+            fields.update(_fields_from_olx_ad(ad, self.spec_engine))
+        from_state = len(fields)
+        for raw in view.json_ld:
+            for item in _json_ld_items(raw):
+                types = item.get("@type")
+                types = types if isinstance(types, list) else [types]
+                if _JSON_LD_TYPES.intersection(types):
+                    for k, v in _fields_from_json_ld(item, self.spec_engine).items():
+                        fields.setdefault(k, v)
+        return fields, from_state
+
+    def structured_fields(self, view: PageView) -> Dict:
+        """Câmpurile din datele structurate ale paginii, decodate o singură dată.
+
+        Starea OLX (__PRERENDERED_STATE__) are parametrii deja normalizați, deci are
+        prioritate; JSON-LD (Vehicle/Car/Product) completează ce lipsește.
+        """
+        fields, from_state = self._structured(view)
+        if self.metrics.enabled:
+            # titlul îl alege extract_title; aici contează doar câmpurile folosite direct
+            for i, name in enumerate(fields):
+                if name not in ("title", "price_text"):
+                    self.metrics.fallback(name, "state" if i < from_state else "json_ld")
+        return fields
+
+    def extract_specs_from_structured_data(self, view: PageView, structured: Optional[Dict] = None) -> Dict:
+        # 1) date structurate (stare OLX, JSON-LD)
+        specs: Dict[str, object] = dict(self.structured_fields(view) if structured is None else structured)
+
+        # 2) Regex pe text vizibil, doar pentru câmpurile care lipsesc
+        if not self.spec_engine.names <= specs.keys():
+            found = self.spec_engine.extract(view.text, skip=specs)
+            for name in found:
+                self.metrics.fallback(name, "text")
+            specs.update(found)
+
+        # 3) brand din breadcrumb
+        if "brand" not in specs:
+            b = self.extract_brand_from_breadcrumb(view)
+            if b:
+                self.metrics.fallback("brand", "breadcrumb")
+                specs["brand"] = b
+
+        # 4) fallback brand/model din URL (canonical sau URL-ul cerut)
+        if "brand" not in specs or "model" not in specs:
+            href = view.canonical or view.url
+            brand_u, model_u = self.extract_brand_and_model_from_url(href)
+            if brand_u and "brand" not in specs:
+                self.metrics.fallback("brand", "url")
+                specs["brand"] = brand_u
+            if model_u and "model" not in specs:
+                self.metrics.fallback("model", "url")
+                specs["model"] = model_u
+
+        # 5) descrierea din pagină, dacă nu era în datele structurate
+        if "description" not in specs and view.description:
+            self.metrics.fallback("description", "page")
+            specs["description"] = view.description
+
+        return specs
+
+    # -------- main entry --------
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        with self._host_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker()
+            return breaker
+
+    def _get(
+        self, url: str, headers: Optional[Dict[str, str]] = None, stream: bool = False
+    ) -> Optional["requests.Response"]:
+        """GET cu reîncercări, backoff, întrerupător per host și adaptarea ratei globale.
+
+        Întoarce ultimul răspuns (poate fi o eroare definitivă, ex. 404), sau None dacă
+        nu s-a obținut niciun răspuns (circuit deschis, conexiune eșuată, reîncercări epuizate).
+        Cu stream=True corpul nu e citit: apelantul îl citește, numără octeții și închide răspunsul.
+        """
+        import requests
+
+        metrics = self.metrics
+        host = urlsplit(url).netloc.lower()
+        breaker = self._breaker(host)
+        resp = None
+        for attempt in range(self.retry.attempts):
+            ticket = breaker.allow()
+            if ticket is None:
+                metrics.incr("circuit_open_total", host=host)
+                logger.warning("Circuit deschis pentru %s, cererea e amânată: %s", host, url)
+                return None
+            with metrics.stage("rate_wait"):
+                self.rate_limiter.acquire()
+            retry_after = None
+            try:
+                with metrics.stage("fetch"), self._host_slot(url):
+                    resp = self.session.get(url, timeout=self.timeout, headers=headers, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                resp = None
+                metrics.incr("http_errors_total", kind=type(e).__name__)
+                logger.warning("Eroare de rețea (%s), încercarea %d: %s", type(e).__name__, attempt + 1, url)
+            else:
+                metrics.incr("http_requests_total", status=str(resp.status_code))
+                if not stream:
+                    metrics.incr("http_bytes_total", len(resp.content))
+                if resp.status_code not in self.retry.statuses:
+                    breaker.record(ticket, True)
+                    self.rate_limiter.speed_up()
+                    return resp
+                retry_after = resp.headers.get("Retry-After")
+                if attempt + 1 < self.retry.attempts:
+                    resp.close()
+            breaker.record(ticket, False)
+            if self.rate_limiter.slow_down():
+                metrics.incr("rate_decrease_total")
+            if attempt + 1 == self.retry.attempts:
+                break
+            delay = self.retry.delay(attempt, retry_after)
+            if delay is None:
+                logger.warning("Retry-After prea mare (%s) pentru %s", retry_after, url)
+                break
+            metrics.incr("http_retries_total")
+            time.sleep(delay)
+        return resp
+
+    def _served_from_cache(self, url: str, cached) -> bool:
+        """True dacă cererea nu mai ajunge la rețea: intrare proaspătă sau cache offline."""
+        if cached is not None and (cached.fresh or self.cache.offline):
+            self.metrics.incr("cache_total", result="hit")
+            return True
+        if self.cache is not None and self.cache.offline:
+            self.metrics.incr("cache_total", result="offline_miss")
+            logger.warning("Pagina nu e în cache (offline): %s", url)
+            return True
+        return False
+
+    def fetch_page(self, url: str) -> Optional[bytes]:
+        """GET cu limită de rată globală, concurență limitată per host și reîncercări (vezi _get).
+
+        Cu cache: un răspuns proaspăt nu mai ajunge la rețea, unul expirat se
+        revalidează condițional (304 -> corpul din cache).
+        """
+        metrics = self.metrics
+        cached = self.cache.get(url) if self.cache else None
+        if self._served_from_cache(url, cached):
+            return cached.body if cached is not None else None
+
+        resp = self._get(url, cached.validators() if cached else None)
+        if resp is None:
+            return None
+        if resp.status_code == 304 and cached is not None:
+            metrics.incr("cache_total", result="revalidated")
+            self.cache.refresh(url)
+            return cached.body
+        if resp.status_code != 200:
+            logger.warning("Eroare HTTP: %s pentru %s", resp.status_code, url)
+            return None
+        if self.cache is not None:
+            metrics.incr("cache_total", result="miss")
+            self.cache.put(url, resp.content, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return resp.content
+
+    STREAM_CHUNK = 16384
+
+    def _stream_resolved(self, builder: _PageViewBuilder, structured: Dict) -> bool:
+        """Partea primită ajunge: restul paginii n-ar mai schimba rezultatul lui parse_listing."""
+        view = builder.view
+        if not (self.spec_engine.names | {"price"}) <= structured.keys():
+            return False
+        if "description" not in structured and not builder.description_done:
+            return False
+        # modelul lipsă vine din canonical (definitiv la prima apariție), brandul din breadcrumb
+        if "model" not in structured and view.canonical is None:
+            return False
+        if "brand" not in structured and not self._stream_brand(builder):
+            return False
+        head = self._head_title(view)
+        # og:title e definitiv la prima apariție; altfel titlul anunțului din pagină, iar
+        # dacă acela e gol, <title> (complet, fiindcă suntem deja în <body>)
+        if head is not None and head[0] == "og_title":
+            return True
+        return builder.ad_title_done and (bool(view.ad_title) or head is not None)
+
+    @staticmethod
+    def _stream_brand(builder: _PageViewBuilder) -> bool:
+        """Primul breadcrumb cu brand (ca în extract_brand_from_breadcrumb) e deja complet."""
+        for closed, text in builder.breadcrumbs_so_far():
+            if not closed:
+                return False
+            if text is not None and BRAND_CATALOGUE.brand_for_text(text):
+                return True
+        return False
+
+    def stream_listing(self, url: str) -> Optional[CarSpecs]:
+        """Descarcă anunțul în flux și îl parsează pe măsură ce sosesc octeții.
+
+        Conexiunea se închide imediat ce titlul, prețul, descrierea și specificațiile
+        sunt rezolvate (de regulă din datele structurate de la începutul paginii); restul
+        paginii nu se mai descarcă. Decomprimarea (gzip/deflate/br) se face tot în flux.
+        Rezultatul e același ca parse_listing pe pagina întreagă. Numai paginile citite
+        complet ajung în cache; octeții economisiți sunt în metrica stream_bytes_saved_total.
+        """
+        metrics = self.metrics
+        cached = self.cache.get(url) if self.cache else None
+        if self._served_from_cache(url, cached):
+            return self.parse_listing(cached.body, url) if cached is not None else None
+
+        resp = self._get(url, cached.validators() if cached else None, stream=True)
+        if resp is None:
+            return None
+        if resp.status_code == 304 and cached is not None:
+            resp.close()
+            metrics.incr("cache_total", result="revalidated")
+            self.cache.refresh(url)
+            return self.parse_listing(cached.body, url)
+        if resp.status_code != 200:
+            resp.close()
+            logger.warning("Eroare HTTP: %s pentru %s", resp.status_code, url)
+            return None
+
+        builder = _PageViewBuilder(url)
+        parser = IncrementalPageParser(builder)
+        chunks = []
+        structured: Dict = {}
+        version = 0
+        early = False
+        try:
+            with metrics.stage("stream"):
+                for chunk in resp.iter_content(self.STREAM_CHUNK):
+                    parser.feed(chunk)
+                    chunks.append(chunk)
+                    if builder.structured_version != version:
+                        version = builder.structured_version
+                        structured = self._structured(builder.view)[0]
+                    if structured and self._stream_resolved(builder, structured):
+                        early = True
+                        break
+                else:
+                    parser.close()
+        finally:
+            # octeții primiți efectiv (comprimați, dacă serverul a comprimat)
+            received = resp.raw.tell()
+            resp.close()
+
+        metrics.incr("http_bytes_total", received)
+        metrics.incr("stream_pages_total", result="early" if early else "full")
+        if early:
+            total = resp.headers.get("Content-Length")
+            if total and total.isdigit():
+                saved = max(0, int(total) - received)
+                metrics.incr("stream_bytes_saved_total", saved)
+                logger.debug("Flux oprit după %d din %s octeți (%d economisiți): %s", received, total, saved, url)
+        elif self.cache is not None:
+            metrics.incr("cache_total", result="miss")
+            self.cache.put(url, b"".join(chunks), resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+
+        view = builder.finish()
+        view.text = self.normalize_numeric_text(view.text)
+        return self._listing_from_view(view, url)
+
+    def extract_car_specs(self, url: str) -> Optional[CarSpecs]:
+        """Extragere completă cu fixuri."""
+        try:
+            with self.metrics.profile(url):
+                if self.stream:
+                    car = self.stream_listing(url)
+                    if car is None:
+                        self.metrics.incr("listings_failed_total", stage="fetch")
+                    return car
+                content = self.fetch_page(url)
+                if content is None:
+                    self.metrics.incr("listings_failed_total", stage="fetch")
+                    return None
+                return self.parse_listing(content, url)
+        except Exception:
+            self.metrics.incr("listings_failed_total", stage="exception")
+            logger.exception("Eroare la extragerea datelor: %s", url)
+            return None
+
+    def extract_many(self, urls: Iterable[str], max_workers: int = 8) -> Iterator[Tuple[str, Optional[CarSpecs]]]:
+        """Extrage mai multe anunțuri în paralel; produce (url, CarSpecs sau None) pe măsură ce termină.
+
+        Ritmul cererilor e dat de `rate_limiter` și `max_per_host`, nu de numărul de workeri;
+        workerii doar suprapun așteptarea rețelei cu parsarea.
+        """
+        urls = iter(urls)
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            # cel mult 2 * max_workers anunțuri în lucru: `urls` poate fi lung sau leneș
+            pending = {pool.submit(self.extract_car_specs, url): url for url in islice(urls, 2 * max_workers)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    url = pending.pop(fut)
+                    # următorul anunț pornește înainte ca apelantul să primească rezultatul
+                    for nxt in islice(urls, 1):
+                        pending[pool.submit(self.extract_car_specs, nxt)] = nxt
+                    yield url, fut.result()
+        finally:
+            # dacă apelantul se oprește devreme, nu mai pornim cererile rămase
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def parse_listing(self, content, url: str) -> CarSpecs:
+        """Extrage CarSpecs dintr-o pagină de anunț deja descărcată."""
+        with self.metrics.stage("parse"):
+            view = self.parse_page(content, url)
+        return self._listing_from_view(view, url)
+
+    def _listing_from_view(self, view: PageView, url: str) -> CarSpecs:
+        metrics = self.metrics
+        with metrics.stage("structured"):
+            structured = self.structured_fields(view)
+        # calea rapidă: datele structurate acoperă tot, textul vizibil nu mai e scanat
+        fast = self.spec_engine.names <= structured.keys() and "price" in structured
+        with metrics.stage("specs"):
+            specs = self.extract_specs_from_structured_data(view, structured)
+        with metrics.stage("title"):
+            specs["title"] = self.extract_title(view)
+        if "price" not in specs:
+            with metrics.stage("price"):
+                specs["price"], specs["price_text"] = self.extract_price(view)
+        metrics.incr("listings_total", path="fast" if fast else "text")
+        return car_from_fields(specs, url)
+
+# ---- Test rapid ----
+def test_extractor():
+    extractor = OLXExtractorFixed()
+    test_url = "https://www.olx.ro/d/oferta/ford-ranger-wildtrack-2021-2l-a10-full-105000km-tva-deductibil-IDjFQ7O.html"
+    print("=== TEST EXTRACTOR CORECTAT ===")
+    result = extractor.extract_car_specs(test_url)
+    if result:
+        print(f"Titlu: {result.title}")
+        print(f"Preț: {result.price_text} (numeric: {result.price})")
+        print(f"Marca: {result.brand}")
+        print(f"Model: {result.model}")
+        print(f"An: {result.year}")
+        print(f"KM: {result.km:,}")
+        print(f"Combustibil: {result.fuel}")
+        print(f"Cutie: {result.gearbox}")
+        print(f"Caroserie: {result.body}")
+        print(f"Putere: {result.power} CP")
+        print(f"Capacitate: {result.engine_size} cm³")
+        print(f"Stare: {result.state}")
+    else:
+        print("Nu s-au putut extrage datele")
+
+if __name__ == "__main__":
+    test_extractor()
@@ -0,0 +1,174 @@
+"""Metrici: contoare, durate per etapă, export Prometheus/JSON și profilare la cerere."""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional, Tuple
+
+from .net import cache_path
+
+logger = logging.getLogger("olx_analyzer")
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+class _StageTimer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self) -> "_StageTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+def _prom_escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _prom_number(value: float) -> str:
+    # valoarea exactă: "{:g}" ar rotunji la 6 cifre contoare mari (ex. http_bytes_total)
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+# contextul întors de Metrics.stage()/profile() când metricile sunt dezactivate
+_NO_OP = nullcontext()
+
+class Metrics:
+    """Contoare și durate per etapă, exportabile ca text Prometheus sau log JSON.
+
+    Dezactivat (enabled=False), fiecare apel se oprește la primul `if`, iar stage()
+    întoarce același context gol, deci instrumentarea nu costă practic nimic.
+    profiler="cprofile" sau "pyinstrument" profilează fiecare anunț (vezi profile()).
+    """
+
+    def __init__(self, enabled: bool = True, profiler: Optional[str] = None, profile_dir: Optional[str] = None):
+        if profiler not in (None, "cprofile", "pyinstrument"):
+            raise ValueError(f"Profiler necunoscut: {profiler}")
+        self.enabled = enabled
+        self.profiler = profiler
+        self.profile_dir = profile_dir or cache_path("profiles")
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, _LabelKey], float] = {}
+        # etapă -> [număr, total secunde, maxim]
+        self._stages: Dict[str, List[float]] = {}
+
+    def incr(self, name: str, value: float = 1, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def fallback(self, field_name: str, source: str) -> None:
+        """Care sursă a dat valoarea unui câmp (og:title, JSON-LD, text, URL...)."""
+        if self.enabled:
+            self.incr("extract_source_total", field=field_name, source=source)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            s = self._stages.get(stage)
+            if s is None:
+                self._stages[stage] = [1, seconds, seconds]
+            else:
+                s[0] += 1
+                s[1] += seconds
+                s[2] = max(s[2], seconds)
+
+    def stage(self, name: str):
+        """Context care măsoară durata etapei `name`."""
+        return _StageTimer(self, name) if self.enabled else _NO_OP
+
+    def counter(self, name: str, **labels: str) -> float:
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._stages.clear()
+
+    # -------- export --------
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            stages = {
+                name: {"count": int(n), "total_s": total, "max_s": peak}
+                for name, (n, total, peak) in sorted(self._stages.items())
+            }
+        return {"counters": counters, "stages": stages}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+    def log(self, log: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        """Un rând de log structurat (JSON) cu starea curentă."""
+        (log or logger).log(level, "metrics %s", self.to_json())
+
+    def to_prometheus(self, prefix: str = "olx_") -> str:
+        def fmt(labels: Dict[str, str]) -> str:
+            if not labels:
+                return ""
+            return "{" + ",".join(f'{k}="{_prom_escape(v)}"' for k, v in labels.items()) + "}"
+
+        snap = self.snapshot()
+        lines: List[str] = []
+        typed = set()
+        for c in snap["counters"]:
+            name = prefix + c["name"]
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{fmt(c['labels'])} {_prom_number(c['value'])}")
+        if snap["stages"]:
+            name = prefix + "stage_seconds"
+            lines.append(f"# TYPE {name} summary")
+            for stage, s in snap["stages"].items():
+                lines.append(f"{name}_count{fmt({'stage': stage})} {s['count']}")
+                lines.append(f"{name}_sum{fmt({'stage': stage})} {s['total_s']:.6f}")
+            lines.append(f"# TYPE {name}_max gauge")
+            for stage, s in snap["stages"].items():
+                lines.append(f"{name}_max{fmt({'stage': stage})} {s['max_s']:.6f}")
+        return "".join(line + "\n" for line in lines)
+
+    # -------- profilare --------
+
+    def profile(self, label: str):
+        """Profilează blocul (un anunț) dacă e configurat un profiler; rezultatul merge în profile_dir."""
+        if not (self.enabled and self.profiler):
+            return _NO_OP
+        return self._profile(label)
+
+    @contextmanager
+    def _profile(self, label: str):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = re.sub(r"[^\w.-]+", "_", label)[-80:] + f"-{int(time.time() * 1000)}"
+        if self.profiler == "cprofile":
+            import cProfile
+            prof = cProfile.Profile()
+            prof.enable()
+            try:
+                yield
+            finally:
+                prof.disable()
+                prof.dump_stats(os.path.join(self.profile_dir, name + ".prof"))
+        else:
+            from pyinstrument import Profiler
+            prof = Profiler()
+            prof.start()
+            try:
+                yield
+            finally:
+                prof.stop()
+                with open(os.path.join(self.profile_dir, name + ".html"), "w", encoding="utf-8") as f:
+                    f.write(prof.output_html())
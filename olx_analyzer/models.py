@@ -0,0 +1,91 @@
+"""CarSpecs, construirea lui din câmpurile extrase și amprenta (SimHash) a descrierii."""
+import hashlib
+import re
+import unicodedata
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+@dataclass(slots=True)
+class CarSpecs:
+    title: str
+    price: float
+    price_text: str
+    brand: str
+    model: str
+    year: int
+    km: int
+    fuel: str
+    gearbox: str
+    body: str
+    power: Optional[int]
+    engine_size: Optional[int]
+    state: str
+    color: str
+    link: str
+    description_hash: int = 0           # SimHash al descrierii (0 = fără descriere), vezi ListingDeduplicator
+
+def car_from_fields(fields: Dict, link: str) -> CarSpecs:
+    """Construiește CarSpecs din câmpurile extrase; lipsurile devin 0/"Unknown"."""
+    return CarSpecs(
+        title=fields.get("title") or "Titlu necunoscut",
+        price=fields.get("price") or 0.0,
+        price_text=fields.get("price_text") or "0 EUR",
+        brand=fields.get("brand", "Unknown"),
+        model=fields.get("model", "Unknown"),
+        year=int(fields.get("year", 0) or 0),
+        km=int(fields.get("km", 0) or 0),
+        fuel=str(fields.get("fuel", "Unknown")),
+        gearbox=str(fields.get("gearbox", "Unknown")),
+        body=str(fields.get("body", "Unknown")),
+        power=fields.get("power"),
+        engine_size=fields.get("engine_size"),
+        state=str(fields.get("state", "Unknown")),
+        color=str(fields.get("color", "Unknown")),
+        link=link,
+        description_hash=fields.get("description_hash") or description_simhash(fields.get("description") or ""),
+    )
+
+def cars_to_frame(cars: Iterable[CarSpecs]) -> "pd.DataFrame":
+    """Tabel pandas cu câte un rând pentru fiecare CarSpecs (coloanele = câmpurile)."""
+    import pandas as pd
+
+    return pd.DataFrame([asdict(c) for c in cars], columns=list(CarSpecs.__dataclass_fields__))
+
+def listing_id(url: str) -> str:
+    """ID-ul OLX al anunțului din URL (ex. "IDjFQ7O"); altfel calea URL-ului."""
+    m = re.search(r"-(ID[0-9A-Za-z]+)\.html", url or "")
+    if m:
+        return m.group(1)
+    parts = urlsplit(url or "")
+    return parts.netloc.lower() + parts.path
+
+# -------- amprenta descrierii --------
+
+def _text_tokens(text: str) -> List[str]:
+    """Cuvintele textului, lowercase și fără diacritice."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return re.findall(r"[a-z0-9]+", text.encode("ascii", "ignore").decode())
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+
+def description_simhash(text: str, shingle: int = 3) -> int:
+    """SimHash pe 64 de biți (cu semn, ca în SQLite) al grupurilor de `shingle` cuvinte; 0 pentru text gol.
+
+    Descrieri aproape identice dau hash-uri care diferă în puțini biți.
+    """
+    words = _text_tokens(text)
+    if not words:
+        return 0
+    shingles = {" ".join(words[i:i + shingle]) for i in range(max(1, len(words) - shingle + 1))}
+    weights = [0] * 64
+    for s in shingles:
+        h = _hash64(s)
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    value = sum(1 << bit for bit in range(64) if weights[bit] > 0)
+    return value - (1 << 64) if value >= 1 << 63 else value
@@ -0,0 +1,212 @@
+"""MarketWatch: căutări salvate, reverificate periodic, cu evenimente pentru schimbări."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .analysis import PriceAnalyzer
+from .metrics import logger
+from .models import CarSpecs, listing_id
+from .net import cache_path
+from .query import SearchQuery, URLBuilder
+from .search import SearchCrawler
+from .store import ListingStore
+
+@dataclass(frozen=True)
+class WatchEvent:
+    """O schimbare observată într-o căutare urmărită.
+
+    kind: "new", "price_drop", "price_rise", "deal" (EXCELENT față de referință) sau "removed".
+    """
+    kind: str
+    watch: str
+    listing: str                        # ID-ul OLX
+    car: Optional[CarSpecs] = None
+    old_price: Optional[float] = None
+    category: Optional[str] = None
+    score: Optional[int] = None
+
+class MarketWatch:
+    """Căutări salvate, reverificate periodic.
+
+    Fiecare verificare citește doar paginile de rezultate și compară (ID, preț) cu ce
+    s-a văzut data trecută; paginile de anunț se descarcă și se clasifică doar pentru
+    anunțurile noi sau cu preț schimbat, deci costul crește cu numărul de schimbări,
+    nu cu mărimea pieței. Prima verificare a unei căutări stabilește doar starea inițială.
+    Un anunț a cărui pagină nu s-a putut descărca nu se consideră văzut: rămâne nou (sau cu
+    prețul vechi) și se reia la verificarea următoare.
+
+    Fără crawler (None) se pot doar gestiona căutările salvate (add, remove, watches).
+    """
+
+    DEAL_CATEGORY = "EXCELENT"
+
+    def __init__(self, crawler: Optional[SearchCrawler], store: ListingStore, path: str):
+        self.crawler = crawler
+        self.store = store
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS watches (
+                name TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                reference TEXT,
+                interval REAL NOT NULL,
+                last_polled REAL
+            );
+            CREATE TABLE IF NOT EXISTS watch_listings (
+                watch TEXT NOT NULL,
+                id TEXT NOT NULL,
+                price REAL,
+                active INTEGER NOT NULL DEFAULT 1,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (watch, id)
+            );
+            """
+        )
+
+    @classmethod
+    def default_path(cls) -> str:
+        return cache_path("watch.sqlite")
+
+    # -------- căutări salvate --------
+
+    def add(self, name: str, query: SearchQuery, reference: Optional[CarSpecs] = None, interval: float = 3600) -> None:
+        """Salvează (sau înlocuiește) o căutare; cu `reference`, anunțurile noi sunt și clasificate."""
+        ref = json.dumps(asdict(reference)) if reference is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO watches (name, query, reference, interval) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET query = excluded.query, reference = excluded.reference, "
+                "interval = excluded.interval",
+                (name, query.to_json(), ref, interval),
+            )
+            self._conn.commit()
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM watches WHERE name = ?", (name,))
+            self._conn.execute("DELETE FROM watch_listings WHERE watch = ?", (name,))
+            self._conn.commit()
+
+    def watches(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, query, reference, interval, last_polled FROM watches ORDER BY name"
+            ).fetchall()
+        return [
+            {
+                "name": name,
+                "query": SearchQuery.from_json(query),
+                "reference": CarSpecs(**json.loads(ref)) if ref else None,
+                "interval": interval,
+                "last_polled": last_polled,
+            }
+            for name, query, ref, interval, last_polled in rows
+        ]
+
+    def due(self, now: Optional[float] = None) -> List[Dict]:
+        now = time.time() if now is None else now
+        return [w for w in self.watches() if w["last_polled"] is None or w["last_polled"] + w["interval"] <= now]
+
+    # -------- verificare --------
+
+    def poll(self, watch: Dict) -> List[WatchEvent]:
+        """Verifică o căutare salvată și întoarce schimbările față de verificarea anterioară."""
+        name, query, reference = watch["name"], watch["query"], watch["reference"]
+        baseline = watch["last_polled"] is None
+        now = time.time()
+        with self._lock:
+            known = dict(self._conn.execute(
+                "SELECT id, price FROM watch_listings WHERE watch = ? AND active = 1", (name,)
+            ).fetchall())
+
+        events: List[WatchEvent] = []
+        seen: Dict[str, Optional[float]] = {}
+        changed: List[Tuple[str, Dict]] = []
+        exclude = [reference.link] if reference is not None else []
+        pages = 0
+        for results in self.crawler.iter_results(URLBuilder.build_query_url(query), exclude):
+            pages += 1
+            for link, fields in results:
+                lid = listing_id(link)
+                price = fields.get("price")
+                seen[lid] = price
+                if lid not in known or (price and known[lid] and price != known[lid]):
+                    changed.append((link, fields))
+        if pages == 0:
+            # nicio pagină descărcată: verificarea se reia la următoarea trecere
+            logger.warning("Căutarea urmărită %s nu a putut fi verificată", name)
+            return events
+
+        if not baseline:
+            cars = list(self.crawler.complete_results(changed, query.defaults()))
+            self.store.upsert(cars)
+            for car in cars:
+                events.extend(self._events_for(name, car, known.get(listing_id(car.link)), reference))
+            fetched = {listing_id(car.link) for car in cars}
+            for link, _ in changed:
+                lid = listing_id(link)
+                if lid not in fetched:
+                    # pagina nu s-a descărcat: fără eveniment acum, deci anunțul rămâne la starea veche
+                    if lid in known:
+                        seen[lid] = known[lid]
+                    else:
+                        del seen[lid]
+        complete = self.crawler.last_crawl_complete
+        if complete and not baseline:
+            events.extend(WatchEvent("removed", name, lid, old_price=price) for lid, price in known.items() if lid not in seen)
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO watch_listings (watch, id, price, active, last_seen) VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT(watch, id) DO UPDATE SET price = COALESCE(excluded.price, price), active = 1, "
+                "last_seen = excluded.last_seen",
+                [(name, lid, price, now) for lid, price in seen.items()],
+            )
+            if complete:
+                self._conn.execute(
+                    "UPDATE watch_listings SET active = 0 WHERE watch = ? AND last_seen < ?", (name, now)
+                )
+            self._conn.execute("UPDATE watches SET last_polled = ? WHERE name = ?", (now, name))
+            self._conn.commit()
+        return events
+
+    def _events_for(self, name: str, car: CarSpecs, old_price: Optional[float], reference: Optional[CarSpecs]) -> List[WatchEvent]:
+        category = score = None
+        if reference is not None:
+            category, score, _ = PriceAnalyzer.classify_car(reference, car)
+        lid = listing_id(car.link)
+        if old_price is None:
+            kind = "new"
+        else:
+            kind = "price_drop" if car.price < old_price else "price_rise"
+        events = [WatchEvent(kind, name, lid, car, old_price, category, score)]
+        if category == self.DEAL_CATEGORY and kind != "price_rise":
+            events.append(WatchEvent("deal", name, lid, car, old_price, category, score))
+        return events
+
+    def poll_due(self) -> List[WatchEvent]:
+        events: List[WatchEvent] = []
+        for watch in self.due():
+            events.extend(self.poll(watch))
+        return events
+
+    def run(self, on_event, iterations: Optional[int] = None, idle: float = 30.0) -> None:
+        """Verifică la nesfârșit căutările scadente (sau de `iterations` ori), apelând on_event(ev)."""
+        done = 0
+        while iterations is None or done < iterations:
+            for event in self.poll_due():
+                on_event(event)
+            done += 1
+            if iterations is not None and done >= iterations:
+                return
+            pending = [w["last_polled"] + w["interval"] for w in self.watches() if w["last_polled"] is not None]
+            wait = min(pending) - time.time() if pending else idle
+            time.sleep(min(idle, max(1.0, wait)))
@@ -0,0 +1,237 @@
+"""Cei mai apropiați vecini: index KD-tree al anunțurilor comparabile, pe segmente."""
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .models import CarSpecs, listing_id
+
+# caracteristicile comparate și valoarea care contează drept o unitate de distanță
+# (aceleași mărimi ca toleranțele implicite ale căutării: ±2 ani, ±30.000 km, ±20 CP, ±300 cm³)
+FEATURE_SCALES = {"year": 2.0, "km": 30000.0, "power": 20.0, "engine_size": 300.0}
+
+class _KDTree:
+    """KD-tree static peste anunțurile unui segment care au aceleași caracteristici cunoscute.
+
+    Inserările noi stau într-un tampon (după punctele arborelui) scanat direct și intră
+    în arbore la reconstruire, când tamponul depășește un sfert din arbore (cost amortizat
+    O(log n) per inserare). Anunțurile înlocuite sunt doar marcate și dispar la reconstruire.
+    """
+
+    LEAF_SIZE = 128
+
+    def __init__(self, dims: Tuple[int, ...]):
+        self.dims = dims                                    # indicii caracteristicilor cunoscute
+        self.points = np.empty((self.LEAF_SIZE, len(dims)))
+        self.alive = np.zeros(self.LEAF_SIZE, dtype=bool)
+        self.cars: List[CarSpecs] = []
+        self.ids: List[str] = []
+        self.built = 0                                      # [0, built) în arbore, restul în tampon
+        self.stale = 0
+        # nodurile: cutia (lo, hi), copiii (-1 la frunze) și intervalul de puncte
+        self.lo = self.hi = np.empty((0, len(dims)))
+        self.children: List[Tuple[int, int]] = []
+        self.ranges: List[Tuple[int, int]] = []
+
+    def add(self, point: np.ndarray, car: CarSpecs, lid: str) -> int:
+        slot = len(self.cars)
+        if slot == len(self.points):
+            self.points = np.concatenate([self.points, np.empty_like(self.points)])
+            self.alive = np.concatenate([self.alive, np.zeros_like(self.alive)])
+        self.points[slot] = point
+        self.alive[slot] = True
+        self.cars.append(car)
+        self.ids.append(lid)
+        return slot
+
+    def remove(self, slot: int) -> None:
+        self.alive[slot] = False
+        self.stale += 1
+
+    def needs_rebuild(self) -> bool:
+        pending = len(self.cars) - self.built
+        return pending > max(self.LEAF_SIZE, self.built // 4) or self.stale > len(self.cars) // 2
+
+    def rebuild(self) -> None:
+        """Contopește tamponul în arbore și scoate anunțurile înlocuite."""
+        keep = np.flatnonzero(self.alive[:len(self.cars)])
+        points = self.points[keep]
+        order = np.arange(len(keep))
+        lo: List[np.ndarray] = []
+        hi: List[np.ndarray] = []
+        children: List[Tuple[int, int]] = []
+        ranges: List[Tuple[int, int]] = []
+
+        def build(start: int, end: int) -> int:
+            idx = order[start:end]
+            node = len(children)
+            lo.append(points[idx].min(axis=0))
+            hi.append(points[idx].max(axis=0))
+            children.append((-1, -1))
+            ranges.append((start, end))
+            if end - start > self.LEAF_SIZE and self.dims:
+                dim = int(np.argmax(hi[node] - lo[node]))
+                mid = (start + end) // 2
+                order[start:end] = idx[np.argpartition(points[idx, dim], mid - start)]
+                children[node] = (build(start, mid), build(mid, end))
+            return node
+
+        if len(keep):
+            build(0, len(keep))
+        capacity = max(self.LEAF_SIZE, 2 * len(keep))
+        self.points = np.empty((capacity, len(self.dims)))
+        self.points[:len(keep)] = points[order]
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.alive[:len(keep)] = True
+        self.cars = [self.cars[keep[i]] for i in order]
+        self.ids = [self.ids[keep[i]] for i in order]
+        self.built, self.stale = len(keep), 0
+        shape = (0, len(self.dims))
+        self.lo = np.array(lo) if lo else np.empty(shape)
+        self.hi = np.array(hi) if hi else np.empty(shape)
+        self.children = children
+        self.ranges = ranges
+
+    def _distances(self, start: int, end: int, q: np.ndarray, active, penalty: float) -> np.ndarray:
+        d2 = ((self.points[start:end, active] - q) ** 2).sum(axis=1) + penalty
+        d2[~self.alive[start:end]] = np.inf
+        return d2
+
+    def search(self, q: np.ndarray, active: np.ndarray, penalty: float, best: "_Nearest", tree_no: int) -> None:
+        """Oferă lui `best` punctele arborelui care pot intra între cei mai apropiați.
+
+        q: coordonatele cererii pe dimensiunile `active`; penalty: d² adăugat fiecărui punct
+        pentru caracteristicile cunoscute doar de una dintre mașini.
+        """
+        if len(active) == len(self.dims):
+            active = slice(None)        # indexarea cu o felie nu copiază
+        if len(self.cars) > self.built:
+            best.offer(tree_no, self.built, self._distances(self.built, len(self.cars), q, active, penalty))
+        if not self.built:
+            return
+        # parcurgere best-first după distanța minimă până la cutia nodului
+        queue = [(penalty, 0)]
+        while queue:
+            bound, node = heapq.heappop(queue)
+            if bound >= best.bound:
+                break
+            left, right = self.children[node]
+            if left < 0:
+                start, end = self.ranges[node]
+                best.offer(tree_no, start, self._distances(start, end, q, active, penalty))
+                continue
+            pair = [left, right]
+            gap = np.maximum(np.maximum(self.lo[pair][:, active] - q, q - self.hi[pair][:, active]), 0.0)
+            left_d2, right_d2 = (gap * gap).sum(axis=1) + penalty
+            heapq.heappush(queue, (left_d2, left))
+            heapq.heappush(queue, (right_d2, right))
+
+class _Nearest:
+    """Cei mai apropiați k candidați găsiți până acum: d², arborele și poziția în arbore."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.d2 = np.empty(0)
+        self.trees = np.empty(0, dtype=np.intp)
+        self.slots = np.empty(0, dtype=np.intp)
+        self.bound = np.inf if k > 0 else -np.inf
+
+    def offer(self, tree_no: int, start: int, d2: np.ndarray) -> None:
+        found = np.flatnonzero(d2 < self.bound)
+        if not len(found):
+            return
+        self.d2 = np.concatenate([self.d2, d2[found]])
+        self.trees = np.concatenate([self.trees, np.full(len(found), tree_no, dtype=np.intp)])
+        self.slots = np.concatenate([self.slots, found + start])
+        if len(self.d2) >= self.k:
+            keep = np.argpartition(self.d2, self.k - 1)[:self.k]
+            self.d2, self.trees, self.slots = self.d2[keep], self.trees[keep], self.slots[keep]
+            self.bound = self.d2.max()
+
+class ComparablesIndex:
+    """Index în memorie pentru „cele mai apropiate N anunțuri” de un anunț dat.
+
+    Anunțurile sunt împărțite pe segmente (marcă, model, combustibil, cutie), iar în
+    fiecare segment pe caracteristicile cunoscute; fiecare grup are un KD-tree peste
+    an/km/putere/capacitate scalate cu FEATURE_SCALES. Distanța e euclidiană în aceste
+    unități; o caracteristică cunoscută doar de una dintre mașini adaugă
+    `missing_penalty` unități. Un anunț adăugat din nou (același ID) îl înlocuiește pe cel vechi.
+    """
+
+    def __init__(self, scales: Optional[Dict[str, float]] = None, missing_penalty: float = 1.0):
+        scales = dict(FEATURE_SCALES, **(scales or {}))
+        self.features = tuple(FEATURE_SCALES)
+        self._scales = np.array([scales[name] for name in self.features])
+        self.missing_penalty = missing_penalty
+        self._segments: Dict[Tuple, Dict[Tuple[int, ...], _KDTree]] = {}
+        self._where: Dict[str, Tuple[_KDTree, int]] = {}     # ID -> (arbore, poziție)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def segment(car: CarSpecs) -> Tuple:
+        return car.brand, car.model.lower(), car.fuel, car.gearbox
+
+    def _point(self, car: CarSpecs) -> Tuple[Tuple[int, ...], np.ndarray]:
+        """(indicii caracteristicilor cunoscute, toate valorile scalate; 0 pentru cele lipsă)."""
+        values = [getattr(car, name) or 0 for name in self.features]
+        dims = tuple(i for i, v in enumerate(values) if v > 0)
+        return dims, np.array(values, dtype=np.float64) / self._scales
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def add(self, cars: Iterable[CarSpecs]) -> int:
+        """Adaugă (sau actualizează) anunțurile; întoarce câte au fost primite."""
+        count = 0
+        with self._lock:
+            touched = set()
+            for car in cars:
+                lid = listing_id(car.link)
+                old = self._where.get(lid)
+                if old is not None:
+                    old[0].remove(old[1])
+                    touched.add(old[0])
+                dims, point = self._point(car)
+                trees = self._segments.setdefault(self.segment(car), {})
+                tree = trees.get(dims)
+                if tree is None:
+                    tree = trees[dims] = _KDTree(dims)
+                self._where[lid] = (tree, tree.add(point[list(dims)], car, lid))
+                touched.add(tree)
+                count += 1
+            for tree in touched:
+                if tree.needs_rebuild():
+                    tree.rebuild()
+                    self._where.update((lid, (tree, slot)) for slot, lid in enumerate(tree.ids))
+        return count
+
+    def nearest(self, car: CarSpecs, k: int = 50, exclude: Iterable[str] = ()) -> List[Tuple[CarSpecs, float]]:
+        """Cele mai apropiate k anunțuri din segmentul lui `car`, cu distanța, de la cel mai apropiat.
+
+        Anunțul însuși și link-urile din `exclude` nu apar în rezultat.
+        """
+        skip = {listing_id(u) for u in exclude}
+        skip.add(listing_id(car.link))
+        dims, point = self._point(car)
+        known = set(dims)
+        with self._lock:
+            trees = list(self._segments.get(self.segment(car), {}).values())
+            # excluderile se cer în plus și se scot la final
+            best = _Nearest(k + sum(1 for lid in skip if lid in self._where))
+            searches = []
+            for tree_no, tree in enumerate(trees):
+                active = [j for j, d in enumerate(tree.dims) if d in known]
+                penalty = len(known.symmetric_difference(tree.dims)) * self.missing_penalty ** 2
+                searches.append((penalty, tree_no, np.array(active, dtype=np.intp)))
+            # grupurile cu aceleași caracteristici cunoscute întâi: limita scade mai repede
+            for penalty, tree_no, active in sorted(searches, key=lambda s: s[0]):
+                if penalty < best.bound:
+                    tree = trees[tree_no]
+                    trees[tree_no].search(point[[tree.dims[j] for j in active]], active, penalty, best, tree_no)
+            found = [
+                (float(d2), trees[t].ids[slot], trees[t].cars[slot])
+                for d2, t, slot in zip(best.d2, best.trees, best.slots)
+            ]
+        found = sorted(item for item in found if item[1] not in skip)[:k]
+        return [(c, float(np.sqrt(d2))) for d2, _, c in found]
@@ -0,0 +1,299 @@
+"""HTTP: limitarea ratei, reîncercări, circuit breaker și cache-ul persistent al răspunsurilor."""
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Deque, Dict, FrozenSet, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+class TokenBucket:
+    """Limitator de rată thread-safe: `rate` cereri/secundă, cu rafale de cel mult `burst`.
+
+    Rata se adaptează AIMD: slow_down() o înjumătățește la semne de suprasarcină (cel
+    mult o dată pe interval, ca o rafală de erori să nu o prăbușească), speed_up() o
+    crește liniar înapoi spre rata configurată.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate trebuie să fie pozitiv")
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    def slow_down(self, factor: float = 0.5) -> bool:
+        """Scade rata multiplicativ; întoarce False dacă o scădere recentă acoperă deja episodul."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < max(1.0, 1.0 / self.rate):
+                return False
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * factor)
+            return True
+
+    def speed_up(self, step: Optional[float] = None) -> None:
+        """Crește rata aditiv, până la rata configurată."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + (step if step is not None else self.max_rate / 20))
+
+    def acquire(self) -> None:
+        """Blochează până când e disponibil un token."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # rezervăm tokenul acum; dacă bugetul e negativ, așteptăm rândul în afara lock-ului
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Reîncercări cu backoff exponențial și jitter complet; Retry-After are prioritate.
+
+    Un Retry-After mai mare decât `max_delay` nu e așteptat: cererea e abandonată,
+    ca un lot să nu stea blocat minute întregi pe un singur anunț.
+    """
+    attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Secundele de așteptare înainte de reîncercarea `attempt` (0 = prima); None = renunță."""
+        wait = _parse_retry_after(retry_after)
+        if wait is not None:
+            return wait if wait <= self.max_delay else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After: secunde sau dată HTTP."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    from email.utils import parsedate_to_datetime
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+class CircuitBreaker:
+    """Întrerupător per host: dacă rata de eșec din ultimele `window` cereri depășește
+    `failure_ratio`, cererile sunt refuzate local timp de `cooldown` secunde; apoi o
+    singură cerere de probă decide dacă circuitul se închide sau se redeschide.
+
+    allow() dă un bilet (None = cerere refuzată), iar record() primește biletul înapoi cu
+    rezultatul. Biletele se schimbă la fiecare deschidere, probă și închidere, deci
+    rezultatele întârziate ale cererilor trimise înainte nu decid starea circuitului.
+    """
+
+    def __init__(self, window: int = 20, min_requests: int = 10, failure_ratio: float = 0.5, cooldown: float = 30.0):
+        self.min_requests = min_requests
+        self.failure_ratio = failure_ratio
+        self.cooldown = cooldown
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._ticket = 0                        # biletul curent (al cererilor normale sau al probei)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self._opened_at >= self.cooldown else "open"
+
+    def allow(self) -> Optional[int]:
+        with self._lock:
+            if self._opened_at is None:
+                return self._ticket
+            if time.monotonic() - self._opened_at < self.cooldown or self._probing:
+                return None
+            self._probing = True
+            self._ticket += 1
+            return self._ticket
+
+    def record(self, ticket: int, ok: bool) -> None:
+        with self._lock:
+            if ticket != self._ticket:
+                # cerere trimisă înainte de ultima schimbare de stare
+                return
+            if self._opened_at is not None:
+                if not self._probing:
+                    return
+                # rezultatul probei
+                self._probing = False
+                if ok:
+                    self._opened_at = None
+                    self._outcomes.clear()
+                else:
+                    self._opened_at = time.monotonic()
+                self._ticket += 1
+                return
+            self._outcomes.append(ok)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.failure_ratio:
+                self._opened_at = time.monotonic()
+                self._ticket += 1
+
+def cache_path(filename: str) -> str:
+    """Calea unui fișier de date local (implicit ~/.cache/olx-analyzer, sau $OLX_CACHE_DIR)."""
+    base = os.environ.get("OLX_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "olx-analyzer")
+    return os.path.join(base, filename)
+
+def normalize_url(url: str) -> str:
+    """Forma canonică a unui URL pentru cache: schemă/host lowercase, fără fragment, query sortat."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = parts.netloc.lower()
+    if (scheme, host.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        host = host.rsplit(":", 1)[0]
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh: bool
+
+    def validators(self) -> Dict[str, str]:
+        """Header-ele pentru o cerere condițională (revalidare)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """Cache persistent (SQLite) pentru răspunsurile HTTP, cu TTL, evicție LRU după mărime
+    și revalidare prin ETag/Last-Modified.
+
+    Limita `max_bytes` e a fișierului, nu a procesului: mărimea se recalculează (SUM) în
+    tranzacția IMMEDIATE a fiecărei scrieri, deci e respectată și când mai multe procese
+    (batch.py) scriu în același cache. Fișierul e în modul WAL: citirile nu așteaptă scrierile.
+
+    offline=True: nu se face nicio cerere; se servesc doar paginile din cache, chiar expirate.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        listing_ttl: float = 24 * 3600,
+        search_ttl: float = 3600,
+        max_bytes: int = 500 * 1024 * 1024,
+        offline: bool = False,
+    ):
+        self.path = path
+        self.listing_ttl = listing_ttl
+        self.search_ttl = search_ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+            """
+        )
+
+    @classmethod
+    def default_path(cls) -> str:
+        return cache_path("http.sqlite")
+
+    def ttl_for(self, url: str) -> float:
+        return self.listing_ttl if "/d/oferta/" in url else self.search_ttl
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        body, etag, last_modified, expires_at = row
+        return CachedResponse(bytes(body), etag, last_modified, fresh=expires_at > now)
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, body, etag, last_modified, now + self.ttl_for(url), now, len(body)),
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def refresh(self, url: str) -> None:
+        """Prelungește TTL-ul după un 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (now + self.ttl_for(url), now, normalize_url(url)),
+            )
+
+    def size(self) -> int:
+        """Octeții corpurilor din cache (toate procesele)."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self) -> None:
+        # șterge cele mai vechi accesări până intrăm sub limită (apelat sub lock, în tranzacție)
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                return
+            for key, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    return
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
@@ -0,0 +1,364 @@
+"""PageView: vederea unei pagini, construită dintr-o singură parcurgere, și backend-urile HTML."""
+import codecs
+import importlib.util
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+@dataclass
+class PageView:
+    """Vederea unei pagini, construită dintr-o singură parcurgere a DOM-ului."""
+    url: str = ""
+    meta: Dict[str, str] = field(default_factory=dict)        # property -> content (prima apariție)
+    canonical: Optional[str] = None
+    title: str = ""
+    h1: List[str] = field(default_factory=list)
+    json_ld: List[Optional[str]] = field(default_factory=list)
+    text: str = ""                                              # text vizibil normalizat
+    breadcrumbs: List[str] = field(default_factory=list)       # texte scurte din <a>/<span>/<li>, lowercase
+    hrefs: List[str] = field(default_factory=list)             # href-urile <a>, lowercase
+    state_script: Optional[str] = None                         # <script> cu __PRERENDERED_STATE__
+    description: str = ""                                       # textul din [data-cy="ad_description"]
+    ad_title: str = ""                                          # textul din [data-cy="ad_title"]
+    price: str = ""                                             # textul din [data-testid="ad-price-container"]
+
+# tag-uri al căror conținut nu e text vizibil
+_HIDDEN_TAGS = frozenset({"script", "style", "noscript", "template"})
+_BREADCRUMB_TAGS = frozenset({"a", "span", "li"})
+# brandurile au cel mult câteva cuvinte; textele mai lungi nu sunt candidați
+_BREADCRUMB_MAX_LEN = 40
+
+class _TextCollector:
+    """Acumulează textul (strip, fără separator) al unui element în timpul parcurgerii."""
+    __slots__ = ("parts", "size", "limit")
+
+    def __init__(self, limit: Optional[int] = None):
+        self.parts: List[str] = []
+        self.size = 0
+        self.limit = limit
+
+    def add(self, s: str) -> None:
+        if self.limit is not None and self.size > self.limit:
+            return
+        self.parts.append(s)
+        self.size += len(s)
+
+    def text(self) -> Optional[str]:
+        if self.limit is not None and self.size > self.limit:
+            return None
+        return "".join(self.parts)
+
+class _PageViewBuilder:
+    """Construiește un PageView din evenimentele start/text/end ale unui backend HTML.
+
+    Backend-urile trimit doar text de conținut (fără comentarii/doctype), inclusiv
+    conținutul brut al tag-urilor <script>/<style>.
+    """
+
+    def __init__(self, url: str = ""):
+        self.view = PageView(url=url)
+        self._texts: List[str] = []
+        self._title: Optional[_TextCollector] = None
+        self._h1: List[_TextCollector] = []
+        self._crumbs: List[_TextCollector] = []
+        self._description: Optional[_TextCollector] = None
+        self._ad_title: Optional[_TextCollector] = None
+        self._price: Optional[_TextCollector] = None
+        self._active: List[_TextCollector] = []
+        # stivă de (colector deschis de tag, e în subarbore ascuns)
+        self._stack: List[Tuple[Optional[_TextCollector], bool]] = []
+        self._hidden = False
+        self._in_json_ld = False
+        self._script: Optional[List[str]] = None
+        # progresul parcurgerii, pentru parsarea incrementală (IncrementalPageParser)
+        self.in_body = False
+        self.description_done = False
+        self.ad_title_done = False
+        self.structured_version = 0     # crește la fiecare bloc structurat închis
+
+    def start(self, name: str, attrs) -> None:
+        view = self.view
+        collector = None
+        if name == "meta":
+            prop = attrs.get("property")
+            if prop and prop not in view.meta:
+                view.meta[prop] = attrs.get("content") or ""
+        elif name == "link":
+            if view.canonical is None and attrs.get("href"):
+                rel = attrs.get("rel") or []
+                if "canonical" in (rel if isinstance(rel, list) else rel.split()):
+                    view.canonical = attrs["href"]
+        elif name == "script":
+            if attrs.get("type") == "application/ld+json":
+                view.json_ld.append(None)
+                self._in_json_ld = True
+            elif view.state_script is None:
+                self._script = []
+        elif name == "title":
+            if self._title is None:
+                collector = self._title = _TextCollector()
+        elif name == "h1":
+            collector = _TextCollector()
+            self._h1.append(collector)
+        elif name in _BREADCRUMB_TAGS and not self._hidden:
+            collector = _TextCollector(_BREADCRUMB_MAX_LEN)
+            self._crumbs.append(collector)
+            if name == "a" and attrs.get("href"):
+                view.hrefs.append(attrs["href"].lower())
+        elif self._description is None and attrs.get("data-cy") == "ad_description":
+            collector = self._description = _TextCollector()
+        elif self._ad_title is None and attrs.get("data-cy") == "ad_title":
+            collector = self._ad_title = _TextCollector()
+        elif self._price is None and attrs.get("data-testid") == "ad-price-container":
+            collector = self._price = _TextCollector()
+        elif name == "body":
+            self.in_body = True
+
+        if collector is not None:
+            self._active.append(collector)
+        self._stack.append((collector, self._hidden))
+        self._hidden = self._hidden or name in _HIDDEN_TAGS
+
+    def end(self) -> None:
+        collector, self._hidden = self._stack.pop()
+        if collector is not None:
+            self._active.remove(collector)
+            if collector is self._title:
+                self.view.title = collector.text() or ""
+            elif collector is self._description:
+                self.description_done = True
+            elif collector is self._ad_title:
+                self.view.ad_title = " ".join(collector.parts)
+                self.ad_title_done = True
+        if self._in_json_ld:
+            self._in_json_ld = False
+            self.structured_version += 1
+        if self._script is not None:
+            # <script> nu are copii, deci primul end() după start îl închide
+            script = "".join(self._script)
+            if "__PRERENDERED_STATE__" in script:
+                self.view.state_script = script
+                self.structured_version += 1
+            self._script = None
+
+    def text(self, s: str) -> None:
+        if self._in_json_ld:
+            self.view.json_ld[-1] = (self.view.json_ld[-1] or "") + s
+            return
+        if self._script is not None:
+            self._script.append(s)
+            return
+        if self._hidden:
+            return
+        s = s.strip()
+        if s:
+            self._texts.append(s)
+            for c in self._active:
+                c.add(s)
+
+    def breadcrumbs_so_far(self) -> Iterator[Tuple[bool, Optional[str]]]:
+        """(închis, text lowercase) pentru breadcrumb-urile văzute până acum, în ordine."""
+        for c in self._crumbs:
+            text = c.text()
+            yield c not in self._active, text.lower() if text is not None else None
+
+    def finish(self) -> PageView:
+        view = self.view
+        view.title = self._title.text() if self._title is not None else ""
+        view.h1 = [c.text() for c in self._h1]
+        view.breadcrumbs = [t.lower() for t in (c.text() for c in self._crumbs) if t is not None]
+        view.text = " ".join(self._texts)
+        if self._description is not None:
+            view.description = " ".join(self._description.parts)
+        if self._ad_title is not None:
+            view.ad_title = " ".join(self._ad_title.parts)
+        if self._price is not None:
+            view.price = " ".join(self._price.parts)
+        return view
+
+# -------- backend-uri HTML --------
+
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+def _decode_html(content) -> str:
+    """Decodează pagina după charset-ul declarat (implicit UTF-8)."""
+    if isinstance(content, str):
+        return content
+    m = _CHARSET_RE.search(content, 0, 4096)
+    enc = m.group(1).decode("ascii").lower() if m else "utf-8"
+    if enc in ("utf-8", "utf8"):
+        enc = "utf-8-sig"
+    try:
+        return content.decode(enc, errors="replace")
+    except LookupError:
+        return content.decode("utf-8-sig", errors="replace")
+
+def _walk_html_parser(html: str, b) -> None:
+    from bs4 import BeautifulSoup, CData, NavigableString, Tag
+    from bs4.element import Script, Stylesheet
+
+    # stringurile bs4 cu conținut (fără comentarii, doctype etc.)
+    string_types = (NavigableString, CData, Script, Stylesheet)
+    soup = BeautifulSoup(html, "html.parser")
+    stack = [iter(soup.contents)]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            if stack:
+                b.end()
+        elif isinstance(node, Tag):
+            b.start(node.name, node.attrs)
+            stack.append(iter(node.contents))
+        elif type(node) in string_types:
+            b.text(node)
+
+def _walk_lxml(html: str, b) -> None:
+    from lxml import etree
+
+    root = etree.fromstring(html.encode("utf-8"), etree.HTMLParser(encoding="utf-8"))
+    if root is None:
+        return
+    b.start(root.tag, root.attrib)
+    if root.text:
+        b.text(root.text)
+    stack = [(iter(root), root)]
+    while stack:
+        el = next(stack[-1][0], None)
+        if el is None:
+            _, closed = stack.pop()
+            b.end()
+            if stack and closed.tail:
+                b.text(closed.tail)
+        elif isinstance(el.tag, str):
+            b.start(el.tag, el.attrib)
+            if el.text:
+                b.text(el.text)
+            stack.append((iter(el), el))
+        elif el.tail:
+            # comentarii / processing instructions: doar coada e text
+            b.text(el.tail)
+
+def _walk_selectolax(html: str, b) -> None:
+    from selectolax.lexbor import LexborHTMLParser
+
+    root = LexborHTMLParser(html).root
+    if root is None:
+        return
+    b.start(root.tag, root.attributes)
+    stack = [root.child]
+    while stack:
+        node = stack[-1]
+        if node is None:
+            stack.pop()
+            b.end()
+            continue
+        stack[-1] = node.next
+        tag = node.tag
+        if tag == "-text":
+            b.text(node.text_content or "")
+        elif tag[0] not in "-#!":
+            b.start(tag, node.attributes)
+            stack.append(node.child)
+
+# backend -> (modul necesar, funcție de parcurgere); ordinea = preferința implicită.
+# Funcția de parcurgere trimite evenimente start(name, attrs) / text(s) / end() unui builder.
+HTML_BACKENDS = {
+    "selectolax": ("selectolax", _walk_selectolax),
+    "lxml": ("lxml", _walk_lxml),
+    "html.parser": ("bs4", _walk_html_parser),
+}
+
+def available_backends() -> List[str]:
+    """Backend-urile HTML instalate, de la cel mai rapid la cel mai lent."""
+    return [name for name, (module, _) in HTML_BACKENDS.items() if importlib.util.find_spec(module)]
+
+def default_backend() -> str:
+    backends = available_backends()
+    return backends[0] if backends else "html.parser"
+
+class _StreamTarget:
+    """Țintă pentru parserul lxml cu `feed`: evenimentele ajung direct la builder.
+
+    Textul unui nod poate sosi în mai multe bucăți (după cum vin octeții); e trimis
+    builder-ului întreg, la următorul tag, ca în parcurgerea arborelui complet.
+    """
+
+    def __init__(self, builder: _PageViewBuilder):
+        self.builder = builder
+        self._text: List[str] = []
+
+    def _flush(self) -> None:
+        if self._text:
+            self.builder.text("".join(self._text))
+            self._text = []
+
+    def start(self, tag, attrib) -> None:
+        self._flush()
+        self.builder.start(tag, attrib)
+
+    def end(self, tag) -> None:
+        self._flush()
+        self.builder.end()
+
+    def data(self, data) -> None:
+        self._text.append(data)
+
+    def close(self) -> None:
+        self._flush()
+
+class IncrementalPageParser:
+    """Parsează o pagină pe măsură ce sosesc octeții (lxml), spre un _PageViewBuilder.
+
+    Evenimentele sunt aceleași ca la backend-ul "lxml" pe pagina întreagă, deci
+    builder-ul vede în orice moment prefixul deja primit al paginii.
+    """
+
+    # charset-ul se caută în aceiași primi octeți ca în _decode_html
+    SNIFF_BYTES = 4096
+
+    def __init__(self, builder: _PageViewBuilder):
+        from lxml import etree
+
+        self.target = _StreamTarget(builder)
+        self._parser = etree.HTMLParser(encoding="utf-8", target=self.target)
+        self._head = bytearray()
+        self._decoder = None
+
+    def _start_decoder(self) -> None:
+        head = bytes(self._head)
+        m = _CHARSET_RE.search(head, 0, self.SNIFF_BYTES)
+        enc = m.group(1).decode("ascii").lower() if m else "utf-8"
+        if enc in ("utf-8", "utf8"):
+            enc = "utf-8-sig"
+        try:
+            self._decoder = codecs.getincrementaldecoder(enc)(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._head = bytearray()
+        self._feed_text(self._decoder.decode(head))
+
+    def _feed_text(self, text: str) -> None:
+        if text:
+            self._parser.feed(text.encode("utf-8"))
+
+    def feed(self, chunk: bytes) -> None:
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head) >= self.SNIFF_BYTES:
+                self._start_decoder()
+        else:
+            self._feed_text(self._decoder.decode(chunk))
+
+    def close(self) -> None:
+        """Pagina s-a terminat: golește parserul (tag-urile rămase deschise se închid)."""
+        if self._decoder is None:
+            self._start_decoder()
+        self._feed_text(self._decoder.decode(b"", final=True))
+        from lxml import etree
+
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            # pagină goală: builder-ul rămâne cu ce a primit
+            pass
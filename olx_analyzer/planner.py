@@ -0,0 +1,302 @@
+"""Planificarea căutărilor pentru un lot de anunțuri de referință: o singură acoperire per segment."""
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import CarSpecs, listing_id
+from .query import SearchQuery
+from .search import SearchCrawler
+from .store import ListingStore, find_comparables
+
+# (căutări) -> [(rezultatele, a ajuns la capăt)], în aceeași ordine
+CrawlMany = Callable[[List[SearchQuery]], Iterable[Tuple[List[CarSpecs], bool]]]
+
+class SearchPlanner:
+    """Acoperă căutările unui lot de anunțuri cu celule de căutare comune fiecărui segment.
+
+    Un segment are aceleași filtre fixe (marcă, model, caroserie, combustibil, cutie, stare,
+    putere, motor): cardurile din rezultate nu au putere și motor, iar combustibilul, cutia
+    și starea vin din filtre doar când au o singură valoare, deci un anunț găsit de o căutare
+    lărgită pe acestea n-ar mai putea fi atribuit (SearchQuery.answers).
+
+    Planul nu depinde de numărul de anunțuri: cutia an × km care cuprinde căutările unui
+    segment se împarte în jumătăți (de fiecare dată axa cea mai lungă față de SCALE) până
+    când fiecare celulă are cel mult `fill` × `max_pages` pagini de rezultate estimate; se
+    păstrează doar celulele care intersectează căutarea vreunui anunț, iar într-o celulă cu
+    căutări puține și depărtate se caută doar partea fiecăreia. Fiecare anunț primește
+    rezultatele celulelor pe care le intersectează (fan_out), deci cererile cresc cu paginile
+    segmentului, nu cu numărul de anunțuri. Ce au căutat loturile anterioare (ListingStore)
+    se răspunde local; se caută doar restul cutiei.
+
+    Costul unei celule e estimat în pagini din densitatea segmentului (anunțuri pe an × km),
+    învățată din căutările făcute (observe); un segment încă necăutat are densitatea celor
+    căutate, iar la început o pagină pe `page_volume` ani × km, cât o căutare cu toleranțele
+    implicite. run caută întâi o singură celulă din fiecare segment nou, ca restul să fie
+    planificat cu densitatea lui. O celulă care totuși nu ajunge la capăt (limita de pagini
+    a crawler-ului) se împarte din nou și se caută pe jumătăți.
+    """
+
+    MERGED_FIELDS = ("year", "km")
+    PAGE_SIZE = 40          # anunțuri pe o pagină de rezultate OLX
+    # anii și kilometrii posibili ai unui anunț
+    YEARS = (1900, 2100)
+    KMS = (0, 10_000_000)
+    # mărimea unei căutări cu toleranțele implicite pe fiecare axă
+    SCALE = {"year": 5, "km": 60001}
+
+    def __init__(self, max_pages: int = 5, page_volume: float = 5 * 60001, fill: float = 0.8):
+        self.max_pages = max_pages
+        self.page_volume = page_volume
+        self.fill = fill
+        # segment -> (anunțuri găsite, volumul an × km căutat); None: toate segmentele
+        self._observed: Dict[Optional[SearchQuery], Tuple[float, float]] = {}
+
+    @classmethod
+    def _key(cls, query: SearchQuery) -> SearchQuery:
+        """Filtrele care trebuie să fie identice pentru a împărți o celulă."""
+        return replace(query, **{name: None for name in cls.MERGED_FIELDS})
+
+    @classmethod
+    def _volume(cls, query: SearchQuery) -> float:
+        volume = 1.0
+        for name in cls.MERGED_FIELDS:
+            bounds = getattr(query, name)
+            if bounds is None:
+                return float("inf")
+            volume *= bounds[1] - bounds[0] + 1
+        return volume
+
+    @classmethod
+    def _intersects(cls, cell: SearchQuery, query: SearchQuery) -> bool:
+        for name in cls.MERGED_FIELDS:
+            a, b = getattr(cell, name), getattr(query, name)
+            if a is not None and b is not None and (b[1] < a[0] or b[0] > a[1]):
+                return False
+        return True
+
+    def observe(self, query: SearchQuery, found: int) -> None:
+        """Înregistrează câte anunțuri a găsit o căutare (pentru o căutare neterminată, cele găsite până la limită)."""
+        volume = self._volume(query)
+        if volume == float("inf"):
+            return
+        for key in (self._key(query), None):
+            listings, searched = self._observed.get(key, (0.0, 0.0))
+            self._observed[key] = (listings + found, searched + volume)
+
+    def pages(self, query: SearchQuery) -> float:
+        """Costul estimat al căutării, în pagini de rezultate (cel puțin una)."""
+        # un segment încă necăutat are densitatea celor căutate (la început, o pagină pe
+        # `page_volume`); ea contează cât o zecime de căutare: prima căutare a segmentului o înlocuiește
+        listings, searched = self._observed.get(None, (0.0, 0.0))
+        prior = (listings + 0.1 * self.PAGE_SIZE) / (searched + 0.1 * self.page_volume)
+        listings, searched = self._observed.get(self._key(query), (0.0, 0.0))
+        density = (listings + prior * 0.1 * self.page_volume) / (searched + 0.1 * self.page_volume)
+        return max(1.0, self._volume(query) * density / self.PAGE_SIZE)
+
+    def split(self, cell: SearchQuery) -> List[SearchQuery]:
+        """Cele două jumătăți ale celulei, pe axa cea mai lungă față de SCALE; [] dacă nu se mai poate împărți."""
+        axes = [
+            name for name in self.MERGED_FIELDS
+            if getattr(cell, name) is not None and getattr(cell, name)[1] > getattr(cell, name)[0]
+        ]
+        if not axes:
+            return []
+        name = max(axes, key=lambda n: (getattr(cell, n)[1] - getattr(cell, n)[0] + 1) / self.SCALE[n])
+        lo, hi = getattr(cell, name)
+        mid = lo + (hi - lo + 1) // 2 - 1
+        return [replace(cell, **{name: (lo, mid)}), replace(cell, **{name: (mid + 1, hi)})]
+
+    def plan(
+        self,
+        queries: Sequence[SearchQuery],
+        store: Optional[ListingStore] = None,
+        max_age: Optional[float] = None,
+    ) -> List[Tuple[SearchQuery, List[int]]]:
+        """[(celula de căutat, indicii căutărilor din `queries` care o intersectează)].
+
+        Un indice poate apărea în mai multe celule. Cu `store`, căutările acoperite deja de o
+        căutare salvată nu intră în plan (find_comparables le răspunde local), iar părțile
+        cutiei unui segment acoperite de căutări salvate intră ca celule răspunse local.
+        """
+        segments: Dict[SearchQuery, List[int]] = {}
+        unbounded: Dict[SearchQuery, List[int]] = {}
+        for i, query in enumerate(queries):
+            if store is not None and store.covering_search(query, max_age) is not None:
+                continue
+            if any(getattr(query, name) is None for name in self.MERGED_FIELDS):
+                # fără an sau km, căutarea nu are o cutie an × km: se face ca atare
+                unbounded.setdefault(query, []).append(i)
+            else:
+                segments.setdefault(self._key(query), []).append(i)
+        plan = list(unbounded.items())
+        recent: Dict[str, List[SearchQuery]] = {}
+        for key, members in segments.items():
+            if store is not None and key.brand not in recent:
+                recent[key.brand] = store.recent_searches(key.brand, max_age)
+            # cutia an × km a segmentului; ce au căutat deja loturile anterioare se răspunde local
+            need = self._clip(replace(key, year=self.YEARS, km=self.KMS), [queries[i] for i in members])
+            known = [
+                self._clip(need, [s]) for s in recent.get(key.brand, ())
+                if s.year is not None and s.km is not None and self._intersects(need, s)
+                and s.answers(self._clip(need, [s]))
+            ]
+            missing = self._uncovered(need, known)
+            if missing and sum(self.pages(box) for box in missing) >= self.pages(need):
+                known, missing = [], [need]
+            for box in known:
+                inside = [i for i in members if self._intersects(box, queries[i])]
+                if inside:
+                    plan.append((box, inside))
+            for box in missing:
+                self._tile(box, members, queries, plan)
+        plan.sort(key=lambda entry: min(entry[1]))
+        return plan
+
+    def _tile(
+        self,
+        cell: SearchQuery,
+        members: List[int],
+        queries: Sequence[SearchQuery],
+        plan: List[Tuple[SearchQuery, List[int]]],
+    ) -> None:
+        members = [i for i in members if self._intersects(cell, queries[i])]
+        if not members:
+            return
+        halves = self.split(cell)
+        if not halves or self.pages(cell) <= self.fill * self.max_pages:
+            # căutări puține și depărtate: mai ieftin fiecare pe partea ei din celulă
+            boxes = list(dict.fromkeys(self._clip(cell, [queries[i]]) for i in members))
+            if sum(self.pages(box) for box in boxes) >= self.pages(cell):
+                boxes = [cell]
+            for box in boxes:
+                plan.append((box, [i for i in members if self._intersects(box, queries[i])]))
+            return
+        for half in halves:
+            self._tile(half, members, queries, plan)
+
+    @classmethod
+    def _clip(cls, cell: SearchQuery, boxes: Sequence[SearchQuery]) -> SearchQuery:
+        """Celula restrânsă la cutia an × km care cuprinde `boxes`."""
+        return replace(cell, **{
+            name: (
+                max(getattr(cell, name)[0], min(getattr(box, name)[0] for box in boxes)),
+                min(getattr(cell, name)[1], max(getattr(box, name)[1] for box in boxes)),
+            )
+            for name in cls.MERGED_FIELDS
+        })
+
+    @classmethod
+    def _uncovered(cls, cell: SearchQuery, boxes: Sequence[SearchQuery]) -> List[SearchQuery]:
+        """Partea celulei din afara cutiilor `boxes`, ca dreptunghiuri an × km ([] dacă o acoperă)."""
+        edges = {}
+        for name in cls.MERGED_FIELDS:
+            lo, hi = getattr(cell, name)
+            cuts = {lo, hi + 1}
+            for box in boxes:
+                cuts.update(min(max(bound, lo), hi + 1) for bound in (getattr(box, name)[0], getattr(box, name)[1] + 1))
+            cuts = sorted(cuts)
+            edges[name] = [(a, b - 1) for a, b in zip(cuts, cuts[1:])]
+
+        def inside(span, bounds):
+            return bounds[0] <= span[0] and span[1] <= bounds[1]
+
+        # pe fiecare fâșie de ani, intervalele de km neacoperite; fâșiile vecine identice se unesc
+        rows: List[Tuple[Tuple[int, int], List[Tuple[int, int]]]] = []
+        for years in edges["year"]:
+            runs: List[Tuple[int, int]] = []
+            for kms in edges["km"]:
+                if any(inside(years, box.year) and inside(kms, box.km) for box in boxes):
+                    continue
+                if runs and runs[-1][1] + 1 == kms[0]:
+                    runs[-1] = (runs[-1][0], kms[1])
+                else:
+                    runs.append(kms)
+            if rows and rows[-1][1] == runs and rows[-1][0][1] + 1 == years[0]:
+                rows[-1] = ((rows[-1][0][0], years[1]), runs)
+            elif runs:
+                rows.append((years, runs))
+        return [replace(cell, year=years, km=kms) for years, runs in rows for kms in runs]
+
+    def run(
+        self,
+        queries: Sequence[SearchQuery],
+        crawl_many: CrawlMany,
+        store: Optional[ListingStore] = None,
+        max_age: Optional[float] = None,
+        exclude: Optional[Sequence[Iterable[str]]] = None,
+    ) -> Dict[int, List[CarSpecs]]:
+        """{indice: rezultatele lui queries[i]} pentru căutările acoperite complet de celulele căutate.
+
+        crawl_many caută o listă de celule (ex. în paralel, cu crawl). O celulă neterminată se
+        caută din nou pe jumătăți, dacă a citit măcar o pagină; căutările care rămân fără răspuns
+        lipsesc din rezultat și se fac separat (find_comparables). exclude: link-urile de exclus
+        pentru fiecare căutare.
+        """
+        if store is not None:
+            # din fiecare segment încă necăutat, întâi o singură celulă: planul se face apoi cu
+            # densitatea lui, iar celula căutată se răspunde local (ListingStore)
+            probes: Dict[SearchQuery, Tuple[SearchQuery, List[int]]] = {}
+            for cell, members in self.plan(queries, store, max_age):
+                key = self._key(cell)
+                if key not in self._observed and self._volume(cell) != float("inf"):
+                    if key not in probes or len(members) > len(probes[key][1]):
+                        probes[key] = (cell, members)
+            self._search(list(probes.values()), crawl_many, queries, exclude)
+        return self._search(self.plan(queries, store, max_age), crawl_many, queries, exclude)
+
+    def _search(
+        self,
+        pending: List[Tuple[SearchQuery, List[int]]],
+        crawl_many: CrawlMany,
+        queries: Sequence[SearchQuery],
+        exclude: Optional[Sequence[Iterable[str]]],
+    ) -> Dict[int, List[CarSpecs]]:
+        found: Dict[int, Dict[str, CarSpecs]] = {}
+        failed = set()
+        while pending:
+            retry: List[Tuple[SearchQuery, List[int]]] = []
+            for (cell, members), (results, complete) in zip(pending, crawl_many([cell for cell, _ in pending])):
+                if not complete and not results:
+                    # nicio pagină citită (eroare, offline fără cache): pe jumătăți ar eșua la fel,
+                    # iar densitatea segmentului nu se învață dintr-o căutare care n-a avut loc
+                    failed.update(members)
+                    continue
+                self.observe(cell, len(results))
+                if not complete:
+                    halves = self.split(cell)
+                    for half in halves:
+                        inside = [i for i in members if self._intersects(half, queries[i])]
+                        if inside:
+                            retry.append((half, inside))
+                    if halves:
+                        continue
+                    # nu se mai poate împărți: e bună doar pentru căutarea care e chiar această celulă
+                    failed.update(i for i in members if queries[i] != cell)
+                for i in members:
+                    excluded = exclude[i] if exclude is not None else ()
+                    cars = found.setdefault(i, {})
+                    for car in self.fan_out(cell, queries[i], results, excluded):
+                        cars.setdefault(listing_id(car.link), car)
+            pending = retry
+        return {i: list(cars.values()) for i, cars in sorted(found.items()) if i not in failed}
+
+    @staticmethod
+    def crawl(
+        crawler: SearchCrawler,
+        store: ListingStore,
+        cover: SearchQuery,
+        max_age: Optional[float] = None,
+    ) -> Tuple[List[CarSpecs], bool]:
+        """(rezultatele celulei, a ajuns la capăt); o celulă acoperită de o căutare salvată se răspunde local."""
+        found = list(find_comparables(crawler, store, cover, max_age=max_age))
+        return found, store.covering_search(cover, max_age) is not None
+
+    @staticmethod
+    def fan_out(cover: SearchQuery, query: SearchQuery, found: Iterable[CarSpecs], exclude: Iterable[str] = ()) -> List[CarSpecs]:
+        """Rezultatele căutării `cover` care trec filtrele lui `query`.
+
+        Un câmp necunoscut al anunțului (ex. puterea, lipsă din cardurile de rezultate) trece
+        filtrul dacă OLX l-a aplicat deja, adică dacă `cover` are exact același filtru.
+        """
+        excluded = {listing_id(u) for u in exclude}
+        lenient = query.enforced_by(cover)
+        return [car for car in found if listing_id(car.link) not in excluded and query.matches(car, lenient)]
@@ -0,0 +1,218 @@
+"""SearchQuery și URL-urile de căutare OLX."""
+import json
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from .brands import BRAND_CATALOGUE
+from .models import CarSpecs
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """Filtrele unei căutări OLX: marcă/model fixe, intervale numerice închise și liste de valori
+    acceptate (listă goală = orice valoare)."""
+    brand: str
+    model: Optional[str] = None
+    body: Optional[str] = None
+    year: Optional[Tuple[int, int]] = None
+    km: Optional[Tuple[int, int]] = None
+    power: Optional[Tuple[int, int]] = None
+    engine_size: Optional[Tuple[int, int]] = None
+    fuels: Tuple[str, ...] = ()
+    gearboxes: Tuple[str, ...] = ()
+    states: Tuple[str, ...] = ()
+
+    RANGE_FIELDS = ("year", "km", "power", "engine_size")
+    # câmp CarSpecs -> filtrul de tip listă
+    ENUM_FIELDS = (("fuel", "fuels"), ("gearbox", "gearboxes"), ("state", "states"))
+    # câmpurile CarSpecs care pot lipsi din cardurile de rezultate (an, km și prețul sunt obligatorii)
+    CARD_OPTIONAL = ("power", "engine_size", "fuel", "gearbox", "state")
+
+    @classmethod
+    def from_car(cls, car: CarSpecs, tolerances: Dict) -> "SearchQuery":
+        """Filtrele pentru anunțuri similare cu `car`, în limitele toleranțelor"""
+        year = km = power = engine_size = None
+        if car.year > 0:
+            year = (max(2000, car.year - tolerances['years']), min(2025, car.year + tolerances['years']))
+        if car.km > 0:
+            km = (max(0, car.km - tolerances['km']), car.km + tolerances['km'])
+        if car.power and tolerances.get('power'):
+            power = (max(50, car.power - tolerances['power']), car.power + tolerances['power'])
+        if tolerances.get('engine_min') and tolerances.get('engine_max'):
+            engine_size = (tolerances['engine_min'], tolerances['engine_max'])
+        return cls(
+            brand=car.brand,
+            model=car.model if car.model != 'Unknown' else None,
+            body=car.body if car.body != 'Unknown' else None,
+            year=year,
+            km=km,
+            power=power,
+            engine_size=engine_size,
+            fuels=tuple(tolerances.get('fuel_types') or ()),
+            gearboxes=tuple(tolerances.get('gearbox_types') or ()),
+            states=tuple(tolerances.get('state_types') or ()),
+        )
+
+    @classmethod
+    def similar_to(cls, car: CarSpecs, years: int = 2, km: int = 30000, power: int = 20, engine: int = 300) -> "SearchQuery":
+        """Căutarea anunțurilor similare din batch.py și watch.py: toleranțele ca în interfață,
+        dar centrate pe anunț (motor ± `engine` cm³, același combustibil, cutie și stare)."""
+        tolerances = {"years": years, "km": km, "power": power}
+        if car.engine_size:
+            tolerances["engine_min"] = max(0, car.engine_size - engine)
+            tolerances["engine_max"] = car.engine_size + engine
+        for key, value in (("fuel_types", car.fuel), ("gearbox_types", car.gearbox), ("state_types", car.state)):
+            if value != "Unknown":
+                tolerances[key] = [value]
+        return cls.from_car(car, tolerances)
+
+    def defaults(self) -> Dict:
+        """Câmpurile pe care filtrele le fixează pentru toate rezultatele"""
+        fields = {"brand": self.brand}
+        if self.model:
+            fields["model"] = self.model
+        if self.body:
+            fields["body"] = self.body
+        for key, attr in self.ENUM_FIELDS:
+            values = getattr(self, attr)
+            if len(values) == 1:
+                fields[key] = values[0]
+        return fields
+
+    def covers(self, other: "SearchQuery") -> bool:
+        """True dacă orice anunț găsit de `other` e găsit și de această căutare."""
+        if (self.brand, self.model, self.body) != (other.brand, other.model, other.body):
+            return False
+        for name in self.RANGE_FIELDS:
+            mine, theirs = getattr(self, name), getattr(other, name)
+            if mine is not None and (theirs is None or theirs[0] < mine[0] or theirs[1] > mine[1]):
+                return False
+        for _, attr in self.ENUM_FIELDS:
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            if mine and (not theirs or not set(theirs) <= set(mine)):
+                return False
+        return True
+
+    def _filter(self, column: str):
+        """Filtrul pe câmpul CarSpecs `column` (interval sau listă de valori)."""
+        return getattr(self, dict(self.ENUM_FIELDS).get(column, column))
+
+    def answers(self, other: "SearchQuery") -> bool:
+        """True dacă rezultatele acestei căutări, filtrate local, sunt exact rezultatele lui `other`.
+
+        Trebuie să o acopere și să aibă aceleași filtre pe câmpurile care pot lipsi din cardurile
+        de rezultate: un anunț fără putere a trecut filtrul de putere al lui OLX, dar local nu se
+        mai poate ști dacă trece unul mai strâmt.
+        """
+        return self.covers(other) and all(self._filter(c) == other._filter(c) for c in self.CARD_OPTIONAL)
+
+    def enforced_by(self, source: "SearchQuery") -> Tuple[str, ...]:
+        """Câmpurile CarSpecs pe care `source` le-a filtrat pe OLX exact ca această căutare:
+        pentru ele, un anunț găsit de `source` fără valoare trece filtrul."""
+        return tuple(
+            column for column in (*self.RANGE_FIELDS, *dict(self.ENUM_FIELDS))
+            if self._filter(column) and self._filter(column) == source._filter(column)
+        )
+
+    def matches(self, car: CarSpecs, lenient: Iterable[str] = ()) -> bool:
+        """True dacă anunțul trece filtrele căutării (aceeași semantică ca ListingStore.query).
+
+        lenient: câmpuri pentru care o valoare necunoscută trece (vezi enforced_by).
+        """
+        lenient = set(lenient)
+        if car.brand != self.brand:
+            return False
+        if self.model and (car.model or "").lower() != self.model.lower():
+            return False
+        if self.body and car.body != self.body:
+            return False
+        for name in self.RANGE_FIELDS:
+            bounds, value = getattr(self, name), getattr(car, name) or 0
+            if bounds is not None and not (bounds[0] <= value <= bounds[1] if value > 0 else name in lenient):
+                return False
+        for column, attr in self.ENUM_FIELDS:
+            values, value = getattr(self, attr), getattr(car, column)
+            if values and not (value in values if value not in (None, "Unknown") else column in lenient):
+                return False
+        return True
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "SearchQuery":
+        data = json.loads(raw)
+        for name in cls.RANGE_FIELDS:
+            if data.get(name) is not None:
+                data[name] = tuple(data[name])
+        for _, attr in cls.ENUM_FIELDS:
+            data[attr] = tuple(data.get(attr) or ())
+        return cls(**data)
+
+class URLBuilder:
+    """Construiește URL-uri pentru căutări OLX"""
+    
+    BRAND_SLUGS = BRAND_CATALOGUE.slugs
+    
+    @classmethod
+    def build_search_url(cls, car: CarSpecs, tolerances: Dict) -> str:
+        """Construiește URL-ul de căutare pe baza specificațiilor și toleranțelor"""
+        return cls.build_query_url(SearchQuery.from_car(car, tolerances))
+
+    @classmethod
+    def build_query_url(cls, query: SearchQuery) -> str:
+        """Construiește URL-ul de căutare pentru un set de filtre"""
+        
+        brand_slug = BRAND_CATALOGUE.slug(query.brand)
+        base_url = f"https://www.olx.ro/auto-masini-moto-ambarcatiuni/autoturisme/{brand_slug}/"
+        
+        params = []
+        params.append("currency=EUR")
+        params.append("search%5Bprivate_business%5D=private")
+        
+        # Model
+        if query.model:
+            model_slug = query.model.lower().replace(' ', '-')
+            params.append(f"search%5Bfilter_enum_model%5D%5B0%5D={model_slug}")
+        
+        # An
+        if query.year:
+            params.append(f"search%5Bfilter_float_year%3Afrom%5D={query.year[0]}")
+            params.append(f"search%5Bfilter_float_year%3Ato%5D={query.year[1]}")
+        
+        # Kilometri
+        if query.km:
+            params.append(f"search%5Bfilter_float_rulaj_pana%3Afrom%5D={query.km[0]}")
+            params.append(f"search%5Bfilter_float_rulaj_pana%3Ato%5D={query.km[1]}")
+        
+        # Putere
+        if query.power:
+            params.append(f"search%5Bfilter_float_engine_power%3Afrom%5D={query.power[0]}")
+            params.append(f"search%5Bfilter_float_engine_power%3Ato%5D={query.power[1]}")
+        
+        # Capacitate motor
+        if query.engine_size:
+            params.append(f"search%5Bfilter_float_enginesize%3Afrom%5D={query.engine_size[0]}")
+            params.append(f"search%5Bfilter_float_enginesize%3Ato%5D={query.engine_size[1]}")
+        
+        # Combustibil
+        for i, fuel in enumerate(query.fuels):
+            params.append(f"search%5Bfilter_enum_petrol%5D%5B{i}%5D={fuel}")
+        
+        # Caroserie
+        if query.body:
+            params.append(f"search%5Bfilter_enum_car_body%5D%5B0%5D={query.body}")
+        
+        # Cutie
+        for i, gearbox in enumerate(query.gearboxes):
+            params.append(f"search%5Bfilter_enum_gearbox%5D%5B{i}%5D={gearbox}")
+        
+        # Stare
+        for i, state in enumerate(query.states):
+            params.append(f"search%5Bfilter_enum_state%5D%5B{i}%5D={state}")
+        
+        return f"{base_url}?{'&'.join(params)}"
+
+    @classmethod
+    def query_defaults(cls, car: CarSpecs, tolerances: Dict) -> Dict:
+        """Câmpurile pe care filtrele căutării le fixează pentru toate rezultatele"""
+        return SearchQuery.from_car(car, tolerances).defaults()
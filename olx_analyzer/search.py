@@ -0,0 +1,213 @@
+"""SearchCrawler: parcurgerea paginilor de rezultate OLX."""
+import re
+from dataclasses import asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from .extractor import OLXExtractorFixed
+from .models import CarSpecs, car_from_fields, listing_id
+from .page import _HIDDEN_TAGS
+from .specs import _PRICE_RE
+from .structured import _decode_prerendered_state, _fields_from_olx_ad
+
+# elementul cu parametrii cardului: "2016 - 185.000 km", uneori doar anul sau doar km-ii
+_CARD_PARAMS_RE = re.compile(r"(?:(19[89]\d|20[0-4]\d)\s*(?:-\s*)?)?(?:(\d[\d\s\.,]*?)\s*km)?", re.I)
+
+class _SearchPageBuilder:
+    """Colectează cardurile de anunț și starea JSON dintr-o pagină de rezultate OLX."""
+
+    def __init__(self):
+        self.cards: List[Dict] = []
+        self.state_script: Optional[str] = None
+        self.has_next = False
+        self._stack: List[Optional[str]] = []   # ce a deschis fiecare tag
+        self._card: Optional[Dict] = None
+        self._field: Optional[str] = None
+        self._script: Optional[List[str]] = None
+        self._hidden = 0
+
+    def start(self, name: str, attrs) -> None:
+        opened = None
+        if name == "script":
+            self._script = []
+            opened = "script"
+        elif name in _HIDDEN_TAGS:
+            self._hidden += 1
+            opened = "hidden"
+        elif self._card is None:
+            if attrs.get("data-cy") == "l-card":
+                self._card = {"id": attrs.get("id"), "href": None, "title": [], "price": [], "texts": []}
+                opened = "card"
+        else:
+            if name == "a" and self._card["href"] is None and attrs.get("href"):
+                self._card["href"] = attrs["href"]
+            if attrs.get("data-testid") == "ad-price":
+                self._field = opened = "price"
+            elif name in ("h4", "h6") and not self._card["title"]:
+                self._field = opened = "title"
+        if attrs.get("data-testid") == "pagination-forward":
+            self.has_next = True
+        self._stack.append(opened)
+
+    def end(self) -> None:
+        opened = self._stack.pop()
+        if opened == "script":
+            text = "".join(self._script)
+            if "__PRERENDERED_STATE__" in text:
+                self.state_script = text
+            self._script = None
+        elif opened == "hidden":
+            self._hidden -= 1
+        elif opened == "card":
+            self.cards.append(self._card)
+            self._card = None
+        elif opened in ("price", "title"):
+            self._field = None
+
+    def text(self, s: str) -> None:
+        if self._script is not None:
+            self._script.append(s)
+            return
+        if self._hidden or self._card is None:
+            return
+        s = s.strip()
+        if s:
+            # textele din afara titlului și a prețului: parametrii, locația, data
+            self._card[self._field or "texts"].append(s)
+
+class SearchCrawler:
+    """Parcurge paginile de rezultate OLX și produce anunțurile comparabile pe măsură ce sosesc.
+
+    Câmpurile se iau direct din pagina de rezultate (stare JSON, altfel cardurile HTML);
+    pagina completă a anunțului se descarcă doar pentru cardurile cărora le lipsesc
+    câmpurile obligatorii.
+    """
+
+    REQUIRED_FIELDS = ("price", "year", "km")
+
+    def __init__(self, extractor: OLXExtractorFixed, max_pages: int = 5):
+        self.extractor = extractor
+        self.max_pages = max_pages
+        # True dacă ultima parcurgere a ajuns la capătul rezultatelor
+        self.last_crawl_complete = False
+
+    @staticmethod
+    def page_url(search_url: str, page: int) -> str:
+        """URL-ul paginii `page` (1 = URL-ul original)."""
+        if page <= 1:
+            return search_url
+        parts = urlsplit(search_url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "page"]
+        query.append(("page", str(page)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def _card_fields(self, card: Dict) -> Dict:
+        fields: Dict[str, object] = {}
+        if card["title"]:
+            fields["title"] = " ".join(card["title"])
+        m = _PRICE_RE.search(self.extractor.normalize_numeric_text(" ".join(card["price"])))
+        if m:
+            num = self.extractor.extract_number_from_text(m.group(1))
+            if num:
+                cur = "EUR" if m.group(2).lower() in ("€", "eur", "euro") else "LEI"
+                fields["price"] = float(num)
+                fields["price_text"] = f"{num:,} {cur}".replace(",", " ")
+        # doar din elementul de parametri: un an din titlu sau din data anunțului nu contează
+        for text in card["texts"]:
+            m = _CARD_PARAMS_RE.fullmatch(self.extractor.normalize_numeric_text(text))
+            if m is None:
+                continue
+            if m.group(1):
+                fields.setdefault("year", int(m.group(1)))
+            if m.group(2):
+                km = self.extractor.extract_number_from_text(m.group(2))
+                if km is not None and km <= 1_500_000:
+                    fields.setdefault("km", km)
+        return fields
+
+    def parse_search_page(self, content, page_url: str) -> Tuple[List[Tuple[str, Dict]], bool]:
+        """Întoarce ([(link, câmpuri)], există pagina următoare)."""
+        builder = _SearchPageBuilder()
+        self.extractor.walk_html(content, builder)
+
+        state = _decode_prerendered_state(builder.state_script)
+        listing = ((state or {}).get("listing") or {}).get("listing") or {}
+        ads = listing.get("ads")
+        if ads:
+            results = [(urljoin(page_url, ad.get("url") or ""), _fields_from_olx_ad(ad)) for ad in ads if ad.get("url")]
+            page = int(dict(parse_qsl(urlsplit(page_url).query)).get("page", 1))
+            total = listing.get("totalPages")
+            has_next = page < int(total) if total else builder.has_next
+            return results, has_next
+
+        results = [(urljoin(page_url, c["href"]), self._card_fields(c)) for c in builder.cards if c["href"]]
+        return results, builder.has_next
+
+    def iter_results(self, search_url: str, exclude: Iterable[str] = ()) -> Iterator[List[Tuple[str, Dict]]]:
+        """Produce, pagină cu pagină, anunțurile nevăzute încă: [(link, câmpuri din card)].
+
+        Nu descarcă paginile anunțurilor; vezi complete_results.
+        """
+        seen = {listing_id(u) for u in exclude}
+        self.last_crawl_complete = False
+        for page in range(1, self.max_pages + 1):
+            url = self.page_url(search_url, page)
+            content = self.extractor.fetch_page(url)
+            if content is None:
+                return
+            results, has_next = self.parse_search_page(content, url)
+
+            fresh = []
+            for link, fields in results:
+                lid = listing_id(link)
+                if lid in seen:
+                    continue
+                seen.add(lid)
+                fresh.append((link, fields))
+            yield fresh
+
+            # OLX repetă ultima pagină dincolo de capăt
+            if not has_next or not fresh:
+                self.last_crawl_complete = True
+                return
+
+    def complete_results(self, results: Iterable[Tuple[str, Dict]], defaults: Optional[Dict] = None) -> Iterator[CarSpecs]:
+        """CarSpecs pentru rezultate; pagina anunțului se descarcă doar dacă lipsesc câmpuri obligatorii."""
+        defaults = defaults or {}
+        incomplete = []
+        for link, fields in results:
+            if all(fields.get(k) for k in self.REQUIRED_FIELDS):
+                yield self._complete(fields, link, defaults)
+            else:
+                incomplete.append(link)
+
+        for link, car in self.extractor.extract_many(incomplete):
+            if car is not None:
+                # câmpurile necunoscute lipsesc, ca filtrele căutării să le poată completa
+                fields = {k: v for k, v in asdict(car).items() if v not in (None, "Unknown")}
+                yield self._complete(fields, link, defaults)
+
+    def crawl(
+        self,
+        search_url: str,
+        defaults: Optional[Dict] = None,
+        exclude: Iterable[str] = (),
+    ) -> Iterator[CarSpecs]:
+        """Produce CarSpecs pentru fiecare anunț găsit, pagină cu pagină.
+
+        defaults: câmpurile fixate de filtrele căutării (vezi URLBuilder.query_defaults). exclude: URL-uri de anunț de ignorat (ex. anunțul de referință).
+        """
+        for results in self.iter_results(search_url, exclude):
+            yield from self.complete_results(results, defaults)
+
+    def _complete(self, fields: Dict, link: str, defaults: Dict) -> CarSpecs:
+        # filtrele căutării completează doar ce lipsește: valorile citite din anunț rămân
+        for name, value in defaults.items():
+            fields.setdefault(name, value)
+        if fields.get("brand", "Unknown") == "Unknown" or fields.get("model", "Unknown") == "Unknown":
+            brand_u, model_u = self.extractor.extract_brand_and_model_from_url(link)
+            if brand_u and fields.get("brand", "Unknown") == "Unknown":
+                fields["brand"] = brand_u
+            if model_u and fields.get("model", "Unknown") == "Unknown":
+                fields["model"] = model_u
+        return car_from_fields(fields, link)
@@ -0,0 +1,139 @@
+"""Motorul de extragere a specificațiilor din textul anunțului."""
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+_SPECIAL_SPACES_RE = re.compile(r"[\u00A0\u202F]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"(\d[\d\s\.,]*)")
+_NON_DIGITS_RE = re.compile(r"[^\d]")
+# "€" nu e caracter de cuvânt, deci \b se aplică doar monedelor scrise cu litere
+_PRICE_RE = re.compile(r"(\d[\d\s\u00A0\u202F\.,]*)\s*(€|(?:eur|euro|lei|ron)\b)", re.I)
+
+def _normalize_numeric_text(text: str) -> str:
+    if not text:
+        return ""
+    text = _SPECIAL_SPACES_RE.sub(" ", text)   # NBSP / thin space
+    text = _WHITESPACE_RE.sub(" ", text)
+    return text.strip()
+
+def _extract_number(text: str) -> Optional[int]:
+    if not text:
+        return None
+    m = _NUMBER_RE.search(_normalize_numeric_text(text))
+    if not m:
+        return None
+    clean = _NON_DIGITS_RE.sub("", m.group(1))
+    return int(clean) if clean else None
+
+@dataclass(frozen=True)
+class SpecField:
+    """Un câmp căutat în textul vizibil (lowercase): regex cu un grup de captură, plus validare.
+
+    Câmp numeric: `bounds` = intervalul acceptat. Câmp text: `values` = tabelul de
+    normalizare; valorile absente din tabel rămân ca atare sau devin `fallback`.
+    """
+    name: str
+    pattern: "re.Pattern[str]"
+    bounds: Optional[Tuple[int, int]] = None
+    values: Optional[Mapping[str, str]] = None
+    fallback: Optional[str] = None
+
+    @classmethod
+    def numeric(cls, name: str, pattern: str, low: int, high: int) -> "SpecField":
+        return cls(name, re.compile(pattern), bounds=(low, high))
+
+    @classmethod
+    def enum(cls, name: str, keywords: str, values: Dict[str, str], fallback: Optional[str] = None) -> "SpecField":
+        """Câmp text: `keywords`, apoi cel mult 12 non-cifre, apoi una din cheile tabelului."""
+        # variantele mai lungi primele, ca "albastru" să nu fie prins ca "alb"
+        alternatives = "|".join(re.escape(v) for v in sorted(values, key=len, reverse=True))
+        pattern = re.compile(rf"(?:{keywords})\D{{0,12}}({alternatives})")
+        return cls(name, pattern, values=MappingProxyType(dict(values)), fallback=fallback)
+
+    def parse(self, raw: str):
+        if self.bounds is not None:
+            n = _extract_number(raw)
+            if n is None or not self.bounds[0] <= n <= self.bounds[1]:
+                return None
+            return n
+        v = raw.lower().strip()
+        return self.values.get(v, v if self.fallback is None else self.fallback)
+
+class SpecEngine:
+    """Extrage specificațiile din textul vizibil cu un set fix de câmpuri precompilate.
+
+    Textul e trecut o singură dată în lowercase, așa că tiparele se scriu cu litere
+    mici și fără re.I (căutarea case-insensitive e mult mai lentă).
+    """
+
+    def __init__(self, fields: Iterable[SpecField]):
+        self.fields = tuple(fields)
+        self.by_name: Dict[str, SpecField] = {f.name: f for f in self.fields}
+        self.names = frozenset(self.by_name)
+
+    def extended(self, *fields: SpecField) -> "SpecEngine":
+        """Un motor nou, cu câmpuri în plus (sau înlocuite, după nume)."""
+        names = {f.name for f in fields}
+        return SpecEngine([f for f in self.fields if f.name not in names] + list(fields))
+
+    def extract(self, text: str, skip: Iterable[str] = ()) -> Dict[str, object]:
+        """Prima potrivire validă pentru fiecare câmp; câmpurile din `skip` nu se caută."""
+        skip = frozenset(skip)
+        text = text.lower()
+        specs: Dict[str, object] = {}
+        for f in self.fields:
+            if f.name in skip:
+                continue
+            m = f.pattern.search(text)
+            if m:
+                value = f.parse(m.group(1))
+                if value is not None:
+                    specs[f.name] = value
+        return specs
+
+_NUM = r"(\d[\d\s\u00A0\u202F\.,]*)"
+
+SPEC_ENGINE = SpecEngine([
+    SpecField.numeric("year", r"(?:an(?:ul)?|fabricat|fabricație|fabricatie)\D{0,12}(\d{4})", 1990, 2025),
+    SpecField.numeric("km", _NUM + r"\s*km\b", 0, 1_500_000),
+    SpecField.numeric("engine_size", _NUM + r"\s*(?:cm3|cmc|cm³)\b", 500, 8000),
+    SpecField.numeric("power", _NUM + r"\s*(?:cp|hp|cai)\b", 30, 2000),
+    SpecField.enum("fuel", r"combustibil|fuel", {
+        "diesel": "diesel",
+        "benzină": "petrol", "benzina": "petrol", "petrol": "petrol",
+        "gpl": "lpg",
+        "hibrid": "hybrid", "hybrid": "hybrid",
+        "electric": "electric",
+    }),
+    SpecField.enum("gearbox", r"cutie|transmis(?:ie)?|gearbox", {
+        "automată": "automatic", "automata": "automatic", "automatic": "automatic",
+        "manuală": "manual", "manuala": "manual", "manual": "manual",
+    }),
+    SpecField.enum("body", r"caroserie|tip|body", {
+        "suv": "suv", "sedan": "sedan", "berlină": "sedan", "berlina": "sedan",
+        "break": "estate-car", "coupe": "coupe", "hatchback": "hatchback",
+        "pickup": "pickup", "pick-up": "pickup",
+    }),
+    SpecField.enum("state", r"stare|condition", {
+        "nou": "new", "new": "new",
+        "folosit": "used", "utilizat": "used", "used": "used",
+    }, fallback="used"),
+    SpecField.enum("color", r"culoare|color", {
+        "alb": "white", "white": "white",
+        "negru": "black", "black": "black",
+        "gri": "grey", "grey": "grey", "gray": "grey",
+        "argintiu": "silver", "silver": "silver",
+        "albastru": "blue", "blue": "blue",
+        "roșu": "red", "rosu": "red", "red": "red",
+        "verde": "green", "green": "green",
+        "maro": "brown", "brown": "brown",
+        "bej": "beige", "beige": "beige",
+        "galben": "yellow", "yellow": "yellow",
+        "portocaliu": "orange", "orange": "orange",
+        "auriu": "gold", "gold": "gold",
+        "bordo": "burgundy", "burgundy": "burgundy",
+        "violet": "violet", "mov": "violet",
+    }),
+])
@@ -0,0 +1,309 @@
+"""Statistici de piață precalculate pe segmente: sketch KLL de prețuri și regresia preț ~ km."""
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import CarSpecs, listing_id
+from .net import cache_path
+
+class QuantileSketch:
+    """Sketch KLL pentru cuantile: memorie O(k), combinabil (merge) și serializabil.
+
+    Nivelul h păstrează elemente cu ponderea 2**h; când un nivel se umple, elementele
+    sortate se înjumătățesc (din două în două, de la un capăt ales aleator) și urcă un
+    nivel. Eroarea de rang e de ordinul 1/k; sub k valori rezultatul e exact.
+    """
+
+    def __init__(self, k: int = 200):
+        self.k = k
+        self.n = 0
+        self.levels: List[List[float]] = [[]]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(self.k * (2 / 3) ** depth) + 1)
+
+    def _compress(self) -> None:
+        size = sum(len(items) for items in self.levels)
+        limit = sum(self._capacity(h) for h in range(len(self.levels)))
+        h = 0
+        while size >= limit and h < len(self.levels):
+            items = self.levels[h]
+            if len(items) >= self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                    limit = sum(self._capacity(i) for i in range(len(self.levels)))
+                items.sort()
+                # un element fără pereche rămâne pe nivel, ca ponderea totală să fie exact n
+                kept = [items.pop()] if len(items) % 2 else []
+                self.levels[h + 1].extend(items[random.getrandbits(1)::2])
+                self.levels[h] = kept
+                size = sum(len(items) for items in self.levels)
+            h += 1
+
+    def update(self, value: float) -> None:
+        self.levels[0].append(float(value))
+        self.n += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.n += other.n
+        self._compress()
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        return sorted((v, 1 << h) for h, items in enumerate(self.levels) for v in items)
+
+    def rank(self, value: float) -> float:
+        """Fracțiunea valorilor <= value (0..1)."""
+        total = below = 0
+        for h, items in enumerate(self.levels):
+            weight = 1 << h
+            total += weight * len(items)
+            below += weight * sum(1 for v in items if v <= value)
+        return below / total if total else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Valoarea de la fracțiunea q (0..1) a distribuției; None pentru un sketch gol."""
+        weighted = self._weighted()
+        if not weighted:
+            return None
+        target = q * sum(w for _, w in weighted)
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+    def to_dict(self) -> Dict:
+        return {"k": self.k, "n": self.n, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuantileSketch":
+        sketch = cls(data["k"])
+        sketch.n = data["n"]
+        sketch.levels = [list(items) for items in data["levels"]]
+        return sketch
+
+@dataclass
+class SegmentStats:
+    """Agregatele unui segment de piață: număr, sketch de prețuri și regresia preț ~ km.
+
+    Regresia e ținută ca sume (n, Σkm, Σpreț, Σkm², Σkm·preț), deci se actualizează
+    și se combină prin adunare.
+    """
+    count: int = 0
+    prices: QuantileSketch = field(default_factory=QuantileSketch)
+    sum_km: float = 0.0
+    sum_price: float = 0.0
+    sum_km2: float = 0.0
+    sum_km_price: float = 0.0
+
+    # sub atâtea anunțuri, regresia nu e folosită (prețul corect e mediana)
+    MIN_REGRESSION = 8
+
+    def add(self, price: float, km: int) -> None:
+        self.count += 1
+        self.prices.update(price)
+        self.sum_km += km
+        self.sum_price += price
+        self.sum_km2 += km * km
+        self.sum_km_price += km * price
+
+    def merge(self, other: "SegmentStats") -> None:
+        self.count += other.count
+        self.prices.merge(other.prices)
+        self.sum_km += other.sum_km
+        self.sum_price += other.sum_price
+        self.sum_km2 += other.sum_km2
+        self.sum_km_price += other.sum_km_price
+
+    def median(self) -> Optional[float]:
+        return self.prices.quantile(0.5)
+
+    def percentile(self, price: float) -> float:
+        """Procentul anunțurilor din segment cu preț <= price."""
+        return 100.0 * self.prices.rank(price)
+
+    def slope(self) -> Optional[float]:
+        """EUR per km din regresie; None dacă nu sunt destule date sau km nu variază."""
+        if self.count < self.MIN_REGRESSION:
+            return None
+        denominator = self.count * self.sum_km2 - self.sum_km ** 2
+        if denominator <= 0:
+            return None
+        slope = (self.count * self.sum_km_price - self.sum_km * self.sum_price) / denominator
+        # o pantă pozitivă (mai mulți km, preț mai mare) e zgomot, nu un model al pieței
+        return slope if slope <= 0 else None
+
+    def fair_price(self, km: int) -> Optional[float]:
+        """Prețul estimat pentru km dați: regresia dacă e utilizabilă, altfel mediana."""
+        slope = self.slope()
+        if slope is None:
+            return self.median()
+        intercept = (self.sum_price - slope * self.sum_km) / self.count
+        return max(0.0, intercept + slope * km)
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["prices"] = self.prices.to_dict()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "SegmentStats":
+        data = json.loads(raw)
+        data["prices"] = QuantileSketch.from_dict(data["prices"])
+        return cls(**data)
+
+@dataclass(frozen=True)
+class MarketPosition:
+    """Unde se află prețul unui anunț în segmentul lui."""
+    segment: Tuple[str, ...]
+    count: int
+    percentile: float                   # % din anunțurile segmentului cu preț <= al anunțului
+    median: Optional[float]
+    fair_price: Optional[float]         # estimat pentru km-ii anunțului
+
+class MarketStats:
+    """Statistici precalculate pe segmente (marcă, model, an, combustibil, cutie), în SQLite.
+
+    Fiecare anunț văzut intră, după ID-ul OLX, în segmentul lui și în segmentul mai larg
+    (marcă, model, an), cu ultimul preț văzut: un anunț re-prețuit își înlocuiește prețul,
+    iar unul nevăzut de `max_age` secunde (vândut sau retras) iese din statistici. Poziția
+    unui anunț se citește dintr-un singur rând, fără a reparcurge anunțurile similare; un
+    anunț nou se adaugă incremental, iar un segment din care iese un preț se recalculează
+    din anunțurile lui (observed). Actualizările se fac în tranzacții IMMEDIATE, deci mai
+    multe procese pot scrie în același fișier.
+    """
+
+    # un segment cu mai puține anunțuri cedează locul segmentului mai larg
+    MIN_COUNT = 5
+
+    def __init__(self, path: str, max_age: float = 30 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS segments (key TEXT PRIMARY KEY, stats TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS observed (id TEXT PRIMARY KEY, price REAL NOT NULL, km INTEGER NOT NULL, seen_at REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS observed_seen ON observed (seen_at);
+            CREATE TABLE IF NOT EXISTS members (key TEXT NOT NULL, id TEXT NOT NULL, PRIMARY KEY (key, id)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS members_id ON members (id);
+            """
+        )
+        # fișierele de dinainte de `observed` țin doar ID-urile numărate: segmentele lor nu se
+        # mai pot corecta, deci se reconstruiesc din observațiile următoare
+        if self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'counted'").fetchone():
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM segments")
+            self._conn.execute("DROP TABLE counted")
+            self._conn.execute("COMMIT")
+
+    @classmethod
+    def default_path(cls) -> str:
+        return cache_path("market_stats.sqlite")
+
+    @staticmethod
+    def segment_keys(car: CarSpecs) -> List[Tuple[str, ...]]:
+        """Cheile segmentelor unui anunț, de la cel mai specific la cel mai larg."""
+        model = car.model.lower()
+        return [(car.brand, model, str(car.year), car.fuel, car.gearbox), (car.brand, model, str(car.year))]
+
+    def observe(self, cars: Iterable[CarSpecs], now: Optional[float] = None) -> int:
+        """Adaugă anunțurile noi și prețurile noi ale celor re-prețuite; întoarce câte s-au schimbat.
+
+        Anunțurile nevăzute de `max_age` secunde până la `now` ies din statistici.
+        """
+        cars = [c for c in cars if c.price > 0 and c.year > 0 and c.brand != "Unknown"]
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                updates: Dict[str, SegmentStats] = {}
+                # segmentele din care iese un preț: se recalculează din anunțurile rămase
+                rebuild = set()
+                changed = 0
+                for car in cars:
+                    lid = listing_id(car.link)
+                    keys = [json.dumps(key) for key in self.segment_keys(car)]
+                    row = self._conn.execute("SELECT price, km FROM observed WHERE id = ?", (lid,)).fetchone()
+                    old_keys = self._member_keys(lid)
+                    if row == (car.price, car.km) and old_keys == sorted(keys):
+                        self._conn.execute("UPDATE observed SET seen_at = ? WHERE id = ?", (now, lid))
+                        continue
+                    if row is not None:
+                        rebuild.update(old_keys)
+                        self._conn.execute("DELETE FROM members WHERE id = ?", (lid,))
+                    self._conn.execute("INSERT OR REPLACE INTO observed VALUES (?, ?, ?, ?)", (lid, car.price, car.km, now))
+                    self._conn.executemany("INSERT INTO members VALUES (?, ?)", [(raw, lid) for raw in keys])
+                    changed += 1
+                    for raw in keys:
+                        if raw not in updates:
+                            updates[raw] = self._load(raw) or SegmentStats()
+                        updates[raw].add(car.price, car.km)
+
+                expired = [lid for (lid,) in self._conn.execute(
+                    "SELECT id FROM observed WHERE seen_at < ?", (now - self.max_age,)
+                )]
+                for lid in expired:
+                    rebuild.update(self._member_keys(lid))
+                    self._conn.execute("DELETE FROM members WHERE id = ?", (lid,))
+                    self._conn.execute("DELETE FROM observed WHERE id = ?", (lid,))
+
+                for raw in rebuild:
+                    stats = SegmentStats()
+                    for price, km in self._conn.execute(
+                        "SELECT price, km FROM observed JOIN members USING (id) WHERE key = ?", (raw,)
+                    ):
+                        stats.add(price, km)
+                    updates[raw] = stats
+                self._conn.executemany("DELETE FROM segments WHERE key = ?", [(k,) for k, s in updates.items() if not s.count])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO segments VALUES (?, ?)", [(k, s.to_json()) for k, s in updates.items() if s.count]
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return changed
+
+    def _member_keys(self, lid: str) -> List[str]:
+        return sorted(key for (key,) in self._conn.execute("SELECT key FROM members WHERE id = ?", (lid,)))
+
+    def _load(self, raw_key: str) -> Optional[SegmentStats]:
+        row = self._conn.execute("SELECT stats FROM segments WHERE key = ?", (raw_key,)).fetchone()
+        return SegmentStats.from_json(row[0]) if row else None
+
+    def segment(self, key: Tuple[str, ...]) -> Optional[SegmentStats]:
+        with self._lock:
+            return self._load(json.dumps(list(key)))
+
+    def position(self, car: CarSpecs) -> Optional[MarketPosition]:
+        """Percentila prețului și prețul corect estimat, din cel mai specific segment cu destule anunțuri."""
+        if car.price <= 0:
+            return None
+        for key in self.segment_keys(car):
+            stats = self.segment(key)
+            if stats is not None and stats.count >= self.MIN_COUNT:
+                return MarketPosition(key, stats.count, stats.percentile(car.price), stats.median(), stats.fair_price(car.km))
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM segments")
+            self._conn.execute("DELETE FROM members")
+            self._conn.execute("DELETE FROM observed")
@@ -0,0 +1,211 @@
+"""ListingStore: depozitul local al anunțurilor și căutarea anunțurilor comparabile."""
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional
+
+from .models import CarSpecs, listing_id
+from .net import cache_path
+from .query import SearchQuery, URLBuilder
+from .search import SearchCrawler
+
+# coloanele CarSpecs, în ordinea câmpurilor
+_CAR_COLUMNS = tuple(CarSpecs.__dataclass_fields__)
+
+class ListingStore:
+    """Depozit local (SQLite) al anunțurilor extrase, cheiat după ID-ul OLX.
+
+    Indexurile pe marcă/model/combustibil/cutie/an/km fac ca o căutare pe toleranțe
+    să fie o interogare locală. `max_age` (secunde) e politica de prospețime: anunțurile
+    și căutările mai vechi sunt ignorate, deci vor fi descărcate din nou.
+    """
+
+    def __init__(self, path: str, max_age: float = 6 * 3600):
+        self.path = path
+        self.max_age = max_age
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS listings (
+                id TEXT PRIMARY KEY,
+                title TEXT, price REAL, price_text TEXT, brand TEXT, model TEXT COLLATE NOCASE,
+                year INTEGER, km INTEGER, fuel TEXT, gearbox TEXT, body TEXT,
+                power INTEGER, engine_size INTEGER, state TEXT, color TEXT, link TEXT,
+                description_hash INTEGER NOT NULL DEFAULT 0,
+                fetched_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS listings_segment ON listings (brand, model, fuel, gearbox, year, km);
+            CREATE INDEX IF NOT EXISTS listings_year_km ON listings (year, km);
+            CREATE INDEX IF NOT EXISTS listings_fetched ON listings (fetched_at);
+            CREATE TABLE IF NOT EXISTS searches (
+                query TEXT PRIMARY KEY,
+                brand TEXT,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS search_results (
+                query TEXT NOT NULL,
+                id TEXT NOT NULL,
+                PRIMARY KEY (query, id)
+            ) WITHOUT ROWID;
+            """
+        )
+        # depozitele create înainte de coloana description_hash
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(listings)")}
+        if "description_hash" not in columns:
+            self._conn.execute("ALTER TABLE listings ADD COLUMN description_hash INTEGER NOT NULL DEFAULT 0")
+            self._conn.commit()
+
+    @classmethod
+    def default_path(cls) -> str:
+        return cache_path("listings.sqlite")
+
+    def _cutoff(self, max_age: Optional[float]) -> float:
+        return time.time() - (self.max_age if max_age is None else max_age)
+
+    def upsert(self, cars: Iterable[CarSpecs], fetched_at: Optional[float] = None) -> int:
+        """Inserează sau actualizează anunțurile; întoarce câte au fost scrise."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = [(listing_id(c.link), *(getattr(c, col) for col in _CAR_COLUMNS), fetched_at) for c in cars]
+        columns = ", ".join(_CAR_COLUMNS)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in (*_CAR_COLUMNS, "fetched_at"))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO listings (id, {columns}, fetched_at) VALUES ({', '.join('?' * (len(_CAR_COLUMNS) + 2))}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def get(self, lid: str, max_age: Optional[float] = None) -> Optional[CarSpecs]:
+        """Anunțul cu ID-ul dat, dacă există și nu e mai vechi decât `max_age`."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_CAR_COLUMNS)} FROM listings WHERE id = ? AND fetched_at >= ?",
+                (lid, self._cutoff(max_age)),
+            ).fetchone()
+        return CarSpecs(*row) if row else None
+
+    def is_stale(self, lid: str, max_age: Optional[float] = None) -> bool:
+        return self.get(lid, max_age) is None
+
+    def query(
+        self,
+        query: SearchQuery,
+        max_age: Optional[float] = None,
+        exclude: Iterable[str] = (),
+        source: Optional[SearchQuery] = None,
+    ) -> List[CarSpecs]:
+        """Anunțurile locale care trec filtrele căutării (aceeași semantică ca SearchQuery.matches).
+
+        source: căutarea salvată din care se răspunde. Pe câmpurile pe care OLX le-a filtrat
+        pentru ea exact ca `query` (SearchQuery.enforced_by), un anunț găsit de ea cu valoare
+        necunoscută (NULL, 0, 'Unknown') trece filtrul; unul găsit doar de alte căutări, nu.
+        """
+        lenient = set(query.enforced_by(source)) if source is not None else set()
+        found_by = "id IN (SELECT id FROM search_results WHERE query = ?)"
+        where = ["brand = ?", "fetched_at >= ?"]
+        args: List[object] = [query.brand, self._cutoff(max_age)]
+        if query.model:
+            where.append("model = ?")
+            args.append(query.model)
+        if query.body:
+            where.append("body = ?")
+            args.append(query.body)
+        for name in SearchQuery.RANGE_FIELDS:
+            bounds = getattr(query, name)
+            if bounds is not None:
+                if name in lenient:
+                    where.append(f"((COALESCE({name}, 0) <= 0 AND {found_by}) OR {name} BETWEEN ? AND ?)")
+                    args.append(source.to_json())
+                else:
+                    where.append(f"{name} BETWEEN ? AND ?")
+                args.extend(bounds)
+        for column, attr in SearchQuery.ENUM_FIELDS:
+            values = getattr(query, attr)
+            if values:
+                placeholders = ", ".join("?" * len(values))
+                if column in lenient:
+                    where.append(f"((COALESCE({column}, 'Unknown') = 'Unknown' AND {found_by}) OR {column} IN ({placeholders}))")
+                    args.append(source.to_json())
+                else:
+                    where.append(f"{column} IN ({placeholders})")
+                args.extend(values)
+        excluded = set(exclude)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(_CAR_COLUMNS)} FROM listings WHERE {' AND '.join(where)}", args
+            ).fetchall()
+        return [CarSpecs(*row[1:]) for row in rows if row[0] not in excluded]
+
+    def listings(self, max_age: Optional[float] = None) -> Iterator[CarSpecs]:
+        """Toate anunțurile locale nu mai vechi decât `max_age`."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_CAR_COLUMNS)} FROM listings WHERE fetched_at >= ?", (self._cutoff(max_age),)
+            ).fetchall()
+        return (CarSpecs(*row) for row in rows)
+
+    def record_search(self, query: SearchQuery, found: Iterable[str] = ()) -> None:
+        """Marchează o căutare parcursă complet; acum poate fi răspunsă local.
+
+        found: ID-urile anunțurilor găsite de ea (vezi `source` în query).
+        """
+        key = query.to_json()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO searches VALUES (?, ?, ?)", (key, query.brand, time.time()))
+            self._conn.execute("DELETE FROM search_results WHERE query = ?", (key,))
+            self._conn.executemany("INSERT OR IGNORE INTO search_results VALUES (?, ?)", [(key, lid) for lid in found])
+            self._conn.commit()
+
+    def recent_searches(self, brand: str, max_age: Optional[float] = None) -> List[SearchQuery]:
+        """Căutările recente, complete, pentru marca dată."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query FROM searches WHERE brand = ? AND fetched_at >= ?", (brand, self._cutoff(max_age))
+            ).fetchall()
+        return [SearchQuery.from_json(raw) for (raw,) in rows]
+
+    def covering_search(self, query: SearchQuery, max_age: Optional[float] = None) -> Optional[SearchQuery]:
+        """O căutare recentă, completă, din ale cărei rezultate se poate răspunde lui `query` (SearchQuery.answers)."""
+        for saved in self.recent_searches(query.brand, max_age):
+            if saved.answers(query):
+                return saved
+        return None
+
+def find_comparables(
+    crawler: SearchCrawler,
+    store: ListingStore,
+    query: SearchQuery,
+    exclude: Iterable[str] = (),
+    max_age: Optional[float] = None,
+) -> Iterator[CarSpecs]:
+    """Anunțurile comparabile pentru `query`.
+
+    Dacă o căutare recentă o acoperă, răspunsul vine din depozitul local; altfel
+    căutarea se face pe OLX, iar rezultatele se salvează pe măsură ce sosesc.
+    """
+    excluded = {listing_id(u) for u in exclude}
+    saved = store.covering_search(query, max_age)
+    if saved is not None:
+        yield from store.query(query, max_age, exclude=excluded, source=saved)
+        return
+
+    pending: List[CarSpecs] = []
+    found: List[str] = []
+    try:
+        for car in crawler.crawl(URLBuilder.build_query_url(query), query.defaults(), exclude):
+            pending.append(car)
+            found.append(listing_id(car.link))
+            if len(pending) >= 50:
+                store.upsert(pending)
+                pending.clear()
+            yield car
+    finally:
+        store.upsert(pending)
+    if crawler.last_crawl_complete:
+        store.record_search(query, found)
@@ -0,0 +1,182 @@
+"""Date structurate din pagini: JSON-LD (Vehicle/Car/Product) și starea OLX (__PRERENDERED_STATE__)."""
+import json
+import re
+from html import unescape
+from typing import Dict, Iterator, Optional
+
+from .brands import BRAND_CATALOGUE, _tokens
+from .specs import SPEC_ENGINE, SpecEngine, _extract_number
+
+_JSON_LD_TYPES = frozenset({"Vehicle", "Car", "Product"})
+_LD_CONDITIONS = {"newcondition": "new", "usedcondition": "used", "refurbishedcondition": "used"}
+
+def _json_ld_items(raw: Optional[str]) -> Iterator[Dict]:
+    """Obiectele dintr-un bloc JSON-LD (inclusiv liste și @graph)."""
+    try:
+        data = json.loads(raw or "{}")
+    except ValueError:
+        return
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, dict):
+            yield item
+            if isinstance(item.get("@graph"), list):
+                stack.extend(reversed(item["@graph"]))
+
+def _ld_value(v):
+    """Valoarea simplă a unei proprietăți JSON-LD (QuantitativeValue, Brand, listă...)."""
+    if isinstance(v, list):
+        v = v[0] if v else None
+    if isinstance(v, dict):
+        v = v.get("value", v.get("name"))
+    return v
+
+def _ld_number(v) -> Optional[float]:
+    v = _ld_value(v)
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        n = _extract_number(str(v)) if v is not None else None
+        return float(n) if n is not None else None
+
+def _fields_from_json_ld(item: Dict, engine: SpecEngine) -> Dict:
+    """Mapează un obiect Vehicle/Car/Product din JSON-LD la câmpurile CarSpecs găsite.
+
+    Valorile numerice și cele enum trec prin câmpurile motorului de specificații,
+    ca să aibă aceleași limite și același vocabular ca extragerea din text.
+    """
+    fields: Dict[str, object] = {}
+
+    def put(name: str, value) -> None:
+        if value is None or value == "":
+            return
+        if isinstance(value, float):
+            value = str(int(value))
+        parsed = engine.by_name[name].parse(str(value)) if name in engine.by_name else value
+        if parsed is not None:
+            fields[name] = parsed
+
+    name = _ld_value(item.get("name"))
+    if name:
+        fields["title"] = str(name).strip()
+    description = _ld_value(item.get("description"))
+    if description:
+        fields["description"] = str(description)
+    brand = _ld_value(item.get("brand")) or _ld_value(item.get("manufacturer"))
+    if brand:
+        fields["brand"] = BRAND_CATALOGUE.brand_for_text(str(brand)) or str(brand).strip()
+    model = _ld_value(item.get("model"))
+    if model:
+        fields["model"] = BRAND_CATALOGUE.model_name(" ".join(_tokens(str(model))))
+
+    year = _ld_value(item.get("vehicleModelDate") or item.get("productionDate") or item.get("modelDate"))
+    if year:
+        put("year", str(year)[:4])
+    put("km", _ld_number(item.get("mileageFromOdometer")))
+
+    engine_spec = item.get("vehicleEngine")
+    if isinstance(engine_spec, list):
+        engine_spec = engine_spec[0] if engine_spec else None
+    if not isinstance(engine_spec, dict):
+        engine_spec = {}
+    displacement = engine_spec.get("engineDisplacement")
+    cc = _ld_number(displacement)
+    if cc is not None and isinstance(displacement, dict) and str(displacement.get("unitCode", "")).upper() == "LTR":
+        cc *= 1000
+    put("engine_size", cc)
+    power = engine_spec.get("enginePower")
+    hp = _ld_number(power)
+    if hp is not None and isinstance(power, dict) and str(power.get("unitCode", "")).upper() == "KWT":
+        hp = round(hp * 1.36)
+    put("power", hp)
+
+    put("fuel", _ld_value(item.get("fuelType") or engine_spec.get("fuelType")))
+    put("gearbox", _ld_value(item.get("vehicleTransmission")))
+    put("body", _ld_value(item.get("bodyType")))
+    put("color", _ld_value(item.get("color")))
+    condition = _ld_value(item.get("itemCondition"))
+    if condition:
+        state = _LD_CONDITIONS.get(str(condition).rsplit("/", 1)[-1].lower())
+        fields["state"] = state or engine.by_name["state"].parse(str(condition))
+
+    offers = item.get("offers")
+    offer = (offers[0] if offers else {}) if isinstance(offers, list) else (offers or {})
+    if isinstance(offer, dict):
+        price = _ld_number(offer.get("price", offer.get("lowPrice")))
+        if price:
+            cur = str(offer.get("priceCurrency") or "EUR").upper()
+            fields["price"] = price
+            fields["price_text"] = f"{int(price):,} {cur}".replace(",", " ")
+    return fields
+
+# -------- starea OLX (__PRERENDERED_STATE__) --------
+
+_STATE_RE = re.compile(r"""__PRERENDERED_STATE__\s*=\s*("(?:[^"\\]|\\.)*"|\{.*\})\s*;?""", re.S)
+
+def _decode_prerendered_state(script: Optional[str]) -> Optional[Dict]:
+    """Decodează `window.__PRERENDERED_STATE__` (string JSON cu JSON în el sau obiect direct)."""
+    if not script:
+        return None
+    m = _STATE_RE.search(script)
+    if not m:
+        return None
+    try:
+        data = json.loads(m.group(1))
+        if isinstance(data, str):
+            data = json.loads(data)
+        return data if isinstance(data, dict) else None
+    except ValueError:
+        return None
+
+# cheile parametrilor OLX -> câmpurile CarSpecs (aceleași nume ca filtrele din URLBuilder)
+_OLX_PARAM_FIELDS = {
+    "year": "year", "rulaj_pana": "km", "enginesize": "engine_size", "engine_power": "power",
+    "petrol": "fuel", "gearbox": "gearbox", "car_body": "body", "state": "state",
+    "color": "color", "model": "model",
+}
+_OLX_NUMERIC_FIELDS = {"year", "km", "engine_size", "power"}
+
+def _fields_from_olx_ad(ad: Dict, engine: SpecEngine = SPEC_ENGINE) -> Dict:
+    """Mapează un anunț din starea JSON OLX la câmpurile CarSpecs găsite.
+
+    Valorile enum trec prin motorul de specificații, ca în _fields_from_json_ld.
+    """
+    fields: Dict[str, object] = {}
+    if ad.get("title"):
+        fields["title"] = str(ad["title"]).strip()
+    if ad.get("description"):
+        # descrierea vine ca HTML (<br />, <p>)
+        fields["description"] = unescape(re.sub(r"<[^>]+>", " ", str(ad["description"])))
+    price = (ad.get("price") or {}).get("regularPrice") or {}
+    if price.get("value"):
+        try:
+            val = float(price["value"])
+            cur = str(price.get("currencyCode") or "EUR").upper()
+            fields["price"] = val
+            fields["price_text"] = f"{int(val):,} {cur}".replace(",", " ")
+        except (TypeError, ValueError):
+            pass
+    for param in ad.get("params") or []:
+        key = _OLX_PARAM_FIELDS.get(param.get("key"))
+        normalized = param.get("normalizedValue")
+        value = normalized or param.get("value")
+        if not key or value in (None, ""):
+            continue
+        if key in _OLX_NUMERIC_FIELDS:
+            # normalizedValue e un număr ("45000", "1598.0"); valoarea afișată e text ("182.300 km")
+            try:
+                number = int(float(normalized))
+            except (TypeError, ValueError):
+                number = engine.by_name[key].parse(str(value))
+            if number is not None:
+                fields[key] = number
+        elif key == "model":
+            fields["model"] = str(value).replace("-", " ").upper()
+        elif key in engine.by_name:
+            fields[key] = engine.by_name[key].parse(str(value))
+        else:
+            fields[key] = str(value).lower()
+    return fields
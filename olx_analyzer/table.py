@@ -0,0 +1,299 @@
+"""CarSpecsTable: anunțuri în coloane numpy; pandas și pyarrow se importă doar la conversie."""
+import os
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from .models import CarSpecs
+from .query import SearchQuery
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def _code_dtype(categories: int) -> type:
+    """Cel mai mic tip întreg pentru coduri 0..categories-1."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if categories <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.int64
+
+def _narrow(values: np.ndarray) -> np.ndarray:
+    """Coloana int32 ca int16 dacă toate valorile încap."""
+    info = np.iinfo(np.int16)
+    if values.dtype == np.int32 and (not len(values) or (values.min() >= info.min and values.max() <= info.max)):
+        return values.astype(np.int16)
+    return values
+
+class _StringColumn:
+    """Stringuri într-un singur buffer UTF-8 cu offset-uri (ca în Arrow), fără un obiect str per rând.
+
+    Prefixul și sufixul comune tuturor rândurilor (ex. "https://www.olx.ro/d/oferta/" și
+    ".html" la link-uri) se păstrează o singură dată.
+    """
+    __slots__ = ("data", "offsets", "prefix", "suffix")
+
+    def __init__(self, data: bytes, offsets: np.ndarray, prefix: str = "", suffix: str = ""):
+        self.data = data
+        self.offsets = offsets          # int32 (int64 peste 2 GiB), len(rânduri) + 1
+        self.prefix = prefix
+        self.suffix = suffix
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "_StringColumn":
+        values = list(values)
+        prefix = os.path.commonprefix(values) if values else ""
+        suffix = os.path.commonprefix([v[len(prefix):][::-1] for v in values])[::-1] if values else ""
+        encoded = [v[len(prefix):len(v) - len(suffix)].encode("utf-8") for v in values]
+        lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+        dtype = np.int32 if lengths.sum() <= np.iinfo(np.int32).max else np.int64
+        offsets = np.zeros(len(encoded) + 1, dtype=dtype)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(b"".join(encoded), offsets, prefix, suffix)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.prefix + self.data[self.offsets[i]:self.offsets[i + 1]].decode("utf-8") + self.suffix
+
+    def take(self, index: np.ndarray) -> "_StringColumn":
+        """Rândurile `index`, copiate direct din buffer (fără decodare rând cu rând)."""
+        index = np.asarray(index, dtype=np.intp)
+        starts, ends = self.offsets[index], self.offsets[index + 1]
+        offsets = np.zeros(len(index) + 1, dtype=self.offsets.dtype)
+        np.cumsum(ends - starts, out=offsets[1:])
+        buf = np.frombuffer(self.data, dtype=np.uint8)
+        if 8 * offsets[-1] > len(self.data) and np.all(np.diff(index) > 0):
+            # multe rânduri, în ordine (ex. dintr-o mască): o mască pe octeți, nu un indice de 8 octeți per octet
+            keep = np.zeros(len(self), dtype=bool)
+            keep[index] = True
+            data = buf[np.repeat(keep, np.diff(self.offsets))]
+        else:
+            data = buf[np.repeat(starts - offsets[:-1], ends - starts) + np.arange(offsets[-1])]
+        return _StringColumn(data.tobytes(), offsets, self.prefix, self.suffix)
+
+    def to_list(self) -> List[str]:
+        data, off, prefix, suffix = self.data, self.offsets.tolist(), self.prefix, self.suffix
+        return [prefix + data[off[i]:off[i + 1]].decode("utf-8") + suffix for i in range(len(off) - 1)]
+
+    def to_arrow(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        kind = pa.StringArray if self.offsets.dtype == np.int32 else pa.LargeStringArray
+        array = kind.from_buffers(len(self), pa.py_buffer(self.offsets), pa.py_buffer(self.data))
+        if self.prefix or self.suffix:
+            array = pc.binary_join_element_wise(self.prefix, array, self.suffix, "")
+        return array
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.nbytes
+
+class _CategoricalColumn:
+    """Coduri întregi (cel mai mic tip care încape) într-o listă de valori distincte (fuel, brand, model...)."""
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: np.ndarray, categories: List[str]):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "_CategoricalColumn":
+        lookup: Dict[str, int] = {}
+        codes = [lookup.setdefault(v, len(lookup)) for v in values]
+        return cls(np.array(codes, dtype=_code_dtype(len(lookup))), list(lookup))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.categories[self.codes[i]]
+
+    def take(self, index: np.ndarray) -> "_CategoricalColumn":
+        return _CategoricalColumn(self.codes[index], self.categories)
+
+    def isin(self, values: Iterable[str], casefold: bool = False) -> np.ndarray:
+        """Masca rândurilor a căror valoare e în `values`, comparând codurile, nu stringurile."""
+        wanted = {v.lower() for v in values} if casefold else set(values)
+        codes = [i for i, c in enumerate(self.categories) if (c.lower() if casefold else c) in wanted]
+        return np.isin(self.codes, np.array(codes, dtype=self.codes.dtype))
+
+    def to_list(self) -> List[str]:
+        cats = self.categories
+        return [cats[c] for c in self.codes.tolist()]
+
+    @property
+    def nbytes(self) -> int:
+        # și valorile distincte, o singură dată
+        return self.codes.nbytes + sum(len(c.encode("utf-8")) for c in self.categories)
+
+class CarSpecsTable:
+    """Colecție columnară de CarSpecs, pentru sute de mii de anunțuri în memorie.
+
+    Numerele stau în tablouri numpy (float64 preț, int32 an/km/putere/motor, int16 când
+    valorile încap, cu -1 pentru putere/motor lipsă), câmpurile cu valori repetate (marcă, model, combustibil...,
+    prețul afișat) ca coduri categoriale, iar link-ul într-un buffer UTF-8, fără prefixul
+    comun. Titlul, unic pe fiecare rând și nefolosit la filtrare și scor, se păstrează doar
+    cu titles=True; altfel rândurile au titlul lui car_from_fields pentru un titlu lipsă.
+    Conversia la pandas/Arrow nu copiază stringurile rând cu rând; Arrow e opțional.
+    """
+
+    NUMERIC = {
+        "price": np.float64, "year": np.int32, "km": np.int32, "power": np.int32, "engine_size": np.int32,
+        "description_hash": np.int64,
+    }
+    OPTIONAL = ("power", "engine_size")
+    CATEGORICAL = ("brand", "model", "fuel", "gearbox", "body", "state", "color", "price_text")
+    TEXT = ("link", "title")
+    NO_TITLE = "Titlu necunoscut"
+
+    def __init__(self, columns: Dict[str, object]):
+        self.columns = columns
+
+    @classmethod
+    def _text(cls, titles: bool) -> Tuple[str, ...]:
+        return cls.TEXT if titles else tuple(name for name in cls.TEXT if name != "title")
+
+    @classmethod
+    def from_cars(cls, cars: Iterable[CarSpecs], titles: bool = False) -> "CarSpecsTable":
+        cars = list(cars)
+        columns: Dict[str, object] = {}
+        for name, dtype in cls.NUMERIC.items():
+            if name in cls.OPTIONAL:
+                values = (-1 if getattr(c, name) is None else getattr(c, name) for c in cars)
+            else:
+                values = (getattr(c, name) for c in cars)
+            columns[name] = _narrow(np.fromiter(values, dtype=dtype, count=len(cars)))
+        for name in cls.CATEGORICAL:
+            columns[name] = _CategoricalColumn.from_values(getattr(c, name) for c in cars)
+        for name in cls._text(titles):
+            columns[name] = _StringColumn.from_values(getattr(c, name) for c in cars)
+        return cls(columns)
+
+    @classmethod
+    def from_frame(cls, frame: "pd.DataFrame", titles: bool = False) -> "CarSpecsTable":
+        import pandas as pd
+
+        columns: Dict[str, object] = {}
+        for name, dtype in cls.NUMERIC.items():
+            series = frame[name]
+            if name in cls.OPTIONAL:
+                series = series.fillna(-1)
+            columns[name] = _narrow(series.to_numpy(dtype=dtype))
+        for name in cls.CATEGORICAL:
+            series = frame[name]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                categories = list(series.cat.categories)
+                columns[name] = _CategoricalColumn(series.cat.codes.to_numpy(dtype=_code_dtype(len(categories))), categories)
+            else:
+                columns[name] = _CategoricalColumn.from_values(series.astype(str))
+        for name in cls._text(titles):
+            columns[name] = _StringColumn.from_values(frame[name].astype(str))
+        return cls(columns)
+
+    @classmethod
+    def from_arrow(cls, table, titles: bool = False) -> "CarSpecsTable":
+        return cls.from_frame(table.to_pandas(), titles)
+
+    def __len__(self) -> int:
+        return len(self.columns["price"])
+
+    def row(self, i: int) -> CarSpecs:
+        values = {name: col[i] for name, col in self.columns.items()}
+        for name in self.NUMERIC:
+            values[name] = values[name].item()
+        values.setdefault("title", self.NO_TITLE)
+        for name in self.OPTIONAL:
+            if values[name] < 0:
+                values[name] = None
+        return CarSpecs(**values)
+
+    def __iter__(self) -> Iterator[CarSpecs]:
+        return (self.row(i) for i in range(len(self)))
+
+    def __getitem__(self, key):
+        """Un rând (int) sau un sub-tabel (mască booleană / tablou de indici)."""
+        if isinstance(key, (int, np.integer)):
+            return self.row(int(key))
+        index = np.asarray(key)
+        if index.dtype == bool:
+            index = np.flatnonzero(index)
+        return CarSpecsTable({
+            name: col[index] if isinstance(col, np.ndarray) else col.take(index)
+            for name, col in self.columns.items()
+        })
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.columns.values())
+
+    def tolerance_mask(self, query: "SearchQuery", lenient: Iterable[str] = ()) -> np.ndarray:
+        """Rândurile care trec filtrele căutării (aceeași semantică ca ListingStore.query).
+
+        lenient: câmpuri pentru care o valoare necunoscută trece (vezi SearchQuery.enforced_by).
+        """
+        lenient = set(lenient)
+        cols = self.columns
+        mask = cols["brand"].isin([query.brand])
+        if query.model:
+            mask &= cols["model"].isin([query.model], casefold=True)
+        if query.body:
+            mask &= cols["body"].isin([query.body])
+        for name in SearchQuery.RANGE_FIELDS:
+            bounds = getattr(query, name)
+            if bounds is not None:
+                values = cols[name]
+                passes = (values >= bounds[0]) & (values <= bounds[1])
+                if name in lenient:
+                    passes |= values <= 0           # necunoscut: 0 (an, km) sau -1 (putere, motor)
+                mask &= passes
+        for column, attr in SearchQuery.ENUM_FIELDS:
+            values = getattr(query, attr)
+            if values:
+                passes = cols[column].isin(values)
+                if column in lenient:
+                    passes |= cols[column].isin(["Unknown"])
+                mask &= passes
+        return mask
+
+    def filter(self, query: "SearchQuery", lenient: Iterable[str] = ()) -> "CarSpecsTable":
+        return self[self.tolerance_mask(query, lenient)]
+
+    def to_frame(self) -> "pd.DataFrame":
+        """DataFrame cu coloanele CarSpecs; câmpurile enum devin pandas Categorical (fără copii de stringuri)."""
+        import pandas as pd
+
+        data: Dict[str, object] = {}
+        for name in CarSpecs.__dataclass_fields__:
+            col = self.columns.get(name)
+            if col is None:
+                data[name] = pd.Series(self.NO_TITLE, index=range(len(self)), dtype=object)
+            elif name in self.OPTIONAL:
+                data[name] = pd.arrays.IntegerArray(np.where(col < 0, 0, col), col < 0)
+            elif isinstance(col, np.ndarray):
+                data[name] = col
+            elif isinstance(col, _CategoricalColumn):
+                data[name] = pd.Categorical.from_codes(col.codes, categories=col.categories)
+            else:
+                data[name] = col.to_list()
+        return pd.DataFrame(data)
+
+    def to_arrow(self):
+        """pyarrow.Table (dependență opțională): stringurile se predau ca buffere, fără copiere per rând."""
+        import pyarrow as pa
+
+        arrays = []
+        for name in CarSpecs.__dataclass_fields__:
+            col = self.columns.get(name)
+            if col is None:
+                arrays.append(pa.array([self.NO_TITLE] * len(self), type=pa.string()))
+            elif name in self.OPTIONAL:
+                arrays.append(pa.array(col, mask=col < 0))
+            elif isinstance(col, np.ndarray):
+                arrays.append(pa.array(col))
+            elif isinstance(col, _CategoricalColumn):
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(col.codes), pa.array(col.categories, type=pa.string())))
+            else:
+                arrays.append(col.to_arrow())
+        return pa.Table.from_arrays(arrays, names=list(CarSpecs.__dataclass_fields__))
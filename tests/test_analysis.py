@@ -0,0 +1,65 @@
+"""PriceAnalyzer.classify_many față de classify_car, rând cu rând."""
+from dataclasses import replace
+
+import pytest
+
+from olx_analyzer import CarSpecs, PriceAnalyzer, cars_to_frame
+
+REFERENCE = CarSpecs(
+    "Golf 7 1.6 TDI", 10000.0, "10 000 EUR", "Volkswagen", "golf", 2016, 150000, "diesel", "manual",
+    "hatchback", 110, 1598, "used", "Alb", "https://www.olx.ro/d/oferta/golf-ID0000.html",
+)
+
+# (descriere, modificările față de referință)
+CASES = [
+    ("identic", {}),
+    ("fără preț", {"price": 0.0}),
+    ("mai ieftin", {"price": 8500.0}),
+    ("mult mai ieftin", {"price": 2000.0}),
+    ("mai scump", {"price": 11999.0}),
+    ("mult mai scump", {"price": 30000.0}),
+    ("alt combustibil", {"fuel": "benzina"}),
+    ("combustibil necunoscut", {"fuel": "Unknown"}),
+    ("an la toleranță, mai nou", {"year": 2018}),
+    ("an la toleranță, mai vechi", {"year": 2014}),
+    ("km la toleranță, mai puțini", {"km": 120000}),
+    ("km la toleranță, mai mulți", {"km": 180000}),
+    ("km la plafonul bonusului", {"km": 0}),
+    ("km la plafonul penalizării", {"km": 350000}),
+    ("un km diferență", {"km": 150001}),
+    ("scor exact 90", {"km": 250000}),
+    ("scor exact 70", {"year": 2010}),
+    ("scor exact 50", {"year": 2006}),
+    ("scor negativ", {"price": 30000.0, "year": 1995, "km": 500000, "fuel": "benzina"}),
+    ("scor fracționar negativ", {"price": 14999.0, "year": 2002, "km": 175000}),
+    ("altă marcă", {"brand": "Skoda", "model": "octavia"}),
+    ("alt model", {"model": "passat", "price": 100.0}),
+    ("model cu alte majuscule", {"model": "Golf"}),
+]
+
+
+@pytest.mark.parametrize("reference_price", [10000.0, 0.0])
+def test_classify_many_matches_classify_car(reference_price):
+    reference = replace(REFERENCE, price=reference_price)
+    cars = [replace(REFERENCE, link=f"https://www.olx.ro/d/oferta/golf-ID{n + 1:04d}.html", **changes)
+            for n, (_, changes) in enumerate(CASES)]
+    results = PriceAnalyzer.classify_many(reference, cars_to_frame(cars))
+    explanations = PriceAnalyzer.explain_many(reference, results)
+    for (name, _), car, category, score, explanation in zip(
+        CASES, cars, results["category"], results["score"], explanations
+    ):
+        assert (category, int(score), explanation) == PriceAnalyzer.classify_car(reference, car), name
+
+
+def test_cases_cover_the_edges():
+    results = {
+        name: PriceAnalyzer.classify_car(REFERENCE, replace(REFERENCE, **changes))
+        for name, changes in CASES
+    }
+    assert results["scor exact 90"][:2] == ("EXCELENT", 90)
+    assert results["scor exact 70"][:2] == ("BUN", 70)
+    assert results["scor exact 50"][:2] == ("ACCEPTABIL", 50)
+    assert results["scor negativ"][1] < 0
+    # -2.5 se trunchiază spre zero, ca int()
+    assert results["scor fracționar negativ"][1] == -2
+    assert results["altă marcă"][:2] == results["alt model"][:2] == ("EXCLUS", 0)
@@ -0,0 +1,54 @@
+"""Paritatea backend-urilor HTML pe corpusul din tests/fixtures (sintetic și transcris după OLX):
+aceleași CarSpecs și aceleași carduri de rezultate."""
+from dataclasses import asdict
+
+import pytest
+
+from olx_analyzer import OLXExtractorFixed, SearchCrawler, available_backends
+from olx_analyzer.page import HTML_BACKENDS
+
+REFERENCE = "html.parser"
+BACKENDS = [name for name in HTML_BACKENDS if name != REFERENCE]
+
+
+def _extractor(backend: str) -> OLXExtractorFixed:
+    if backend not in available_backends():
+        pytest.skip(f"backend-ul {backend} nu e instalat")
+    return OLXExtractorFixed(backend=backend)
+
+
+def test_reference_extracts_listings(listing_pages):
+    extractor = _extractor(REFERENCE)
+    for name, content in listing_pages:
+        car = extractor.parse_listing(content, f"https://www.olx.ro/d/oferta/{name}")
+        assert car.brand != "Unknown" and car.year > 0 and car.km > 0 and car.price > 0, name
+
+
+@pytest.fixture(params=["synthetic", "recorded"])
+def listings(request, listing_pages, recorded_listing_pages):
+    return listing_pages if request.param == "synthetic" else recorded_listing_pages
+
+
+@pytest.fixture(params=["synthetic", "recorded"])
+def searches(request, search_pages, recorded_search_pages):
+    return search_pages if request.param == "synthetic" else recorded_search_pages
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_listing_parity(backend, listings):
+    extractor, reference = _extractor(backend), _extractor(REFERENCE)
+    assert listings
+    for name, content in listings:
+        url = f"https://www.olx.ro/d/oferta/{name}"
+        assert asdict(extractor.parse_listing(content, url)) == asdict(reference.parse_listing(content, url)), name
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_search_page_parity(backend, searches):
+    crawler, reference = SearchCrawler(_extractor(backend)), SearchCrawler(_extractor(REFERENCE))
+    assert searches
+    for name, content in searches:
+        url = "https://www.olx.ro/auto-masini-moto-ambarcatiuni/autoturisme/"
+        results, has_next = crawler.parse_search_page(content, url)
+        assert results
+        assert (results, has_next) == reference.parse_search_page(content, url), name
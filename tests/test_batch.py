@@ -0,0 +1,87 @@
+"""batch.py pe paginile din tests/fixtures, cu --offline: reluarea după o oprire și calea planificată."""
+import json
+from pathlib import Path
+
+import pytest
+
+import batch
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    pages = sorted([str(p) for p in FIXTURES.glob("*.html")] + [str(p) for p in (FIXTURES / "recorded").glob("*-ID*.html")])
+    path = tmp_path / "urls.txt"
+    path.write_text("# pagini salvate\n" + "\n".join(pages + pages[:2]) + "\n", encoding="utf-8")
+    return path, pages
+
+
+def _run(monkeypatch, cache_dir, inputs, output, *extra):
+    # depozitul, statisticile și cache-ul HTTP (gol, offline) într-un director al testului
+    monkeypatch.setenv("OLX_CACHE_DIR", str(cache_dir))
+    assert batch.main([str(inputs), "-o", str(output), "--workers", "2", "--offline", "--progress", "0", *extra]) == 0
+
+
+def _jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.mark.parametrize("plan_batch", ["0", "4"])
+def test_every_input_once(monkeypatch, tmp_path, inputs, plan_batch):
+    path, pages = inputs
+    output = tmp_path / "out.jsonl"
+    _run(monkeypatch, tmp_path / "cache", path, output, "--plan-batch", plan_batch)
+    records = _jsonl(output)
+    assert sorted(r["input"] for r in records) == pages
+    assert all(r["status"] == "ok" and r["brand"] != "Unknown" for r in records)
+
+
+def test_planned_path_matches_per_listing_searches(monkeypatch, tmp_path, inputs):
+    path, _ = inputs
+    runs = {}
+    for plan_batch in ("0", "5"):
+        output = tmp_path / f"out-{plan_batch}.jsonl"
+        _run(monkeypatch, tmp_path / f"cache-{plan_batch}", path, output, "--plan-batch", plan_batch)
+        runs[plan_batch] = {r["input"]: r for r in _jsonl(output)}
+    assert runs["0"] == runs["5"]
+
+
+def test_jsonl_resume_after_interruption(monkeypatch, tmp_path, inputs):
+    path, pages = inputs
+    output = tmp_path / "out.jsonl"
+    _run(monkeypatch, tmp_path / "cache", path, output, "--plan-batch", "4")
+    lines = output.read_text(encoding="utf-8").splitlines(keepends=True)
+    kept = [json.loads(line) for line in lines[:5]]
+    # oprire bruscă: 5 rânduri complete, unul eșuat și unul scris pe jumătate
+    failed = dict(json.loads(lines[5]), status="error", error="ConnectionError: test")
+    output.write_text("".join(lines[:5]) + json.dumps(failed) + "\n" + lines[6][:40], encoding="utf-8")
+
+    _run(monkeypatch, tmp_path / "cache", path, output, "--plan-batch", "4")
+    records = _jsonl(output)
+    assert records[:6] == kept + [failed]
+    # doar intrările fără rând "ok" au fost procesate din nou, inclusiv cea eșuată
+    resumed = records[6:]
+    assert sorted(r["input"] for r in resumed) == sorted(set(pages) - {r["input"] for r in kept})
+    assert all(r["status"] == "ok" for r in resumed)
+
+
+def test_parquet_resume_skips_written_parts(monkeypatch, tmp_path, inputs):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    path, pages = inputs
+    output = tmp_path / "out.parquet"
+    _run(monkeypatch, tmp_path / "cache", path, output, "--flush-every", "4")
+    parts = sorted(output.glob("part-*.parquet"))
+    assert len(parts) == -(-len(pages) // 4)
+    # oprire în timpul scrierii ultimelor fișiere: rămâne doar primul, plus un .tmp neterminat
+    first = set(pd.read_parquet(parts[0])["input"])
+    for part in parts[1:]:
+        part.unlink()
+    (output / "part-00001.tmp").write_bytes(b"PAR1")
+
+    _run(monkeypatch, tmp_path / "cache", path, output, "--flush-every", "4")
+    frame = pd.concat(pd.read_parquet(p) for p in sorted(output.glob("part-*.parquet")))
+    assert sorted(frame["input"]) == pages
+    assert set(pd.read_parquet(output / "part-00001.parquet")["input"]).isdisjoint(first)
+    assert (frame["status"] == "ok").all()
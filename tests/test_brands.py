@@ -0,0 +1,59 @@
+"""BrandCatalogue: marca și modelul din titluri, cu aliasuri (vw, range rover) și mărci fără model."""
+import pytest
+
+from olx_analyzer import BRAND_CATALOGUE, BrandCatalogue
+
+# (titlu, (marca, modelul), (marca, modelul) cu guess_model=True)
+TITLES = [
+    ("VW Golf 7 2.0 TDI Highline", ("Volkswagen", "GOLF"), ("Volkswagen", "GOLF")),
+    ("vând vw passat b8 2017", ("Volkswagen", "PASSAT"), ("Volkswagen", "PASSAT")),
+    ("Volkswagen T-Roc 1.5 TSI", ("Volkswagen", "T ROC"), ("Volkswagen", "T ROC")),
+    ("Mercedes-Benz GLC 220d 4Matic", ("Mercedes", "GLC"), ("Mercedes", "GLC")),
+    ("BMW Seria 3 320d", ("BMW", "SERIA 3"), ("BMW", "SERIA 3")),
+    ("Audi A4 Allroad quattro", ("Audi", "A4 ALLROAD"), ("Audi", "A4 ALLROAD")),
+    ("Mazda 3 2019", ("Mazda", "3"), ("Mazda", "3")),
+    # aliasul-model fără marcă: "range rover" e Land Rover, iar modelul cel mai lung câștigă
+    ("Range Rover 4.4 SDV8 Vogue", ("Land Rover", "RANGE ROVER"), ("Land Rover", "RANGE ROVER")),
+    ("Range Rover Sport 2018", ("Land Rover", "RANGE ROVER SPORT"), ("Land Rover", "RANGE ROVER SPORT")),
+    ("range-rover evoque", ("Land Rover", "RANGE ROVER EVOQUE"), ("Land Rover", "RANGE ROVER EVOQUE")),
+    ("Land Rover Range Rover Velar", ("Land Rover", "RANGE ROVER VELAR"), ("Land Rover", "RANGE ROVER VELAR")),
+    ("Land Rover Discovery Sport", ("Land Rover", "DISCOVERY SPORT"), ("Land Rover", "DISCOVERY SPORT")),
+    # model în afara catalogului: doar guess_model îl ia, și niciodată un an
+    ("Skoda Favorit 1990", ("Skoda", None), ("Skoda", "FAVORIT")),
+    ("Dacia 2015 unic proprietar", ("Dacia", None), ("Dacia", None)),
+    ("Opel", ("Opel", None), ("Opel", None)),
+    ("mașină fără marcă", (None, None), (None, None)),
+]
+
+
+@pytest.mark.parametrize("title, expected, guessed", TITLES)
+def test_find(title, expected, guessed):
+    assert BRAND_CATALOGUE.find(title) == expected
+    assert BRAND_CATALOGUE.find(title, guess_model=True) == guessed
+
+
+@pytest.mark.parametrize("text, brand, slug", [
+    ("VW", "Volkswagen", "volkswagen"),
+    ("Range Rover", "Land Rover", "land-rover"),
+    ("land-rover", "Land Rover", "land-rover"),
+    ("Mercedes-Benz", "Mercedes", "mercedes-benz"),
+    ("mercedes benz", "Mercedes", "mercedes-benz"),
+    # un model nu e o marcă, iar un nume necunoscut devine slug așa cum e
+    ("Golf", None, "golf"),
+    ("Alfa Romeo", None, "alfa-romeo"),
+])
+def test_brand_for_text_and_slug(text, brand, slug):
+    assert BRAND_CATALOGUE.brand_for_text(text) == brand
+    assert BRAND_CATALOGUE.slug(text) == slug
+
+
+@pytest.mark.parametrize("title, expected, guessed", [
+    ("Lada Niva 4x4", ("Lada", None), ("Lada", "NIVA")),
+    ("lada 1985", ("Lada", None), ("Lada", None)),
+    ("VAZ Jiguli 2107", ("Lada", None), ("Lada", "JIGULI")),
+])
+def test_brand_without_models(title, expected, guessed):
+    catalogue = BrandCatalogue()
+    catalogue.add_brand("Lada", "lada", aliases=("vaz",))
+    assert catalogue.find(title) == expected
+    assert catalogue.find(title, guess_model=True) == guessed
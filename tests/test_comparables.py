@@ -0,0 +1,213 @@
+"""Anunțurile comparabile: depozitul local față de căutarea pe OLX și căutările comasate de SearchPlanner."""
+import itertools
+from dataclasses import replace
+from typing import List
+
+import pytest
+
+from olx_analyzer import (
+    CarSpecs,
+    ListingStore,
+    OLXExtractorFixed,
+    SearchCrawler,
+    SearchPlanner,
+    SearchQuery,
+    find_comparables,
+)
+
+
+def olx_passes(query: SearchQuery, car: CarSpecs) -> bool:
+    """Filtrele căutării aplicate de OLX, pe valorile reale ale anunțului."""
+    if car.brand != query.brand or (query.model and car.model.lower() != query.model.lower()):
+        return False
+    if query.body and car.body != query.body:
+        return False
+    for name in SearchQuery.RANGE_FIELDS:
+        bounds = getattr(query, name)
+        if bounds is not None and not bounds[0] <= getattr(car, name) <= bounds[1]:
+            return False
+    return all(not getattr(query, attr) or getattr(car, column) in getattr(query, attr) for column, attr in SearchQuery.ENUM_FIELDS)
+
+
+def test_store_answers_like_the_live_search(extractor):
+    crawler = SearchCrawler(extractor)
+    store = ListingStore(":memory:")
+    wide = SearchQuery(brand="Volkswagen", model="golf", power=(100, 200), fuels=("diesel",))
+    live = list(find_comparables(crawler, store, wide))
+    # cardurile de rezultate nu au putere: au trecut filtrul de putere al lui OLX
+    assert live and all(car.power is None for car in live)
+    assert store.covering_search(wide) is not None
+    requests = len(extractor.fetched)
+
+    narrow = replace(wide, year=(2012, 2020), km=(0, 200000))
+    excluded = live[0].link
+    local = list(find_comparables(crawler, store, narrow, exclude=[excluded]))
+    assert len(extractor.fetched) == requests
+    expected = [c.link for c in live if 2012 <= c.year <= 2020 and c.km <= 200000 and c.link != excluded]
+    assert expected
+    assert sorted(c.link for c in local) == sorted(expected)
+
+
+def test_narrower_card_filter_is_searched_again(extractor):
+    crawler = SearchCrawler(extractor)
+    store = ListingStore(":memory:")
+    wide = SearchQuery(brand="Volkswagen", model="golf", power=(100, 200))
+    list(find_comparables(crawler, store, wide))
+    requests = len(extractor.fetched)
+
+    # un anunț fără putere găsit de `wide` poate avea 180 CP: depozitul nu poate răspunde
+    stricter = replace(wide, power=(120, 150))
+    assert store.covering_search(stricter) is None
+    list(find_comparables(crawler, store, stricter))
+    assert len(extractor.fetched) > requests
+
+
+def test_store_lenient_only_for_listings_of_the_covering_search():
+    store = ListingStore(":memory:")
+    golf = SearchQuery(brand="Volkswagen", model="golf", year=(2010, 2020), power=(100, 130))
+    gti = replace(golf, power=(200, 250))
+    cars = [
+        CarSpecs("Golf", 9000.0, "9000 EUR", "Volkswagen", "golf", 2015, 150000, "diesel", "manual", "hatchback",
+                 None, None, "used", "Unknown", f"https://www.olx.ro/d/oferta/golf-ID{n:04d}.html")
+        for n in range(4)
+    ]
+    store.upsert(cars)
+    # aceleași modele, găsite de căutări cu filtre de putere diferite; cardurile n-au putere
+    store.record_search(golf, ["ID0000", "ID0001"])
+    store.record_search(gti, ["ID0002", "ID0003"])
+
+    narrow = replace(golf, year=(2014, 2016))
+    saved = store.covering_search(narrow)
+    assert saved == golf
+    assert sorted(c.link[-11:-5] for c in store.query(narrow, source=saved)) == ["ID0000", "ID0001"]
+    assert store.query(narrow) == []
+
+
+@pytest.fixture(scope="module")
+def market(listing_pages) -> List[CarSpecs]:
+    """Variante (an, km) ale anunțurilor din corpus: mai multe anunțuri pe aceeași motorizare."""
+    extractor = OLXExtractorFixed()
+    cars = []
+    for name, content in listing_pages:
+        car = extractor.parse_listing(content, f"https://www.olx.ro/d/oferta/{name}")
+        stem = name[:-len(".html")]
+        for n, (dy, dk) in enumerate(itertools.product(range(-2, 3), range(-60000, 60001, 15000))):
+            link = f"https://www.olx.ro/d/oferta/{stem}x{n:02d}.html"
+            cars.append(replace(car, year=car.year + dy, km=max(1000, car.km + dk), link=link))
+    return cars
+
+
+class MarketCrawler:
+    """În locul lui SearchCrawler: anunțurile din `market` care trec filtrele căutării, cu paginile cerute numărate."""
+
+    def __init__(self, market: List[CarSpecs], max_pages: int = 5):
+        # cardurile de rezultate: jumătate fără putere și motor
+        self.shown = [(car, replace(car, power=None, engine_size=None) if n % 2 else car) for n, car in enumerate(market)]
+        self.max_pages = max_pages
+        self.query = None
+        self.requests = 0
+        self.last_crawl_complete = False
+
+    def crawl(self, search_url, defaults=None, exclude=()):
+        found = [shown for car, shown in self.shown if olx_passes(self.query, car)]
+        pages = max(1, -(-len(found) // SearchPlanner.PAGE_SIZE))
+        self.requests += min(pages, self.max_pages)
+        self.last_crawl_complete = pages <= self.max_pages
+        return iter(found[:self.max_pages * SearchPlanner.PAGE_SIZE])
+
+    def crawl_many(self, store: ListingStore):
+        def crawl_many(cells):
+            results = []
+            for cell in cells:
+                self.query = cell
+                results.append(SearchPlanner.crawl(self, store, cell))
+            return results
+        return crawl_many
+
+
+def segment_pages(market: List[CarSpecs], queries: List[SearchQuery]) -> int:
+    """Paginile unei singure căutări per segment, pe cutia an × km a tuturor căutărilor lui."""
+    segments = {}
+    for query in queries:
+        segments.setdefault(replace(query, year=None, km=None), []).append(query)
+    pages = 0
+    for segment, members in segments.items():
+        hull = replace(
+            segment,
+            year=(min(q.year[0] for q in members), max(q.year[1] for q in members)),
+            km=(min(q.km[0] for q in members), max(q.km[1] for q in members)),
+        )
+        pages += max(1, -(-sum(olx_passes(hull, car) for car in market) // SearchPlanner.PAGE_SIZE))
+    return pages
+
+
+def test_plan_covers_every_query(market):
+    queries = [SearchQuery.similar_to(car) for car in market[::7]]
+    plan = SearchPlanner().plan(queries)
+    assert len(plan) < len(queries)
+    for i, query in enumerate(queries):
+        cells = [cell for cell, members in plan if i in members]
+        assert all(replace(cell, year=None, km=None) == replace(query, year=None, km=None) for cell in cells)
+        # celulele căutării îi acoperă toată cutia an × km
+        assert SearchPlanner._uncovered(query, cells) == []
+
+    # după căutarea celulelor, planul e răspuns în întregime din depozit
+    store = ListingStore(":memory:")
+    for cell, _ in plan:
+        store.record_search(cell)
+    assert all(store.covering_search(cell) is not None for cell, _ in SearchPlanner().plan(queries, store))
+
+
+def test_fan_out_matches_separate_searches(market):
+    references = market[::7]
+    queries = [SearchQuery.similar_to(car) for car in references]
+    plan = SearchPlanner().plan(queries)
+    assert any(len(members) > 1 for _, members in plan)
+
+    shown = dict((car.link, card) for car, card in MarketCrawler(market).shown)
+    got = {i: set() for i in range(len(queries))}
+    for cell, members in plan:
+        found = [shown[car.link] for car in market if olx_passes(cell, car)]
+        for i in members:
+            got[i].update(car.link for car in SearchPlanner.fan_out(cell, queries[i], found, exclude=[references[i].link]))
+    for i, query in enumerate(queries):
+        assert got[i] == {car.link for car in market if olx_passes(query, car) and car.link != references[i].link}
+
+
+@pytest.mark.parametrize("lots", [1, 4])
+def test_requests_follow_segment_pages_not_cars(market, lots):
+    crawler = MarketCrawler(market)
+    store = ListingStore(":memory:")
+    planner = SearchPlanner()
+    queries = [SearchQuery.similar_to(car) for car in market]
+    size = -(-len(queries) // lots)
+    for start in range(0, len(queries), size):
+        lot, references = queries[start:start + size], market[start:start + size]
+        results = planner.run(lot, crawler.crawl_many(store), store, exclude=[[car.link] for car in references])
+        for i, (query, reference) in enumerate(zip(lot, references)):
+            if i not in results:
+                # acoperită de o căutare salvată: find_comparables îi răspunde local
+                assert store.covering_search(query) is not None
+                continue
+            expected = {car.link for car in market if olx_passes(query, car) and car.link != reference.link}
+            assert {car.link for car in results[i]} == expected
+
+    # câte un anunț de referință pentru fiecare variantă din piață, dar cererile rămân cât paginile segmentelor
+    pages = segment_pages(market, queries)
+    assert pages < len(queries) / 10
+    assert crawler.requests <= 1.5 * pages
+
+
+def test_failed_searches_are_not_split(market):
+    # offline fără cache sau eroare de rețea: nicio pagină citită, căutarea nu se reia pe jumătăți
+    searched = []
+
+    def crawl_many(cells):
+        searched.extend(cells)
+        return [([], False) for _ in cells]
+
+    queries = [SearchQuery.similar_to(car) for car in market[::7]]
+    planner = SearchPlanner()
+    assert planner.run(queries, crawl_many, ListingStore(":memory:")) == {}
+    assert len(searched) <= 2 * len(SearchPlanner().plan(queries))
+    assert planner._observed == {}
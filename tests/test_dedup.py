@@ -0,0 +1,81 @@
+"""ListingDeduplicator: perechi cunoscute de duplicate și de mașini diferite, cu și fără descrieri."""
+from dataclasses import replace
+
+import pytest
+
+from olx_analyzer import CarSpecs, ListingDeduplicator, description_simhash
+
+DESCRIPTION = (
+    "Vand Golf 7 adus din Germania, revizie facuta la 180.000 km, navigatie, xenon, "
+    "senzori parcare fata spate, climatronic, doua seturi de roti, pret negociabil."
+)
+OTHER_DESCRIPTION = (
+    "Masina de firma, intretinuta doar la reprezentanta, factura si garantie 12 luni, "
+    "accept orice test, se poate vedea in Brasov zilnic dupa ora 17."
+)
+
+# card de rezultate: fără descriere
+CARD = CarSpecs(
+    "Volkswagen Golf 7 2016", 10000.0, "10 000 EUR", "Volkswagen", "golf", 2016, 150000, "diesel", "manual",
+    "hatchback", 110, 1598, "used", "Alb", "https://www.olx.ro/d/oferta/golf-ID0000.html",
+)
+LISTING = replace(CARD, description_hash=description_simhash(DESCRIPTION))
+
+# (descriere, anunțul de bază, modificările celui de-al doilea, sunt aceeași mașină)
+CASES = [
+    ("card republicat identic", CARD, {}, True),
+    ("card, km la toleranța cardurilor", CARD, {"km": 150500}, True),
+    ("card, km peste toleranța cardurilor", CARD, {"km": 150501}, False),
+    ("card, titlu generic, km apropiați dar nu identici", CARD, {"km": 153000}, False),
+    ("card, preț la toleranța cardurilor", CARD, {"price": 9500.0}, True),
+    ("card, preț peste toleranța cardurilor", CARD, {"price": 9400.0}, False),
+    ("card, fără preț", CARD, {"price": 0.0}, True),
+    ("card, putere necunoscută", CARD, {"power": None}, True),
+    ("card, altă putere", CARD, {"power": 150}, False),
+    ("card, alt combustibil", CARD, {"fuel": "benzina"}, False),
+    ("card, alt an", CARD, {"year": 2017}, False),
+    ("card, alt model", CARD, {"model": "passat"}, False),
+    ("card, model cu alte majuscule", CARD, {"model": "GOLF"}, True),
+    ("card, alt titlu, km identici", CARD, {"title": "Vand urgent masina familiei"}, True),
+    ("card, alt titlu, km apropiați", CARD, {"title": "Vand urgent masina familiei", "km": 150200}, False),
+    ("descriere identică, km și preț schimbate", LISTING, {"km": 154000, "price": 11500.0}, True),
+    ("descriere identică, km peste toleranță", LISTING, {"km": 155001}, False),
+    ("descriere identică, preț peste toleranță", LISTING, {"price": 12600.0}, False),
+    ("descriere diferită, titlu și km identici", LISTING,
+     {"description_hash": description_simhash(OTHER_DESCRIPTION)}, False),
+    ("descriere doar la unul, km apropiați", LISTING, {"description_hash": 0, "km": 153000}, False),
+    ("descriere doar la unul, card aproape identic", LISTING, {"description_hash": 0, "km": 150300}, True),
+]
+
+
+def _pair(base: CarSpecs, changes):
+    return base, replace(base, link="https://www.olx.ro/d/oferta/golf-ID0001.html", **changes)
+
+
+@pytest.mark.parametrize("name, base, changes, same", CASES, ids=[c[0] for c in CASES])
+def test_known_pairs(name, base, changes, same):
+    dedup = ListingDeduplicator()
+    a, b = _pair(base, changes)
+    for pair in ([a, b], [b, a]):
+        clusters = dedup.cluster(pair)
+        assert (clusters[0] == clusters[1]) is same
+
+
+def test_card_tolerances_are_configurable():
+    a, b = _pair(CARD, {"km": 151500, "price": 9200.0})
+    assert ListingDeduplicator().cluster([a, b]) == [0, 1]
+    loose = ListingDeduplicator(card_km_tolerance=2000, card_price_tolerance=0.1)
+    assert loose.cluster([a, b]) == [1, 1]
+
+
+def test_relists_among_many_generic_cards():
+    # peste MAX_BUCKET carduri cu același titlu generic, km din 1000 în 1000
+    cars = [
+        replace(CARD, km=100000 + 1000 * n, price=8000.0 + 37 * n, link=f"https://www.olx.ro/d/oferta/golf-ID{n:04d}.html")
+        for n in range(120)
+    ]
+    relisted = list(range(0, 120, 13))
+    relists = [replace(cars[n], km=cars[n].km + 200, link=cars[n].link.replace("-ID", "-IDr")) for n in relisted]
+    clusters = ListingDeduplicator().cluster(cars + relists)
+    assert all(clusters[n] == clusters[len(cars) + k] for k, n in enumerate(relisted))
+    assert len(set(clusters)) == len(cars)
@@ -0,0 +1,112 @@
+"""Metrics: fără efect când e dezactivat și un export Prometheus bine format."""
+import re
+
+import pytest
+
+from olx_analyzer import Metrics, OLXExtractorFixed
+from olx_analyzer.metrics import _NO_OP
+
+_NAME = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+_LABEL = r'[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\[\\"n])*"'
+_SAMPLE_RE = re.compile(rf"^({_NAME})(?:\{{({_LABEL}(?:,{_LABEL})*)\}})? (\S+)$")
+_TYPE_RE = re.compile(rf"^# TYPE ({_NAME}) (counter|gauge|summary|histogram|untyped)$")
+_LABEL_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_prometheus(text: str):
+    """{(nume, etichete): valoare} din formatul text Prometheus; verifică gramatica și liniile TYPE."""
+    assert text == "" or text.endswith("\n")
+    types, samples, done, family = {}, {}, set(), None
+    for line in text.splitlines():
+        if line.startswith("#"):
+            m = _TYPE_RE.match(line)
+            assert m, line
+            assert m.group(1) not in types, f"TYPE dublat: {line}"
+            types[m.group(1)] = m.group(2)
+            continue
+        m = _SAMPLE_RE.match(line)
+        assert m, line
+        name, labels, value = m.groups()
+        base = re.sub(r"_(count|sum)$", "", name)
+        current = base if types.get(base) == "summary" else name
+        # TYPE înaintea primei valori, iar valorile unei familii sunt consecutive
+        assert current in types, f"fără TYPE: {line}"
+        if current != family:
+            assert current not in done, f"familie întreruptă: {line}"
+            done.add(family)
+            family = current
+        parsed = tuple(
+            (k, re.sub(r"\\(.)", lambda e: "\n" if e.group(1) == "n" else e.group(1), v))
+            for k, v in _LABEL_RE.findall(labels or "")
+        )
+        assert (name, parsed) not in samples, f"serie dublată: {line}"
+        samples[(name, parsed)] = float(value)
+    return samples
+
+
+# (descriere, apelul pe un Metrics)
+CALLS = [
+    ("incr", lambda m: m.incr("http_requests_total", status="200")),
+    ("incr cu valoare", lambda m: m.incr("http_bytes_total", 1234567)),
+    ("fallback", lambda m: m.fallback("price", "meta")),
+    ("observe", lambda m: m.observe("fetch", 0.25)),
+]
+
+
+@pytest.mark.parametrize("call", [c[1] for c in CALLS], ids=[c[0] for c in CALLS])
+def test_disabled_records_nothing(call):
+    metrics = Metrics(enabled=False)
+    call(metrics)
+    assert metrics.snapshot() == {"counters": [], "stages": {}}
+    assert metrics.to_prometheus() == ""
+    enabled = Metrics()
+    call(enabled)
+    assert enabled.snapshot() != {"counters": [], "stages": {}}
+
+
+def test_disabled_contexts_are_shared_and_do_not_profile(tmp_path):
+    metrics = Metrics(enabled=False, profiler="cprofile", profile_dir=str(tmp_path / "profiles"))
+    assert metrics.stage("fetch") is _NO_OP and metrics.profile("anunt") is _NO_OP
+    with metrics.stage("fetch"), metrics.profile("anunt"):
+        pass
+    assert metrics.snapshot()["stages"] == {}
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_extractor_default_metrics_stay_empty(listing_pages):
+    extractor = OLXExtractorFixed()
+    name, content = listing_pages[0]
+    assert extractor.parse_listing(content, f"https://www.olx.ro/d/oferta/{name}") is not None
+    assert extractor.metrics.snapshot() == {"counters": [], "stages": {}}
+
+
+def test_prometheus_output_is_well_formed():
+    metrics = Metrics()
+    metrics.incr("http_requests_total", status="200")
+    metrics.incr("http_requests_total", 2, status="429")
+    metrics.incr("http_bytes_total", 1234567)
+    metrics.incr("http_errors_total", kind='Quote"Back\\slash\nNewline')
+    metrics.incr("rate_decrease_total", 0.5)
+    metrics.fallback("title", "og:title")
+    metrics.observe("fetch", 0.25)
+    metrics.observe("fetch", 0.75)
+    metrics.observe("parse", 0.001)
+
+    samples = parse_prometheus(metrics.to_prometheus())
+    assert samples == {
+        ("olx_http_bytes_total", ()): 1234567.0,
+        ("olx_http_errors_total", (("kind", 'Quote"Back\\slash\nNewline'),)): 1.0,
+        ("olx_http_requests_total", (("status", "200"),)): 1.0,
+        ("olx_http_requests_total", (("status", "429"),)): 2.0,
+        ("olx_rate_decrease_total", ()): 0.5,
+        ("olx_extract_source_total", (("field", "title"), ("source", "og:title"))): 1.0,
+        ("olx_stage_seconds_count", (("stage", "fetch"),)): 2.0,
+        ("olx_stage_seconds_sum", (("stage", "fetch"),)): 1.0,
+        ("olx_stage_seconds_max", (("stage", "fetch"),)): 0.75,
+        ("olx_stage_seconds_count", (("stage", "parse"),)): 1.0,
+        ("olx_stage_seconds_sum", (("stage", "parse"),)): 0.001,
+        ("olx_stage_seconds_max", (("stage", "parse"),)): 0.001,
+    }
+    assert parse_prometheus(metrics.to_prometheus(prefix="")).keys() == {
+        (name[len("olx_"):], labels) for name, labels in samples
+    }
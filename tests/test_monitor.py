@@ -0,0 +1,116 @@
+"""MarketWatch.poll: evenimentele dintre două verificări ale acelorași pagini de căutare."""
+from typing import Dict, List, Optional
+
+import pytest
+
+from olx_analyzer import CarSpecs, ListingStore, MarketWatch, OLXExtractorFixed, SearchCrawler, SearchQuery, listing_id
+from olx_analyzer import monitor
+
+QUERY = SearchQuery(brand="Volkswagen", model="golf", fuels=("diesel",))
+# cu 2 ani mai nouă decât anunțurile: doar cele sub 10.000 EUR ies EXCELENT
+REFERENCE = CarSpecs(
+    "Golf 7 1.6 TDI", 10000.0, "10 000 EUR", "Volkswagen", "golf", 2018, 150000, "diesel", "manual",
+    "hatchback", 110, 1598, "used", "Alb", "https://www.olx.ro/d/oferta/golf-referinta-IDref.html",
+)
+
+
+class MarketExtractor(OLXExtractorFixed):
+    """Pagina de căutare e generată din `cards` (ID -> preț), mutat de test între verificări."""
+
+    def __init__(self):
+        super().__init__(backend="html.parser")
+        self.cards: Dict[str, float] = {}
+        self.offline = False
+        self.fetched: List[str] = []
+
+    def fetch_page(self, url: str) -> Optional[bytes]:
+        self.fetched.append(url)
+        if self.offline or "/d/oferta/" in url:
+            return None
+        cards = "".join(
+            f'<div data-cy="l-card" id="{lid}"><a href="/d/oferta/volkswagen-golf-2016-{lid}.html"><h4>Volkswagen Golf 2016</h4></a>'
+            f'<p data-testid="ad-price">{price:,.0f} €</p><span>2016 - 150 000 km</span></div>'.replace(",", ".")
+            for lid, price in self.cards.items()
+        )
+        return f"<html><body>{cards}</body></html>".encode()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+
+    def tick():
+        now[0] += 1
+        return now[0]
+
+    monkeypatch.setattr(monitor.time, "time", tick)
+    return now
+
+
+@pytest.fixture
+def market(clock):
+    extractor = MarketExtractor()
+    watch = MarketWatch(SearchCrawler(extractor), ListingStore(":memory:"), ":memory:")
+    watch.add("golf", QUERY, REFERENCE)
+    return extractor, watch
+
+
+def _poll(watch: MarketWatch):
+    return sorted((e.kind, e.listing, e.old_price, e.car.price if e.car else None) for e in watch.poll(watch.watches()[0]))
+
+
+def test_first_poll_only_sets_the_baseline(market):
+    extractor, watch = market
+    extractor.cards = {"IDa": 14000, "IDb": 12000}
+    assert _poll(watch) == []
+    assert watch.watches()[0]["last_polled"] is not None
+
+
+def test_added_repriced_and_removed(market):
+    extractor, watch = market
+    extractor.cards = {"IDa": 14000, "IDb": 12000, "IDc": 13000}
+    _poll(watch)
+
+    extractor.cards = {"IDa": 14000, "IDb": 11000, "IDd": 9000}
+    assert _poll(watch) == [
+        ("deal", "IDd", None, 9000.0),
+        ("new", "IDd", None, 9000.0),
+        ("price_drop", "IDb", 12000.0, 11000.0),
+        ("removed", "IDc", 13000.0, None),
+    ]
+    # noul anunț a ajuns și în depozit, cu câmpurile fixate de căutare
+    stored = {listing_id(car.link): car for car in watch.store.query(QUERY)}
+    assert stored["IDd"].fuel == "diesel" and stored["IDd"].brand == "Volkswagen"
+
+    # o creștere de preț nu e „deal”, iar anunțul dispărut nu se mai raportează
+    extractor.cards = {"IDa": 14000, "IDb": 11500, "IDd": 9000}
+    assert _poll(watch) == [("price_rise", "IDb", 11000.0, 11500.0)]
+    assert _poll(watch) == []
+    # cardurile au preț, an și km: nicio pagină de anunț descărcată
+    assert not any("/d/oferta/" in url for url in extractor.fetched)
+
+
+def test_relisted_after_removal_is_new_again(market):
+    extractor, watch = market
+    extractor.cards = {"IDa": 14000, "IDb": 12000}
+    _poll(watch)
+    extractor.cards = {"IDa": 14000}
+    assert _poll(watch) == [("removed", "IDb", 12000.0, None)]
+    extractor.cards = {"IDa": 14000, "IDb": 12000}
+    assert [kind for kind, *_ in _poll(watch)] == ["new"]
+
+
+def test_failed_poll_changes_nothing(market):
+    extractor, watch = market
+    extractor.cards = {"IDa": 14000, "IDb": 12000}
+    _poll(watch)
+    extractor.offline = True
+    extractor.cards = {"IDa": 10000}
+    assert _poll(watch) == []
+    extractor.offline = False
+    # diferențele se raportează la verificarea următoare, față de starea de dinainte
+    assert _poll(watch) == [
+        ("deal", "IDa", 14000.0, 10000.0),
+        ("price_drop", "IDa", 14000.0, 10000.0),
+        ("removed", "IDb", 12000.0, None),
+    ]
@@ -0,0 +1,99 @@
+"""ComparablesIndex față de o căutare exhaustivă: aceleași distanțe, cu inserări în loturi, înlocuiri și excluderi."""
+import random
+from dataclasses import replace
+from typing import List
+
+import pytest
+
+from olx_analyzer import CarSpecs, ComparablesIndex, listing_id
+from olx_analyzer.neighbors import FEATURE_SCALES
+
+SEGMENTS = [("Volkswagen", "golf", "diesel", "manual"), ("Volkswagen", "golf", "petrol", "manual"), ("Skoda", "octavia", "diesel", "automatic")]
+
+
+def nearest_brute(cars: List[CarSpecs], car: CarSpecs, k: int, exclude=(), missing_penalty: float = 1.0) -> List[float]:
+    """Distanțele celor mai apropiate k anunțuri, calculate exhaustiv."""
+    skip = {listing_id(u) for u in exclude} | {listing_id(car.link)}
+    distances = []
+    for other in cars:
+        if ComparablesIndex.segment(other) != ComparablesIndex.segment(car) or listing_id(other.link) in skip:
+            continue
+        d2 = 0.0
+        for name, scale in FEATURE_SCALES.items():
+            a, b = getattr(other, name) or 0, getattr(car, name) or 0
+            if a > 0 and b > 0:
+                d2 += ((a - b) / scale) ** 2
+            elif a > 0 or b > 0:
+                d2 += missing_penalty ** 2
+        distances.append(d2 ** 0.5)
+    return sorted(distances)[:k]
+
+
+def _car(rng: random.Random, n: int) -> CarSpecs:
+    brand, model, fuel, gearbox = rng.choice(SEGMENTS)
+    return CarSpecs(
+        f"{brand} {model}", float(rng.randrange(3000, 30000, 100)), "", brand, model,
+        rng.randint(2005, 2024),
+        # km rotunjiți: multe distanțe egale, ca pe OLX
+        rng.randrange(0, 300000, 5000),
+        fuel, gearbox, "hatchback",
+        None if rng.random() < 0.1 else rng.choice([90, 105, 110, 122, 150, 184]),
+        None if rng.random() < 0.2 else rng.choice([1395, 1598, 1968]),
+        "used", "Alb", f"https://www.olx.ro/d/oferta/car-ID{n:06d}.html",
+    )
+
+
+def _distances(index: ComparablesIndex, car: CarSpecs, k: int, exclude=()) -> List[float]:
+    return [d for _, d in index.nearest(car, k, exclude)]
+
+
+@pytest.fixture(scope="module")
+def market():
+    rng = random.Random(5)
+    cars = [_car(rng, n) for n in range(3000)]
+    index = ComparablesIndex()
+    # în loturi, ca rezultatele care sosesc din căutări: arbori reconstruiți plus tampon
+    for start in range(0, len(cars), 100):
+        index.add(cars[start:start + 100])
+    return rng, cars, index
+
+
+@pytest.mark.parametrize("k", [1, 10, 50, 2000])
+def test_matches_brute_force(market, k):
+    rng, cars, index = market
+    for car in rng.sample(cars, 40):
+        assert _distances(index, car, k) == pytest.approx(nearest_brute(cars, car, k)), car.link
+
+
+def test_queries_outside_the_index(market):
+    rng, cars, index = market
+    # mașini care nu sunt în index, inclusiv fără nicio caracteristică cunoscută
+    queries = [_car(rng, 10000 + n) for n in range(30)]
+    queries.append(replace(queries[0], year=0, km=0, power=None, engine_size=None))
+    for car in queries:
+        assert _distances(index, car, 20) == pytest.approx(nearest_brute(cars, car, 20)), car.link
+    assert index.nearest(replace(queries[0], brand="Dacia")) == []
+
+
+def test_exclude(market):
+    rng, cars, index = market
+    car = cars[0]
+    exclude = [c.link for c, _ in index.nearest(car, 5)]
+    found = index.nearest(car, 10, exclude)
+    assert not {c.link for c, _ in found} & set(exclude)
+    assert [d for _, d in found] == pytest.approx(nearest_brute(cars, car, 10, exclude))
+
+
+def test_replaced_listings():
+    rng = random.Random(9)
+    cars = [_car(rng, n) for n in range(800)]
+    index = ComparablesIndex()
+    index.add(cars)
+    # același ID cu alți km/alt segment: anunțul vechi dispare din index
+    changed = {n: replace(cars[n], km=cars[n].km + 40000, fuel="petrol" if cars[n].fuel == "diesel" else "diesel")
+               for n in range(0, 800, 3)}
+    index.add(changed.values())
+    current = [changed.get(n, car) for n, car in enumerate(cars)]
+    assert len(index) == len(cars)
+    for car in rng.sample(current, 40):
+        assert _distances(index, car, 25) == pytest.approx(nearest_brute(current, car, 25)), car.link
@@ -0,0 +1,282 @@
+"""HTTP fără rețea: cache-ul de răspunsuri, reîncercările, întrerupătorul și limitatorul de rată,
+cu o sesiune și un ceas false în locul lui requests și al timpului real."""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, List, Optional
+
+import pytest
+
+from olx_analyzer import CircuitBreaker, OLXExtractorFixed, ResponseCache, RetryPolicy, TokenBucket
+from olx_analyzer import extractor as extractor_module
+from olx_analyzer import net
+
+LISTING = "https://www.olx.ro/d/oferta/golf-ID0001.html"
+SEARCH = "https://www.olx.ro/auto-masini-moto-ambarcatiuni/autoturisme/volkswagen/"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def close(self) -> None:
+        pass
+
+
+class FakeSession:
+    """Răspunde cu `responses` în ordine și reține antetele fiecărei cereri."""
+
+    def __init__(self, *responses: FakeResponse):
+        self.responses = list(responses)
+        self.requests: List[Dict[str, str]] = []
+
+    def get(self, url, timeout=None, headers=None, stream=False):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Ceasul lui ResponseCache, mutat de test (now[0])."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(net.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def monotonic(monkeypatch):
+    """Ceasul monoton al lui CircuitBreaker și TokenBucket, mutat de test (now[0])."""
+    now = [1000.0]
+    monkeypatch.setattr(net.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Așteptările clientului între reîncercări, înregistrate în loc de făcute."""
+    waited: List[float] = []
+    monkeypatch.setattr(extractor_module.time, "sleep", waited.append)
+    return waited
+
+
+def _extractor(cache: Optional[ResponseCache], *responses: FakeResponse, **kwargs) -> OLXExtractorFixed:
+    extractor = OLXExtractorFixed(rate=1000, burst=10, cache=cache, **kwargs)
+    extractor.session = FakeSession(*responses)
+    return extractor
+
+
+def test_ttl_expiry(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "http.sqlite"), listing_ttl=100, search_ttl=10)
+    cache.put(LISTING, b"anunt", etag='"v1"')
+    cache.put(SEARCH, b"cautare")
+    clock[0] += 50
+    assert cache.get(LISTING).fresh
+    assert not cache.get(SEARCH).fresh
+    clock[0] += 51
+    expired = cache.get(LISTING)
+    assert not expired.fresh and expired.body == b"anunt"
+    assert expired.validators() == {"If-None-Match": '"v1"'}
+
+
+def test_lru_eviction(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "http.sqlite"), max_bytes=250)
+    for n in range(2):
+        cache.put(f"{SEARCH}?page={n}", b"x" * 100)
+        clock[0] += 1
+    # pagina 0 e citită, deci pagina 1 e cea mai veche accesare
+    cache.get(f"{SEARCH}?page=0")
+    clock[0] += 1
+    cache.put(f"{SEARCH}?page=2", b"x" * 100)
+    assert cache.get(f"{SEARCH}?page=1") is None
+    assert cache.get(f"{SEARCH}?page=0") is not None and cache.get(f"{SEARCH}?page=2") is not None
+    assert cache.size() == 200
+
+
+def test_byte_cap_is_shared_by_processes(tmp_path, clock):
+    # două conexiuni la același fișier, ca workerii din batch.py
+    path = str(tmp_path / "http.sqlite")
+    first, second = ResponseCache(path, max_bytes=350), ResponseCache(path, max_bytes=350)
+    for n in range(6):
+        (first if n % 2 else second).put(f"{SEARCH}?page={n}", b"x" * 100)
+        clock[0] += 1
+    assert first.size() == second.size() == 300
+    assert [n for n in range(6) if first.get(f"{SEARCH}?page={n}") is not None] == [3, 4, 5]
+
+
+def test_304_revalidates_the_cached_body(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "http.sqlite"), listing_ttl=100)
+    extractor = _extractor(
+        cache,
+        FakeResponse(200, b"<html>v1</html>", {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}),
+        FakeResponse(304),
+    )
+    assert extractor.fetch_page(LISTING) == b"<html>v1</html>"
+    # proaspătă: nicio cerere
+    assert extractor.fetch_page(LISTING) == b"<html>v1</html>"
+    assert len(extractor.session.requests) == 1
+
+    clock[0] += 101
+    assert extractor.fetch_page(LISTING) == b"<html>v1</html>"
+    assert extractor.session.requests[-1] == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+    # 304 a prelungit TTL-ul
+    assert cache.get(LISTING).fresh
+
+
+def test_offline_serves_only_the_cache(tmp_path, clock):
+    path = str(tmp_path / "http.sqlite")
+    ResponseCache(path, listing_ttl=100).put(LISTING, b"<html>vechi</html>")
+    clock[0] += 1000
+    extractor = _extractor(ResponseCache(path, offline=True))
+    assert extractor.fetch_page(LISTING) == b"<html>vechi</html>"
+    assert extractor.fetch_page(LISTING.replace("ID0001", "ID0002")) is None
+    assert extractor.session.requests == []
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.min_requests):
+        breaker.record(breaker.allow(), False)
+    assert breaker.state == "open"
+
+
+def test_half_open_allows_exactly_one_probe(monotonic):
+    breaker = CircuitBreaker(window=4, min_requests=2, cooldown=10)
+    _open(breaker)
+    assert breaker.allow() is None
+    monotonic[0] += 10
+    assert breaker.state == "half_open"
+    probe = breaker.allow()
+    assert probe is not None
+    assert breaker.allow() is None and breaker.allow() is None
+    breaker.record(probe, True)
+    assert breaker.state == "closed" and breaker.allow() is not None
+
+
+def test_failed_probe_reopens(monotonic):
+    breaker = CircuitBreaker(window=4, min_requests=2, cooldown=10)
+    _open(breaker)
+    monotonic[0] += 10
+    breaker.record(breaker.allow(), False)
+    assert breaker.state == "open" and breaker.allow() is None
+    monotonic[0] += 10
+    assert breaker.allow() is not None
+
+
+def test_stale_success_does_not_close_a_reopened_circuit(monotonic):
+    breaker = CircuitBreaker(window=4, min_requests=2, cooldown=10)
+    slow = breaker.allow()                  # cerere lentă, trimisă cu circuitul închis
+    _open(breaker)
+    monotonic[0] += 10
+    late_probe = breaker.allow()
+    breaker.record(late_probe, False)       # proba eșuează: circuitul se redeschide
+    breaker.record(slow, True)
+    breaker.record(late_probe, True)        # rezultat dublat al unei probe vechi
+    assert breaker.state == "open" and breaker.allow() is None
+
+
+def _http_date(offset: timedelta) -> str:
+    return format_datetime(datetime.now(timezone.utc) + offset, usegmt=True)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("7", 7.0),
+    ("0", 0.0),
+    # data se formează la rulare, nu la colectarea testelor
+    (timedelta(seconds=20), 20.0),
+    (timedelta(hours=-1), 0.0),
+])
+def test_retry_after_formats(value, expected):
+    if isinstance(value, timedelta):
+        value = _http_date(value)
+    assert RetryPolicy().delay(3, value) == pytest.approx(expected, abs=1.5)
+
+
+@pytest.mark.parametrize("value", [None, "", "curând", "-5"])
+def test_retry_after_missing_or_invalid_uses_backoff(value):
+    policy = RetryPolicy(base_delay=0.5, max_delay=30)
+    assert all(0 <= policy.delay(2, value) <= 2.0 for _ in range(50))
+
+
+def test_retry_after_over_max_delay_gives_up():
+    policy = RetryPolicy(max_delay=30)
+    assert policy.delay(0, "31") is None
+    assert policy.delay(0, _http_date(timedelta(minutes=5))) is None
+
+
+def test_client_waits_retry_after_then_retries(sleeps):
+    extractor = _extractor(None, FakeResponse(429, headers={"Retry-After": "3"}), FakeResponse(200, b"ok"))
+    assert extractor.fetch_page(LISTING) == b"ok"
+    assert sleeps == [3.0]
+    assert len(extractor.session.requests) == 2
+
+
+def test_client_gives_up_when_retry_after_exceeds_max_delay(sleeps):
+    extractor = _extractor(
+        None,
+        FakeResponse(503, headers={"Retry-After": "600"}),
+        FakeResponse(200, b"ok"),
+        retry=RetryPolicy(attempts=4, max_delay=30),
+    )
+    assert extractor.fetch_page(LISTING) is None
+    assert sleeps == []
+    assert len(extractor.session.requests) == 1
+
+
+def test_extract_many_keeps_a_bounded_number_of_listings_in_flight():
+    pulled: List[int] = []
+
+    def urls():
+        for n in range(200):
+            pulled.append(n)
+            yield f"{LISTING}?n={n}"
+
+    extractor = _extractor(None)
+    extractor.extract_car_specs = lambda url: url.upper()
+    results = []
+    for url, car in extractor.extract_many(urls(), max_workers=3):
+        results.append((url, car))
+        # la fiecare rezultat: cel mult 2 * max_workers URL-uri citite și încă nepredate
+        assert len(pulled) - len(results) <= 6
+    assert sorted(url for url, _ in results) == sorted(f"{LISTING}?n={n}" for n in range(200))
+    assert all(car == url.upper() for url, car in results)
+
+
+def test_extract_many_stops_reading_urls_when_the_caller_stops():
+    pulled: List[int] = []
+
+    def urls():
+        for n in range(200):
+            pulled.append(n)
+            yield f"{LISTING}?n={n}"
+
+    extractor = _extractor(None)
+    extractor.extract_car_specs = lambda url: None
+    results = extractor.extract_many(urls(), max_workers=3)
+    next(results)
+    results.close()
+    assert len(pulled) <= 7
+
+
+def test_token_bucket_slow_down_respects_min_rate(monotonic):
+    bucket = TokenBucket(8, min_rate=1)
+    rates = []
+    for _ in range(6):
+        monotonic[0] += 10
+        assert bucket.slow_down()
+        rates.append(bucket.rate)
+    assert rates == [4, 2, 1, 1, 1, 1]
+    # o rafală de erori scade rata o singură dată
+    assert not bucket.slow_down()
+
+
+def test_token_bucket_speed_up_returns_to_the_configured_rate(monotonic):
+    bucket = TokenBucket(8, min_rate=1)
+    monotonic[0] += 10
+    bucket.slow_down(0.01)
+    assert bucket.rate == 1
+    for _ in range(100):
+        bucket.speed_up()
+    assert bucket.rate == 8
+    assert TokenBucket(8).min_rate == 0.5
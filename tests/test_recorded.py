@@ -0,0 +1,92 @@
+"""Paginile transcrise după OLX (tests/fixtures/recorded): valori verificate de mână, câmp cu câmp."""
+from pathlib import Path
+
+import pytest
+
+from olx_analyzer import OLXExtractorFixed, SearchCrawler, description_simhash
+
+RECORDED = Path(__file__).resolve().parent / "fixtures" / "recorded"
+SEARCH_URL = "https://www.olx.ro/auto-masini-moto-ambarcatiuni/autoturisme/volkswagen/"
+
+# fișier -> câmpurile CarSpecs citite din pagină
+LISTINGS = {
+    # stare JSON + JSON-LD Product; marca vine din breadcrumb
+    "volkswagen-golf-7-2-0-tdi-highline-150-cp-IDhK3pQ.html": dict(
+        title="Volkswagen Golf 7 2.0 TDI Highline, 150 CP, Navigatie, Xenon", price=11490.0,
+        price_text="11 490 EUR", brand="Volkswagen", model="GOLF", year=2016, km=185000, fuel="diesel",
+        gearbox="manual", body="hatchback", power=150, engine_size=1968, state="used", color="grey",
+    ),
+    # doar JSON-LD Car: cilindree în litri (1.0 LTR, deși pagina zice 999 cm³), putere în kW (54 kW)
+    "dacia-logan-1-0-sce-2021-unic-proprietar-IDjR7tW.html": dict(
+        title="Dacia Logan 1.0 SCe 2021, unic proprietar, garanție", price=48500.0,
+        price_text="48 500 RON", brand="Dacia", model="LOGAN", year=2021, km=42000, fuel="petrol",
+        gearbox="manual", body="sedan", power=73, engine_size=1000, state="used", color="white",
+    ),
+    # fără date structurate: totul din textul paginii; prețul cu spațiu îngust și NBSP
+    "ford-focus-1-6-tdci-2009-IDgT2bX.html": dict(
+        title="Ford Focus 1.6 TDCi 2009", price=3450.0, price_text="3 450 EUR", brand="Ford",
+        model="FOCUS", year=2009, km=214300, fuel="diesel", gearbox="manual", body="estate-car",
+        power=109, engine_size=1560, state="used", color="silver",
+    ),
+}
+
+# fișier -> (ultimele caractere din link, câmpurile din rezultat), pagina următoare
+SEARCHES = {
+    "search-volkswagen-state.html": ([
+        ("IDhK3pQ.html", dict(title="Volkswagen Golf 7 2.0 TDI Highline, 150 CP, Navigatie, Xenon", price=11490.0,
+                              price_text="11 490 EUR", model="GOLF", year=2016, km=185000, fuel="diesel",
+                              gearbox="manual", body="hatchback", engine_size=1968, power=150, state="used")),
+        ("IDhM81c.html", dict(title="VW Passat B8 2.0 TDI DSG, 2017, Variant", price=15900.0,
+                              price_text="15 900 EUR", model="PASSAT", year=2017, km=212000, fuel="diesel",
+                              gearbox="automatic", body="estate-car", engine_size=1968, power=150, state="used")),
+        ("IDhN0aa.html", dict(title="Volkswagen Polo 1.0 TSI 2020 – garanție", price=13250.0,
+                              price_text="13 250 EUR", model="POLO", year=2020, km=38500, fuel="petrol",
+                              gearbox="manual", body="hatchback", engine_size=999, power=95, state="used")),
+        ("IDhP9Zk.html", dict(title="Volkswagen Tiguan Allspace 4Motion", price=27800.0,
+                              price_text="27 800 EUR", model="TIGUAN", year=2019, km=97000, fuel="diesel",
+                              gearbox="automatic", body="suv", engine_size=1968, power=190, state="used")),
+    ], True),
+    "search-cards.html": ([
+        ("IDhQ2r4.html", dict(title="Skoda Octavia III 1.6 TDI Elegance", price=9800.0, price_text="9 800 EUR",
+                              year=2015, km=231000)),
+        ("IDhQ5Lm.html", dict(title="Dacia Duster 1.5 dCi 4x4 & carlig", price=12300.0, price_text="12 300 EUR",
+                              year=2018, km=126400)),
+        ("IDhQ7vB.html", dict(title="Ford Fiesta 1.25 benzina", price=16500.0, price_text="16 500 LEI",
+                              year=2011, km=158000)),
+        # anul din titlu (2018) nu e cel din parametri
+        ("IDhQ9Kd.html", dict(title="VW Passat B8 2.0 TDI 190 CP, facelift 2018", price=17900.0,
+                              price_text="17 900 EUR", year=2017, km=212000)),
+        # anul și km-ii în elemente separate
+        ("IDhR1sE.html", dict(title="Opel Astra J 1.4 Turbo", price=5300.0, price_text="5 300 EUR",
+                              year=2012, km=96000)),
+    ], False),
+}
+
+
+@pytest.mark.parametrize("name", LISTINGS)
+def test_listing_fields(name):
+    url = f"https://www.olx.ro/d/oferta/{name}"
+    car = OLXExtractorFixed(backend="html.parser").parse_listing((RECORDED / name).read_bytes(), url)
+    assert {k: getattr(car, k) for k in LISTINGS[name]} == LISTINGS[name]
+    assert car.link == url
+
+
+def test_state_description_is_stripped_of_html():
+    name = "volkswagen-golf-7-2-0-tdi-highline-150-cp-IDhK3pQ.html"
+    car = OLXExtractorFixed(backend="html.parser").parse_listing((RECORDED / name).read_bytes(), name)
+    assert car.description_hash == description_simhash(
+        "Vand Golf 7 Highline, adus din Germania in 2021. Revizie facuta la 180.000 km (ulei, filtre, distributie). "
+        "Dotari: navigatie, xenon, senzori parcare fata/spate, climatronic. Pret negociabil la vazarea masinii."
+    )
+
+
+@pytest.mark.parametrize("name", SEARCHES)
+def test_search_page_fields(name):
+    crawler = SearchCrawler(OLXExtractorFixed(backend="html.parser"))
+    results, has_next = crawler.parse_search_page((RECORDED / name).read_bytes(), SEARCH_URL)
+    expected, expected_next = SEARCHES[name]
+    assert has_next == expected_next
+    assert len(results) == len(expected)
+    for (link, fields), (suffix, expected_fields) in zip(results, expected):
+        assert link.startswith("https://www.olx.ro/d/oferta/") and link.endswith(suffix)
+        assert fields == expected_fields, suffix
@@ -0,0 +1,45 @@
+"""SearchCrawler: câmpurile din cardurile de rezultate și completarea lor cu filtrele căutării."""
+import pytest
+
+from olx_analyzer import OLXExtractorFixed, SearchCrawler
+
+LINK = "https://www.olx.ro/d/oferta/volkswagen-golf-IDhK3pQ.html"
+
+
+def _card(price=(), texts=(), title=("Volkswagen Golf 7",)):
+    return {"id": "1", "href": LINK, "title": list(title), "price": list(price), "texts": list(texts)}
+
+
+# (descriere, card, câmpurile așteptate în afară de titlu)
+CARDS = [
+    ("an și km", _card(["11 490 €"], ["2016 - 185.000 km", "Cluj-Napoca - 12 octombrie 2026"]),
+     dict(price=11490.0, price_text="11 490 EUR", year=2016, km=185000)),
+    ("an în titlu", _card(["9 000 €"], ["2015 - 200 000 km"], title=("Golf 7 facelift 2017",)),
+     dict(price=9000.0, price_text="9 000 EUR", year=2015, km=200000)),
+    ("elemente separate", _card(["9 000 €"], ["2015", "200 000 km"]),
+     dict(price=9000.0, price_text="9 000 EUR", year=2015, km=200000)),
+    ("doar km", _card(["9 000 €"], ["2 000 km"]), dict(price=9000.0, price_text="9 000 EUR", km=2000)),
+    ("an în data anunțului", _card(["9 000 €"], ["Iași - 14 octombrie 2026"]),
+     dict(price=9000.0, price_text="9 000 EUR")),
+    ("km nerealiști", _card(["9 000 €"], ["2015 - 2 000 000 km"]),
+     dict(price=9000.0, price_text="9 000 EUR", year=2015)),
+    ("lei, spațiu NBSP, preț negociabil", _card(["48\u00a0500 lei", "Prețul e negociabil"], ["2021 - 42.000 km"]),
+     dict(price=48500.0, price_text="48 500 LEI", year=2021, km=42000)),
+    ("monedă lipită de cuvânt", _card(["1 200 euroi"]), {}),
+    ("fără preț", _card(["Schimb"], ["2016 - 185.000 km"]), dict(year=2016, km=185000)),
+]
+
+
+@pytest.mark.parametrize("name, card, expected", CARDS, ids=[c[0] for c in CARDS])
+def test_card_fields(name, card, expected):
+    fields = SearchCrawler(OLXExtractorFixed(backend="html.parser"))._card_fields(card)
+    assert fields == dict(expected, title=card["title"][0])
+
+
+def test_search_defaults_only_fill_missing_fields():
+    crawler = SearchCrawler(OLXExtractorFixed(backend="html.parser"))
+    car = crawler._complete(
+        {"model": "GOLF", "price": 9000.0, "year": 2015, "km": 200000, "fuel": "diesel"}, LINK,
+        {"brand": "Volkswagen", "model": "golf", "fuel": "petrol", "body": "hatchback"},
+    )
+    assert (car.brand, car.model, car.fuel, car.body) == ("Volkswagen", "GOLF", "diesel", "hatchback")
@@ -0,0 +1,99 @@
+"""QuantileSketch (eroarea de rang, merge) și MarketStats (re-prețuire, anunțuri vândute)."""
+import bisect
+import random
+from dataclasses import replace
+
+import pytest
+
+from olx_analyzer import CarSpecs, MarketStats
+from olx_analyzer.stats import QuantileSketch
+
+DAY = 24 * 3600
+
+
+def true_rank(values, value):
+    return bisect.bisect_right(values, value) / len(values)
+
+
+def max_rank_error(sketch, values):
+    values = sorted(values)
+    return max(abs(sketch.rank(v) - true_rank(values, v)) for v in values[::97])
+
+
+@pytest.fixture
+def seeded():
+    random.seed(7)
+
+
+def test_sketch_is_exact_below_k(seeded):
+    values = [float(v) for v in range(150)]
+    random.shuffle(values)
+    sketch = QuantileSketch(k=200)
+    for v in values:
+        sketch.update(v)
+    assert max_rank_error(sketch, values) == 0
+    assert sketch.quantile(0.5) == 74.0
+
+
+def test_sketch_rank_error(seeded):
+    values = [random.lognormvariate(9, 0.5) for _ in range(50000)]
+    sketch = QuantileSketch(k=200)
+    for v in values:
+        sketch.update(v)
+    assert sketch.n == len(values)
+    assert sum(len(items) for items in sketch.levels) < 1000
+    assert max_rank_error(sketch, values) < 0.02
+
+
+def test_sketch_merge(seeded):
+    values = [random.uniform(1000, 30000) for _ in range(40000)]
+    parts = [QuantileSketch(k=200) for _ in range(4)]
+    for n, v in enumerate(values):
+        parts[n % 4].update(v)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.n == len(values)
+    assert max_rank_error(merged, values) < 0.02
+    # serializat și citit înapoi, același sketch
+    restored = QuantileSketch.from_dict(merged.to_dict())
+    assert restored.quantile(0.5) == merged.quantile(0.5) and restored.n == merged.n
+
+
+def _car(n: int, price: float, km: int = 150000) -> CarSpecs:
+    return CarSpecs(
+        "Golf", price, f"{price:.0f} EUR", "Volkswagen", "golf", 2016, km, "diesel", "manual", "hatchback",
+        110, 1598, "used", "Alb", f"https://www.olx.ro/d/oferta/golf-ID{n:04d}.html",
+    )
+
+
+def test_repricing_replaces_the_old_price():
+    stats = MarketStats(":memory:")
+    cars = [_car(n, 10000.0 + 1000 * n) for n in range(6)]
+    assert stats.observe(cars, now=0) == 6
+    assert stats.observe(cars, now=DAY) == 0
+    before = stats.position(cars[0])
+    assert before.count == 6 and before.median == 12000.0
+
+    cheaper = replace(cars[5], price=9000.0)
+    assert stats.observe([cheaper], now=DAY) == 1
+    after = stats.position(cars[0])
+    assert after.count == 6
+    assert after.median == 11000.0
+    assert stats.position(cheaper).percentile == pytest.approx(100 / 6)
+
+
+def test_unseen_listings_age_out():
+    stats = MarketStats(":memory:", max_age=7 * DAY)
+    sold = [_car(n, 20000.0) for n in range(3)]
+    kept = [_car(n + 10, 10000.0) for n in range(5)]
+    stats.observe(sold + kept, now=0)
+    assert stats.position(kept[0]).count == 8
+    # anunțurile vândute nu mai apar în căutări; celelalte sunt văzute din nou
+    stats.observe(kept, now=5 * DAY)
+    stats.observe([], now=10 * DAY)
+    position = stats.position(kept[0])
+    assert position.count == 5 and position.median == 10000.0
+    stats.observe([], now=20 * DAY)
+    assert stats.position(kept[0]) is None
+    assert stats.segment(MarketStats.segment_keys(kept[0])[0]) is None
@@ -0,0 +1,74 @@
+"""stream_listing față de parse_listing pe pagina întreagă, cu pagina livrată în bucăți de mărimi diferite."""
+from dataclasses import asdict
+
+import pytest
+
+from olx_analyzer import OLXExtractorFixed
+
+pytest.importorskip("lxml")
+
+
+class StreamedResponse:
+    """Răspuns 200 citit cu iter_content; raw.tell() = octeții livrați până la închidere."""
+
+    def __init__(self, content: bytes):
+        self.status_code = 200
+        self.content = content
+        self.headers = {"Content-Length": str(len(content))}
+        self.raw = self
+        self.sent = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size: int):
+        while self.sent < len(self.content) and not self.closed:
+            chunk = self.content[self.sent:self.sent + chunk_size]
+            self.sent += len(chunk)
+            yield chunk
+
+    def tell(self) -> int:
+        return self.sent
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class StreamSession:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.responses = []
+
+    def get(self, url, timeout=None, headers=None, stream=False):
+        assert stream
+        self.responses.append(StreamedResponse(self.content))
+        return self.responses[-1]
+
+
+def _streamed(content: bytes, url: str, chunk: int):
+    extractor = OLXExtractorFixed(backend="lxml", rate=1000, burst=10, stream=True)
+    extractor.STREAM_CHUNK = chunk
+    extractor.session = StreamSession(content)
+    return extractor.stream_listing(url), extractor.session.responses[0]
+
+
+@pytest.mark.parametrize("chunk", [16384, 512, 7])
+def test_stream_matches_full_parse(listing_pages, recorded_listing_pages, chunk):
+    reference = OLXExtractorFixed(backend="lxml")
+    for name, content in listing_pages + recorded_listing_pages:
+        url = f"https://www.olx.ro/d/oferta/{name}"
+        car, response = _streamed(content, url, chunk)
+        assert asdict(car) == asdict(reference.parse_listing(content, url)), name
+        assert response.closed
+
+
+def test_stream_stops_once_the_listing_is_resolved(recorded_listing_pages):
+    # starea OLX și og:title sunt în <head>, marca în breadcrumb: restul paginii nu mai e citit
+    name, content = next(p for p in recorded_listing_pages if p[0].startswith("volkswagen-golf"))
+    car, response = _streamed(content, f"https://www.olx.ro/d/oferta/{name}", 512)
+    assert car.km == 185000
+    assert response.closed and response.sent < len(content) - 2048
+
+
+def test_full_download_is_the_default():
+    extractor = OLXExtractorFixed()
+    assert extractor.stream is False
+    assert OLXExtractorFixed(stream=True).stream is True
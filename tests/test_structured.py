@@ -0,0 +1,141 @@
+"""Datele structurate ale paginii: JSON-LD și __PRERENDERED_STATE__, mapate la câmpurile CarSpecs."""
+import json
+
+import pytest
+
+from olx_analyzer.specs import SPEC_ENGINE
+from olx_analyzer.structured import (
+    _decode_prerendered_state,
+    _fields_from_json_ld,
+    _fields_from_olx_ad,
+    _json_ld_items,
+)
+
+GOLF = {
+    "@type": "Car",
+    "name": " VW Golf 7 ",
+    "brand": {"@type": "Brand", "name": "VW"},
+    "model": "Golf",
+    "vehicleModelDate": "2016-01",
+    "mileageFromOdometer": {"@type": "QuantitativeValue", "value": "150 000", "unitCode": "KMT"},
+    "vehicleEngine": {
+        "engineDisplacement": {"value": 1.6, "unitCode": "LTR"},
+        "enginePower": {"value": 81, "unitCode": "KWT"},
+        "fuelType": "Diesel",
+    },
+    "vehicleTransmission": "Manuala",
+    "bodyType": "Hatchback",
+    "color": "Gri",
+    "itemCondition": "https://schema.org/UsedCondition",
+    "offers": [{"@type": "Offer", "price": "10500", "priceCurrency": "eur"}],
+}
+GOLF_FIELDS = {
+    "title": "VW Golf 7", "brand": "Volkswagen", "model": "GOLF", "year": 2016, "km": 150000,
+    "engine_size": 1600, "power": 110, "fuel": "diesel", "gearbox": "manual", "body": "hatchback",
+    "color": "grey", "state": "used", "price": 10500.0, "price_text": "10 500 EUR",
+}
+
+
+@pytest.mark.parametrize("raw, types", [
+    (json.dumps(GOLF), ["Car"]),
+    (json.dumps([{"@type": "Car"}, {"@type": "Product"}]), ["Car", "Product"]),
+    (json.dumps({"@context": "https://schema.org", "@graph": [{"@type": "BreadcrumbList"}, GOLF]}),
+     [None, "BreadcrumbList", "Car"]),
+    ("{nu e json", []),
+])
+def test_json_ld_items(raw, types):
+    assert [item.get("@type") for item in _json_ld_items(raw)] == types
+
+
+# (descriere, obiectul JSON-LD, câmpurile CarSpecs)
+JSON_LD = [
+    ("Car complet: litri -> cm³, kW -> CP, ofertă în listă", GOLF, GOLF_FIELDS),
+    ("cm³ și CP, fără unități", {
+        "vehicleEngine": [{"engineDisplacement": {"value": "1968"}, "enginePower": {"value": "150"}}],
+        "mileageFromOdometer": 98000,
+    }, {"engine_size": 1968, "power": 150, "km": 98000}),
+    ("Product: producător ca alias-model, model ca slug", {
+        "@type": "Product",
+        "manufacturer": "Range Rover",
+        "model": "range-rover-sport",
+        "productionDate": 2019,
+        "itemCondition": "NewCondition",
+        "offers": {"lowPrice": 25000, "priceCurrency": "RON"},
+    }, {"brand": "Land Rover", "model": "RANGE ROVER SPORT", "year": 2019, "state": "new",
+        "price": 25000.0, "price_text": "25 000 RON"}),
+    ("marcă în afara catalogului", {"brand": "Alfa Romeo", "model": "Giulia"},
+     {"brand": "Alfa Romeo", "model": "GIULIA"}),
+    ("valori în afara limitelor și goale", {
+        "vehicleModelDate": "1850", "mileageFromOdometer": {"value": ""}, "color": "", "offers": [],
+    }, {}),
+]
+
+
+@pytest.mark.parametrize("item, expected", [case[1:] for case in JSON_LD], ids=[case[0] for case in JSON_LD])
+def test_fields_from_json_ld(item, expected):
+    assert _fields_from_json_ld(item, SPEC_ENGINE) == expected
+
+
+LOGAN = {
+    "title": "Dacia Logan ",
+    "description": "Unic &amp; proprietar<br />fără accidente",
+    "price": {"regularPrice": {"value": 7200, "currencyCode": "EUR"}},
+    "params": [
+        {"key": "year", "value": "2021", "normalizedValue": "2021"},
+        {"key": "rulaj_pana", "value": "45 000 km", "normalizedValue": "45000"},
+        {"key": "enginesize", "value": "999 cm3", "normalizedValue": "999"},
+        {"key": "engine_power", "value": "65 CP", "normalizedValue": "65"},
+        {"key": "petrol", "value": "Benzina", "normalizedValue": "petrol"},
+        {"key": "gearbox", "value": "Manuala", "normalizedValue": "manual"},
+        {"key": "car_body", "value": "Sedan", "normalizedValue": "sedan"},
+        {"key": "color", "value": "Gri", "normalizedValue": "gri"},
+        {"key": "state", "value": "Utilizat", "normalizedValue": "used"},
+        {"key": "model", "value": "Logan", "normalizedValue": "logan"},
+        # parametri necunoscuți și valori goale se ignoră
+        {"key": "nou_importat", "value": "Da"},
+        {"key": "year", "value": ""},
+    ],
+}
+LOGAN_FIELDS = {
+    "title": "Dacia Logan", "description": "Unic & proprietar fără accidente",
+    "price": 7200.0, "price_text": "7 200 EUR", "year": 2021, "km": 45000, "engine_size": 999, "power": 65,
+    "fuel": "petrol", "gearbox": "manual", "body": "sedan", "color": "grey", "state": "used", "model": "LOGAN",
+}
+
+# (descriere, anunțul din stare, câmpurile CarSpecs)
+OLX_ADS = [
+    ("anunț complet", LOGAN, LOGAN_FIELDS),
+    ("doar valoarea afișată, fără normalizedValue", {"params": [
+        {"key": "rulaj_pana", "value": "182.300 km"},
+        {"key": "engine_power", "value": "110"},
+        {"key": "model", "value": "range-rover-evoque"},
+    ]}, {"km": 182300, "power": 110, "model": "RANGE ROVER EVOQUE"}),
+    ("normalizedValue zecimal", {"params": [
+        {"key": "enginesize", "value": "1.598 cm³", "normalizedValue": "1598.0"},
+        {"key": "year", "value": "2016", "normalizedValue": 2016},
+    ]}, {"engine_size": 1598, "year": 2016}),
+    ("preț invalid", {"price": {"regularPrice": {"value": "la cerere"}}}, {}),
+    ("fără preț și parametri", {"price": None, "params": None}, {}),
+]
+
+
+@pytest.mark.parametrize("ad, expected", [case[1:] for case in OLX_ADS], ids=[case[0] for case in OLX_ADS])
+def test_fields_from_olx_ad(ad, expected):
+    assert _fields_from_olx_ad(ad) == expected
+
+
+STATE = {"ad": {"ad": LOGAN}}
+
+
+@pytest.mark.parametrize("script, expected", [
+    # OLX scrie starea ca string JSON cu JSON în el
+    ("window.__PRERENDERED_STATE__= " + json.dumps(json.dumps(STATE)) + ";", STATE),
+    ("window.__PRERENDERED_STATE__ = " + json.dumps(STATE) + ";\nwindow.x = 1", STATE),
+    (None, None),
+    ("var config = {};", None),
+    ('window.__PRERENDERED_STATE__= "nu e json";', None),
+    ('window.__PRERENDERED_STATE__= "[1, 2]";', None),
+    ("window.__PRERENDERED_STATE__= {ad: 1};", None),
+])
+def test_decode_prerendered_state(script, expected):
+    assert _decode_prerendered_state(script) == expected
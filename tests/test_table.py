@@ -0,0 +1,102 @@
+"""CarSpecsTable: conversiile fără pierderi și filtrarea, față de CarSpecs și ListingStore."""
+import random
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from olx_analyzer import CarSpecs, CarSpecsTable, ListingStore, SearchQuery, cars_to_frame
+
+MODELS = [("Volkswagen", "golf"), ("Volkswagen", "Passat"), ("Skoda", "octavia"), ("BMW", "seria 3")]
+
+
+@pytest.fixture(scope="module")
+def cars():
+    rng = random.Random(3)
+    cars = []
+    for n in range(600):
+        brand, model = rng.choice(MODELS)
+        cars.append(CarSpecs(
+            title=f"{brand} {model} {n} – ofertă",
+            price=rng.choice([0.0, 4999.5, 10500.0, 23999.99, 1_234_567.0]) + rng.randint(0, 50) * 100,
+            price_text=f"{rng.randint(1, 90)} 000 {rng.choice(['EUR', 'LEI'])}",
+            brand=brand, model=model,
+            year=rng.choice([0, 2009, 2015, 2016, 2017, 2023]),
+            km=rng.choice([0, 1, 120000, 150000, 180000, 2_000_000]),
+            fuel=rng.choice(["diesel", "benzina", "Unknown"]),
+            gearbox=rng.choice(["manual", "automatic", "Unknown"]),
+            body=rng.choice(["hatchback", "sedan", "combi"]),
+            power=rng.choice([None, 90, 110, 130]),
+            engine_size=rng.choice([None, 1598, 1968]),
+            state=rng.choice(["used", "new"]),
+            color=rng.choice(["Alb", "Negru", "Unknown"]),
+            link=f"https://www.olx.ro/d/oferta/{model.replace(' ', '-')}-{n}-ID{n:05x}.html",
+            description_hash=rng.getrandbits(63) * rng.choice([-1, 0, 1]),
+        ))
+    return cars
+
+
+def test_rows_round_trip(cars):
+    table = CarSpecsTable.from_cars(cars, titles=True)
+    assert list(table) == cars
+    assert table[17] == cars[17]
+    # fără titluri: toate celelalte câmpuri rămân
+    assert list(CarSpecsTable.from_cars(cars)) == [replace(c, title=CarSpecsTable.NO_TITLE) for c in cars]
+
+
+def test_prices_keep_full_precision(cars):
+    table = CarSpecsTable.from_cars(cars)
+    assert table.columns["price"].tolist() == [c.price for c in cars]
+    assert table.row(0).price == cars[0].price
+
+
+def test_integers_are_narrowed_only_when_they_fit(cars):
+    table = CarSpecsTable.from_cars(cars)
+    assert table.columns["year"].dtype == np.int16 and table.columns["km"].dtype == np.int32
+    wide = CarSpecsTable.from_cars([replace(cars[0], power=40000)] + cars[1:])
+    assert wide.columns["power"].dtype == np.int32 and wide.row(0).power == 40000
+
+
+def test_frame_round_trip(cars):
+    table = CarSpecsTable.from_cars(cars, titles=True)
+    frame = table.to_frame()
+    assert list(frame.columns) == list(CarSpecs.__dataclass_fields__)
+    assert list(CarSpecsTable.from_frame(frame, titles=True)) == cars
+    assert list(CarSpecsTable.from_frame(cars_to_frame(cars), titles=True)) == cars
+
+
+def test_arrow_round_trip(cars):
+    pytest.importorskip("pyarrow")
+    table = CarSpecsTable.from_cars(cars, titles=True)
+    arrow = table.to_arrow()
+    assert arrow.column("link").to_pylist() == [c.link for c in cars]
+    assert arrow.column("power").null_count == sum(c.power is None for c in cars)
+    assert list(CarSpecsTable.from_arrow(arrow, titles=True)) == cars
+    # un sub-tabel: offset-urile și prefixul comun se păstrează
+    assert list(CarSpecsTable.from_arrow(table[np.arange(0, len(cars), 7)].to_arrow(), titles=True)) == cars[::7]
+
+
+QUERIES = [
+    (SearchQuery(brand="Volkswagen"), ()),
+    (SearchQuery(brand="Volkswagen", model="GOLF", year=(2015, 2017), km=(120000, 180000)), ()),
+    (SearchQuery(brand="Volkswagen", model="golf", power=(100, 140), fuels=("diesel",)), ("power", "fuel")),
+    (SearchQuery(brand="Skoda", engine_size=(1500, 1700), gearboxes=("manual",), body="combi"), ("engine_size",)),
+    (SearchQuery(brand="BMW", model="seria 3", year=(2009, 2016), states=("used",)), ("year",)),
+]
+
+
+@pytest.mark.parametrize("query, lenient", QUERIES)
+def test_filter_parity(cars, query, lenient):
+    expected = [c.link for c in cars if query.matches(c, lenient)]
+    assert expected
+    assert [c.link for c in CarSpecsTable.from_cars(cars).filter(query, lenient)] == expected
+    # același filtru pe un tabel construit din DataFrame (ex. Parquet)
+    from_frame = CarSpecsTable.from_frame(cars_to_frame(cars))
+    assert [c.link for c in from_frame.filter(query, lenient)] == expected
+
+
+@pytest.mark.parametrize("query, lenient", QUERIES[:2])
+def test_filter_matches_the_store(cars, query, lenient):
+    store = ListingStore(":memory:")
+    store.upsert(cars)
+    assert sorted(c.link for c in CarSpecsTable.from_cars(cars).filter(query)) == sorted(c.link for c in store.query(query))
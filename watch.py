@@ -0,0 +1,116 @@
+"""Monitorizarea pieței: căutări salvate, reverificate periodic.
+
+    python watch.py add NUME LINK_ANUNȚ [--interval SECUNDE] [toleranțe]
+    python watch.py list
+    python watch.py remove NUME
+    python watch.py run [--once]
+
+`add` salvează căutarea de anunțuri similare cu anunțul dat (același calcul ca în
+interfață) și anunțul ca referință pentru scor. `run` verifică periodic căutările
+scadente și scrie câte un eveniment JSON pe linie: new, price_drop, price_rise,
+deal (EXCELENT față de referință) și removed.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict
+
+from olx_analyzer import (
+    ListingStore,
+    MarketWatch,
+    OLXExtractorFixed,
+    ResponseCache,
+    SearchCrawler,
+    SearchQuery,
+    WatchEvent,
+)
+
+
+def open_watch(args, polling: bool = False) -> MarketWatch:
+    """Căutările salvate; crawler-ul (extractorul HTTP, cache-ul) doar pentru comenzile care descarcă."""
+    crawler = None
+    if polling:
+        extractor = OLXExtractorFixed(rate=args.rate, cache=ResponseCache(ResponseCache.default_path()), stream=args.stream)
+        crawler = SearchCrawler(extractor, max_pages=args.max_pages)
+    return MarketWatch(crawler, ListingStore(ListingStore.default_path()), MarketWatch.default_path())
+
+
+def cmd_add(args) -> int:
+    watch = open_watch(args, polling=True)
+    reference = watch.crawler.extractor.extract_car_specs(args.url)
+    if reference is None:
+        print(f"Nu am putut extrage anunțul: {args.url}", file=sys.stderr)
+        return 1
+    query = SearchQuery.similar_to(reference, args.years, args.km, args.power, args.engine)
+    watch.add(args.name, query, reference, interval=args.interval)
+    print(f"Salvat: {args.name} ({reference.title}), verificare la {args.interval:g} s")
+    return 0
+
+
+def cmd_list(args) -> int:
+    for w in open_watch(args).watches():
+        last = time.strftime("%Y-%m-%d %H:%M", time.localtime(w["last_polled"])) if w["last_polled"] else "niciodată"
+        title = w["reference"].title if w["reference"] else "-"
+        print(f"{w['name']:<20} {title:<40} la {w['interval']:g} s, ultima verificare: {last}")
+    return 0
+
+
+def cmd_remove(args) -> int:
+    open_watch(args).remove(args.name)
+    return 0
+
+
+def print_event(event: WatchEvent) -> None:
+    record = asdict(event)
+    record["time"] = time.time()
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def cmd_run(args) -> int:
+    watch = open_watch(args, polling=True)
+    try:
+        watch.run(print_event, iterations=1 if args.once else None, idle=args.idle)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=0.6, help="cereri/secundă")
+    parser.add_argument("--max-pages", type=int, default=5, help="pagini de rezultate per verificare")
+    parser.add_argument("--stream", action="store_true", help="citește anunțurile în flux, până la datele necesare")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("add", help="salvează căutarea de anunțuri similare cu un anunț")
+    p.add_argument("name")
+    p.add_argument("url", help="link-ul anunțului de referință")
+    p.add_argument("--interval", type=float, default=3600, help="secunde între verificări")
+    p.add_argument("--years", type=int, default=2)
+    p.add_argument("--km", type=int, default=30000)
+    p.add_argument("--power", type=int, default=20)
+    p.add_argument("--engine", type=int, default=300, help="cm³ (±) față de motorul anunțului")
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("list", help="căutările salvate")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("remove", help="șterge o căutare salvată")
+    p.add_argument("name")
+    p.set_defaults(func=cmd_remove)
+
+    p = sub.add_parser("run", help="verifică periodic căutările și scrie evenimentele (JSONL)")
+    p.add_argument("--once", action="store_true", help="o singură trecere prin căutările scadente")
+    p.add_argument("--idle", type=float, default=30.0, help="pauza maximă între treceri (secunde)")
+    p.set_defaults(func=cmd_run)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())